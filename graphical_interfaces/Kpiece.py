@@ -1,9 +1,14 @@
 # full_kpieces_with_place_existing.py
 from functools import partial
+import numpy as np
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
 from PySide6.QtCore import *
-from gurobipy import Model, GRB
+from gurobipy import GRB
+from non_interfaces.kpiece_attacks import piece_attacks, piece_rule
+from non_interfaces.kpiece_construct import construct
+from non_interfaces.kpiece_mis import maximum_placement
+from non_interfaces.kpiece_model import build_model
 
 # ----------------------------
 # Dark Mode Styles
@@ -169,6 +174,13 @@ class KPieceSolverGUI(QMainWindow):
        to manually place existing pieces then maximize type X.
 
     5️⃣ If a solution exists, the board will display the pieces.
+
+    💡 Symmetry breaking: tick it to let the solver skip placements that are
+       rotations or reflections of each other. It mostly speeds up proving that
+       K pieces do not fit, and is ignored when existing pieces are placed.
+
+    💡 Time limit (place existing pieces): leave it empty for a proven maximum,
+       or give a number of seconds to get the best placement found in that time.
     """)
         instructions.setStyleSheet("font-size: 22px; color: #FFFFFF;")
         instructions.setWordWrap(True)
@@ -411,6 +423,10 @@ class KPieceSolverGUI(QMainWindow):
             }
         """)
         layout.addWidget(self.k_input)
+        # Opt-in: Gurobi's aggressive symmetry handling (8 board symmetries)
+        self.symmetry_cb = QCheckBox("Symmetry breaking (faster proofs when K pieces do not fit)")
+        self.symmetry_cb.setStyleSheet("color:white; font-size:16px;")
+        layout.addWidget(self.symmetry_cb)
         self.solve_btn = QPushButton("🚀 SOLVE")
         self.solve_btn.setMinimumHeight(50)
         self.solve_btn.setCursor(Qt.CursorShape.PointingHandCursor)
@@ -495,8 +511,7 @@ class KPieceSolverGUI(QMainWindow):
     def solve(self):
         self.clear_board()
         try:
-            piece_text = self.piece_combo.currentText()
-            piece = piece_text.split()[0]     # name before symbol
+            piece = self.piece_of_label(self.piece_combo.currentText())
             n = int(self.n_input.text())
             k = int(self.k_input.text())
         except:
@@ -504,82 +519,26 @@ class KPieceSolverGUI(QMainWindow):
             return
         default_symbols = {"Queen":"♛","Rook":"♜","Bishop":"♝","Knight":"♞"}
         symbol = default_symbols.get(piece, "⭐")
-        if piece == "Queen" and k > n:
-            QMessageBox.warning(self, "Impossible", f"Max {n} Queens on {n}x{n} board!")
-            return
-        if piece == "Knight" and k > (n*n + 1)//2:
-            QMessageBox.warning(self, "Impossible", f"Max {(n*n + 1)//2} Knights on {n}x{n} board!")
-            return
-        model = Model("K_Pieces")
-        model.setParam("OutputFlag", 0)
-        x = {}
-        for r in range(1, n+1):
-            for c in range(1, n+1):
-                x[(r, c)] = model.addVar(vtype=GRB.BINARY)
-        # Custom pieces
-        if piece in self.custom_pieces:
-            moves = self.custom_pieces[piece]['offsets']
-            specials = self.custom_pieces[piece]['special']
-            for r in range(1, n+1):
-                for c in range(1, n+1):
-                    # finite offsets
-                    for dr, dc in moves:
-                        rr = r + dr
-                        cc = c + dc
-                        if 1 <= rr <= n and 1 <= cc <= n:
-                            model.addConstr(x[(r, c)] + x[(rr, cc)] <= 1)
-                    # specials (row/col/diag) - treat like rook/bishop
-                    if 'row' in specials:
-                        model.addConstr(sum(x[(r, cc)] for cc in range(1, n+1)) <= 1)
-                    if 'col' in specials:
-                        model.addConstr(sum(x[(rr, c)] for rr in range(1, n+1)) <= 1)
-                    if 'diag' in specials:
-                        for b in range(-(n-1), n):
-                            model.addConstr(sum(x[(rr, cc)] for rr in range(1, n+1)
-                                                    for cc in range(1, n+1)
-                                                    if rr-cc == b) <= 1)
-                        for b in range(2, 2*n):
-                            model.addConstr(sum(x[(rr, cc)] for rr in range(1, n+1)
-                                                    for cc in range(1, n+1)
-                                                    if rr+cc == b) <= 1)
-        # Rook/Queen – rows & columns
-        if piece in ["Queen", "Rook"]:
-            for r in range(1, n+1):
-                model.addConstr(sum(x[(r, c)] for c in range(1, n+1)) <= 1)
-            for c in range(1, n+1):
-                model.addConstr(sum(x[(r, c)] for r in range(1, n+1)) <= 1)
-        # Bishop/Queen – diagonals
-        if piece in ["Queen", "Bishop"]:
-            for b in range(-(n-1), n):
-                model.addConstr(sum(x[(r, c)] for r in range(1, n+1)
-                                                for c in range(1, n+1)
-                                                if r-c == b) <= 1)
-            for b in range(2, 2*n):
-                model.addConstr(sum(x[(r, c)] for r in range(1, n+1)
-                                                for c in range(1, n+1)
-                                                if r+c == b) <= 1)
-        # Knight
-        if piece == "Knight":
-            moves = [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]
-            for r in range(1, n+1):
-                for c in range(1, n+1):
-                    for dr, dc in moves:
-                        rr, cc = r+dr, c+dc
-                        if 1 <= rr <= n and 1 <= cc <= n:
-                            model.addConstr(x[(r, c)] + x[(rr, cc)] <= 1)
-        # exactly K pieces
-        model.addConstr(sum(x[(r, c)] for r in range(1, n+1)
-                                    for c in range(1, n+1)) == k)
-        model.setObjective(0, GRB.MINIMIZE)
-        model.optimize()
-        if model.status != GRB.OPTIMAL:
-            QMessageBox.warning(self, "No Solution",
-                                f"Cannot place {k} {piece}s on {n}x{n} board!")
-            return
+        # Standard pieces: closed-form maximum placement, any K of its pieces fit
+        placement = construct(piece, n) if piece not in self.custom_pieces else None
+        if placement is not None:
+            if not 0 <= k <= len(placement):
+                QMessageBox.warning(self, "Impossible", f"Max {len(placement)} {piece}s on {n}x{n} board!")
+                return
+            squares = placement[:k].tolist()
+        else:
+            # One "at most one piece" constraint per line / clique of the attack graph
+            symmetry = "gurobi" if self.symmetry_cb.isChecked() else None
+            model, x = build_model(n, *piece_rule(piece, self.custom_pieces), k=k, symmetry=symmetry)
+            model.optimize()
+            if model.status != GRB.OPTIMAL:
+                QMessageBox.warning(self, "No Solution",
+                                    f"Cannot place {k} {piece}s on {n}x{n} board!")
+                return
+            squares = [a for a, var in x.items() if var.X > 0.5]
         grid = [[0]*n for _ in range(n)]
-        for (r, c), var in x.items():
-            if var.X > 0.5:
-                grid[r-1][c-1] = 1
+        for a in squares:
+            grid[a // n][a % n] = 1
         cell_size = min(500//n, 60)
         for r in range(n):
             for c in range(n):
@@ -601,96 +560,36 @@ class KPieceSolverGUI(QMainWindow):
                 self.board_layout.addWidget(cell, r, c)
         self.stacked.setCurrentWidget(self.board_page)
 
+    # ---------------- Helper: piece name of a combo label ----------------
+    def piece_of_label(self, label):
+        """Custom piece name before " ⭐" (it may contain spaces), else the standard name before its symbol"""
+        if label.endswith(" ⭐"):
+            return label[:-len(" ⭐")]
+        return label.split()[0]
+
     # ---------------- Helper: attack generation for a piece type ----------------
+    def attack_table(self, piece_name, n):
+        """
+        Cached (n*n, n*n) attack matrix of a piece type (custom pieces included):
+        table[a, b] is True when the piece on square a attacks square b,
+        with squares numbered (r-1)*n + (c-1).
+        """
+        return piece_attacks(n, piece_name, self.custom_pieces)
+
     def get_attack_cells_for_piece(self, piece_name, r, c, n):
         """
         Return set of cells (rr,cc) that a piece of type piece_name placed at (r,c) would attack.
         r,c are 1-based indices.
         """
-        attacked = set()
-        base_name = piece_name.replace(" ⭐", "")
-
-        # Build a set of occupied cells to stop sliding
-        occupied = set(self.existing_placements.keys())  # {(r,c)}
-
-        # Knight jumps
-        if base_name == "Knight" or base_name == "Knight ♞":
-            moves = [(-2,-1),(-2,1),(-1,-2),(-1,2),(1,-2),(1,2),(2,-1),(2,1)]
-            for dr, dc in moves:
-                rr, cc = r+dr, c+dc
-                if 1 <= rr <= n and 1 <= cc <= n:
-                    attacked.add((rr, cc))
-            return attacked
-
-        # Custom pieces or sliding pieces
-        offsets = []
-        specials = []
-        if base_name in self.custom_pieces:
-            info = self.custom_pieces[base_name]
-            offsets = info.get('offsets', [])
-            specials = info.get('special', [])
-
-        # 1. finite offsets for custom pieces
-        for dr, dc in offsets:
-            rr, cc = r+dr, c+dc
-            if 1 <= rr <= n and 1 <= cc <= n:
-                attacked.add((rr, cc))
-
-        # 2. sliding special directions for custom pieces
-        directions = []
-        if 'row' in specials:
-            for rr in range(1, n+1):
-                for cc in range(1, n+1):
-                    if rr == r:
-                        attacked.add((rr, cc))
-        if 'col' in specials:
-            for cc in range(1, n+1):
-                for rr in range(1, n+1):
-                    if cc == c:
-                        attacked.add((rr, cc))
-        if 'diag' in specials:
-            directb=r-c
-            for rr in range(1,n+1):
-                cc = rr - directb
-                if 1 <= cc <= n:
-                    attacked.add((rr, cc))
-            counterb=r+c
-            for rr in range(1, n+1):
-                cc = counterb - rr
-                if 1 <= cc <= n:
-                    attacked.add((rr, cc))
-
-       
-
-        # 3. standard chess pieces
-        if base_name in ["Rook", "Queen","Queen ♛","Rook ♜"]:
-            for rr in range(1, n+1):
-                for cc in range(1, n+1):
-                    if rr == r:
-                        attacked.add((rr, cc))
-            for cc in range(1, n+1):
-                for rr in range(1, n+1):
-                    if cc == c:
-                        attacked.add((rr, cc))
-        if base_name in ["Bishop", "Queen","Queen ♛","Bishop ♝"]:
-            directb=r-c
-            for rr in range(1,n+1):
-                cc = rr - directb
-                if 1 <= cc <= n:
-                    attacked.add((rr, cc))
-            counterb=r+c
-            for rr in range(1, n+1):
-                cc = counterb - rr
-                if 1 <= cc <= n:
-                    attacked.add((rr, cc))
-
-        return attacked
-
+        row = self.attack_table(piece_name, n)[(r-1)*n + (c-1)]
+        return {(a // n + 1, a % n + 1) for a in np.flatnonzero(row).tolist()}
 
     # ---------------- Helper: check if a cell attack another cell for their types ----------------
     def cell_attacks_cell(self, piece_name, r1, c1, r2, c2, n):
         """Return True if piece type piece_name at (r1,c1) would attack (r2,c2)."""
-        return ((r2, c2) in self.get_attack_cells_for_piece(piece_name, r1, c1, n) and (r1,c1) in self.get_attack_cells_for_piece(piece_name, r2, c2, n))
+        table = self.attack_table(piece_name, n)
+        a, b = (r1-1)*n + (c1-1), (r2-1)*n + (c2-1)
+        return bool(table[a, b] and table[b, a])
     # ---------------- New Page: Place Existing Pieces ----------------
     def create_place_existing_page(self):
         page = QWidget()
@@ -723,6 +622,15 @@ class KPieceSolverGUI(QMainWindow):
         self.refresh_place_existing_page()
         controls.addWidget(self.place_piece_type_combo)
 
+        time_label = QLabel("Time limit (s):")
+        time_label.setStyleSheet("color:white;font-weight:bold;")
+        controls.addWidget(time_label)
+        self.place_time_input = QLineEdit()
+        self.place_time_input.setFixedWidth(70)
+        self.place_time_input.setPlaceholderText("none")
+        self.place_time_input.setStyleSheet(INPUT_STYLE)
+        controls.addWidget(self.place_time_input)
+
         clear_btn = QPushButton("Clear All Placements")
         clear_btn.setStyleSheet(BUTTON_STYLE)
         clear_btn.clicked.connect(self.clear_existing_placements)
@@ -877,7 +785,7 @@ class KPieceSolverGUI(QMainWindow):
         if not current_type_label:
             return
 
-        piece_name = current_type_label.split()[0]  # normalized name (e.g., "Queen" or custom)
+        piece_name = self.piece_of_label(current_type_label)  # normalized name (e.g., "Queen" or custom)
         placed = btn.property("placed_piece") or ""
 
         # convert to 1-based for storage in existing_placements
@@ -886,7 +794,7 @@ class KPieceSolverGUI(QMainWindow):
 
         if placed == "":
             # place the selected piece here
-            normalized = current_type_label.replace(self.piece_map[piece_name], "")
+            normalized = current_type_label.replace(self.piece_map.get(piece_name, ""), "")
             symbol = self.get_piece_display_symbol(normalized)
             btn.setText(self.piece_map[piece_name] if piece_name in self.piece_map else symbol)
             btn.setProperty("placed_piece", normalized)
@@ -946,12 +854,6 @@ class KPieceSolverGUI(QMainWindow):
             (r1, c1), piece1 = items[i]
             for j in range(i+1, len(items)):
                 (r2, c2), piece2 = items[j]
-                print(f"Checking conflict between {piece1} at ({r1},{c1}) and {piece2} at ({r2},{c2})")
-                print("piece1:", piece1)
-                print("piece2:", piece2)
-                print("Attack result:",
-                self.cell_attacks_cell(piece1, r1, c1, r2, c2, n))
-                print(self.cell_attacks_cell(piece2, r2, c2, r1, c1, n))
                 if self.cell_attacks_cell(piece1, r1, c1, r2, c2, n) or \
                 self.cell_attacks_cell(piece2, r2, c2, r1, c1, n):
                     conflicts.append(((r1,c1,piece1),(r2,c2,piece2)))
@@ -965,56 +867,39 @@ class KPieceSolverGUI(QMainWindow):
 
         # Pick the piece type X
         type_label = self.place_piece_type_combo.currentText()
-        piece_X = type_label.split()[0]
+        piece_X = self.piece_of_label(type_label)
         default_symbols = {"Queen":"♛","Rook":"♜","Bishop":"♝","Knight":"♞"}
         X_symbol =self.piece_map[piece_X] if piece_X in self.piece_map else default_symbols.get(piece_X, piece_X[0].upper())
 
-        # Initialize Gurobi model
-        model = Model("Maximize_X")
-        model.setParam("OutputFlag", 0)
-
-        # Create binary variables only for empty cells
-        y = {}
-        for r in range(1, n+1):
-            for c in range(1, n+1):
-                if (r,c) in self.existing_placements:
-                    continue
-                y[(r,c)] = model.addVar(vtype=GRB.BINARY)
-
-        # Step 1: forbid placement if new X attacks existing piece or is attacked
-        for (r,c), var in y.items():
-            for (re, ce), existing_piece in self.existing_placements.items():
-                if self.cell_attacks_cell(piece_X, r, c, re, ce, n) or \
-                self.cell_attacks_cell(existing_piece, re, ce, r, c, n):
-                    model.addConstr(var == 0)
-
-        # Step 2: forbid X pieces from attacking each other
-        cells = list(y.keys())
-        for i in range(len(cells)):
-            r1, c1 = cells[i]
-            attacked_by_r1 = self.get_attack_cells_for_piece(piece_X, r1, c1, n)
-            for j in range(i+1, len(cells)):
-                r2, c2 = cells[j]
-                if (r2, c2) in attacked_by_r1:
-                    model.addConstr(y[(r1, c1)] + y[(r2, c2)] <= 1)
-
-        # Objective: maximize the number of X pieces added
-        if y:
-            model.setObjective(sum(y.values()), GRB.MAXIMIZE)
+        # Optional time limit: the best placement found within it is shown
+        time_limit = None
+        if self.place_time_input.text().strip():
+            try:
+                time_limit = float(self.place_time_input.text())
+                if time_limit <= 0:
+                    raise ValueError()
+            except ValueError:
+                QMessageBox.warning(self, "Input Error", "The time limit must be a positive number of seconds.")
+                return
+
+        # Empty board and a standard piece: closed-form maximum placement
+        placement = None
+        if not self.existing_placements and piece_X not in self.custom_pieces:
+            placement = construct(piece_X, n)
+        note = ""
+        if placement is not None:
+            added = {(a // n + 1, a % n + 1) for a in placement.tolist()}
         else:
-            model.setObjective(0, GRB.MAXIMIZE)
-
-        model.optimize()
-
-        if model.status not in (GRB.OPTIMAL, GRB.TIME_LIMIT):
-            QMessageBox.warning(self, "No Solution", "Gurobi couldn't solve the maximization.")
-            return
-
-        # Extract solution
-        added = []
-        for (r,c), var in y.items():
-            if var.X is not None and var.X > 0.5:
-                added.append((r,c))
+            added, result = self.maximize_with_solver(piece_X, n, time_limit)
+            # Without Gurobi the set can still be proven maximal by the clique bound
+            if result["error"] and not result["optimal"]:
+                QMessageBox.warning(self, "Gurobi Error",
+                                    f"Gurobi could not run: {result['error']}\n"
+                                    f"Showing the best placement found without it.")
+                note = "\n(found without Gurobi, not proven maximal)"
+            elif not result["optimal"]:
+                note = ("\n(best found within the time limit, not proven maximal)" if time_limit is not None
+                        else "\n(not proven maximal)")
 
         # Display board with existing and new pieces
         self.clear_board()
@@ -1045,6 +930,33 @@ class KPieceSolverGUI(QMainWindow):
                     cell.setStyleSheet(f"background-color:{color};border:1px solid #555555;")
                 self.board_layout.addWidget(cell, r-1, c-1)
 
-        QMessageBox.information(self, "Result", f"Added {len(added)} {piece_X}(s) to the board.")
+        QMessageBox.information(self, "Result", f"Added {len(added)} {piece_X}(s) to the board.{note}")
         self.stacked.setCurrentWidget(self.board_page)
 
+    # ---------------- Maximize X with the solver (existing pieces or custom X) ----------------
+    def maximize_with_solver(self, piece_X, n, time_limit=None):
+        """
+        Cells (1-based) of the added X pieces and the maximum_placement
+        result (proof, Gurobi error): greedy and local search give a first
+        placement, then Gurobi starts from it (see
+        non_interfaces/kpiece_mis.py). With a time limit the best
+        placement found within it is returned.
+        """
+        # Step 1: a new X can only go on an empty cell where it neither attacks
+        # an existing piece nor is attacked by one (same rule as cell_attacks_cell)
+        table_X = self.attack_table(piece_X, n)
+        free = np.ones(n*n, dtype=bool)
+        for (re, ce), existing_piece in self.existing_placements.items():
+            e = (re-1)*n + (ce-1)
+            table_e = self.attack_table(existing_piece, n)
+            free &= ~((table_X[:, e] & table_X[e, :]) | (table_e[e, :] & table_e[:, e]))
+            free[e] = False
+        cells = np.flatnonzero(free)
+
+        # Step 2: largest set of non-attacking X pieces on those cells
+        # (symmetry handling only on an empty board: existing pieces break the symmetry)
+        symmetry = "gurobi" if self.symmetry_cb.isChecked() and not self.existing_placements else None
+        result = maximum_placement(n, *piece_rule(piece_X, self.custom_pieces), cells=cells,
+                                   time_limit=time_limit, symmetry=symmetry)
+        added = {(a // n + 1, a % n + 1) for a in result["squares"]}
+        return added, result
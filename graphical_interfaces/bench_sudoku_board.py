@@ -0,0 +1,97 @@
+"""
+Render benchmark of the Sudoku board (graphical_interfaces/sudoku.py):
+the painted SudokuBoard against the previous board of one QLabel per
+cell, for grids of size 9 to 49. Times are the best of REPEAT runs of
+showing a new grid (build + first paint), repainting the whole board
+and updating single cells (the solver animation), with frames per
+second for the repaints.
+Runs without a display: QT_QPA_PLATFORM=offscreen python graphical_interfaces/bench_sudoku_board.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PySide6.QtGui import QPixmap, QRegion
+from PySide6.QtWidgets import QApplication, QGridLayout, QLabel, QWidget
+
+from graphical_interfaces.sudoku import SudokuBoard
+from non_interfaces.sudoku_core import pattern_grid
+
+# (n, box rows, box cols); 49x49 uses 7x7 boxes
+SIZES = [(9, 3, 3), (16, 4, 4), (25, 5, 5), (36, 6, 6), (49, 7, 7)]
+REPEAT = 3
+SIDE = 700
+CELL_UPDATES = 200
+
+
+def best(fn, repeat=REPEAT):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def label_board(grid, br, bc):
+    """The previous board: a QGridLayout of styled QLabels"""
+    n = len(grid)
+    widget = QWidget()
+    layout = QGridLayout(widget)
+    layout.setSpacing(1)
+    size = min(500 // n, 60)
+    for r in range(n):
+        for c in range(n):
+            label = QLabel(str(grid[r][c]) if grid[r][c] else "")
+            label.setFixedSize(size, size)
+            top = 3 if r % br == 0 else 1
+            left = 3 if c % bc == 0 else 1
+            label.setStyleSheet(f"border-top: {top}px solid white; border-left: {left}px solid white; "
+                                f"background-color: #3A3A3A; color: white; font-size: {size // 2}px;")
+            layout.addWidget(label, r, c)
+    widget.resize(SIDE, SIDE)
+    widget.render(QPixmap(SIDE, SIDE))
+    return widget
+
+
+if __name__ == "__main__":
+    app = QApplication.instance() or QApplication(sys.argv)
+    rng = random.Random(0)
+    print(f"{'n':>3} {'labels show (s)':>16} {'board show (s)':>15} {'repaint (s)':>12} {'fps':>7} "
+          f"{'cell (ms)':>10}")
+
+    for n, br, bc in SIZES:
+        grid = pattern_grid(n, br, bc)
+        puzzle = [[v if rng.random() < 0.5 else 0 for v in row] for row in grid]
+
+        labels = best(lambda: label_board(grid, br, bc), repeat=1 if n > 25 else REPEAT)
+
+        # Frames are painted into a pixmap, which also works without a display
+        board = SudokuBoard()
+        board.resize(SIDE, SIDE)
+        frame = QPixmap(SIDE, SIDE)
+
+        def show():
+            board.set_grid(grid, (br, bc))
+            board.render(frame)
+
+        shown = best(show)
+        repaint = best(lambda: board.render(frame))
+
+        # Solver animation: one cell changed, only its rectangle repainted
+        board.set_grid(puzzle, (br, bc))
+        board.render(frame)
+        empty = [(r, c) for r in range(n) for c in range(n) if not puzzle[r][c]][:CELL_UPDATES]
+        t0 = time.perf_counter()
+        for r, c in empty:
+            board.set_cell(r, c, grid[r][c])
+            rect = board.cell_rect(r, c)
+            board.render(frame, rect.topLeft(), QRegion(rect))
+        cell = (time.perf_counter() - t0) / len(empty)
+
+        print(f"{n:>3} {labels:>16.4f} {shown:>15.4f} {repaint:>12.4f} {1 / repaint:>7.0f} "
+              f"{cell * 1000:>10.3f}")
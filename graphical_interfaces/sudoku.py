@@ -1,8 +1,12 @@
+import numpy as np
 from PySide6.QtWidgets import *
 from PySide6.QtGui import *
 from PySide6.QtCore import *
-from gurobipy import Model, GRB
-from random import randint as rand
+from non_interfaces.sudoku_core import (
+    check_shape, default_block, generate, parse_block_size, parse_grid, remove_cells,
+    remove_cells_unique, solve as solve_grid
+)
+from non_interfaces.sudoku_engine import block_shape
 
 # ---------------------------- Styles ----------------------------
 BUTTON_STYLE = """
@@ -40,6 +44,183 @@ font-weight: bold;
 color: #FFFFFF;
 """
 
+# ---------------------------- Board Widget ----------------------------
+# Cell states (index into SudokuBoard.lut)
+EMPTY, GIVEN, SOLVED = 0, 1, 2
+
+
+class SudokuBoard(QWidget):
+    """
+    Whole board painted by one widget. Values and cell states live in
+    NumPy arrays (n x n); backgrounds are one image with a pixel per cell
+    (scaled up), values are one transparent layer of cached digit
+    pixmaps, and only the exposed cells are repainted. set_cell updates a
+    single cell of both, which keeps solver animations cheap on 49x49.
+    """
+
+    BACKGROUNDS = {EMPTY: QColor("#1E1E1E"), GIVEN: QColor("#3A3A3A"), SOLVED: QColor("#3A3A3A")}
+    TEXT_COLORS = {GIVEN: QColor("white"), SOLVED: QColor("#4ECDC4")}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.values = np.zeros((0, 0), dtype=np.int32)
+        self.state = np.zeros((0, 0), dtype=np.uint8)
+        self.br = self.bc = 1
+        self.lut = np.array([self.BACKGROUNDS[s].rgb() for s in sorted(self.BACKGROUNDS)], dtype=np.uint32)
+
+        # Caches, rebuilt on demand by paintEvent
+        self.pixels = None   # backgrounds, one uint32 per cell
+        self.image = None    # QImage over self.pixels
+        self.layer = None    # values, cell size `self.side`
+        self.side = 0
+        self.glyphs = {}     # (value, state) -> QPixmap of one cell
+
+        # Animation: cells still to fill, a few per timer tick
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.animation_step)
+        self.pending = []
+        self.target = None
+        self.per_tick = 1
+
+        self.setMinimumSize(500, 500)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+
+    @property
+    def n(self):
+        return len(self.values)
+
+    def set_grid(self, grid, block_size=-1, givens=None):
+        """Show a grid (block_size as in check_shape); non-zero cells missing from `givens` count as solved"""
+        self.timer.stop()
+        self.values = np.array(grid, dtype=np.int32).reshape(len(grid), len(grid))
+        clues = self.values > 0 if givens is None else np.array(givens, dtype=np.int32) > 0
+        self.state = np.where(self.values == 0, EMPTY, np.where(clues, GIVEN, SOLVED)).astype(np.uint8)
+        self.br, self.bc = block_shape(self.n, block_size) or (1, 1)
+        self.image = self.layer = None
+        self.update()
+
+    def set_cell(self, r, c, value, state=SOLVED):
+        """Change one cell and repaint only that cell"""
+        self.values[r, c] = value
+        self.state[r, c] = state if value else EMPTY
+        if self.image is not None:
+            self.pixels[r, c] = self.lut[self.state[r, c]]  # the image shares this buffer
+        if self.layer is not None:
+            painter = QPainter(self.layer)
+            self.draw_value(painter, r, c)
+            painter.end()
+        self.update(self.cell_rect(r, c).adjusted(-1, -1, 2, 2))
+
+    def animate(self, solution, duration=800):
+        """Fill the empty cells with `solution`, cell by cell, over about `duration` ms"""
+        self.timer.stop()
+        self.target = np.array(solution, dtype=np.int32)
+        self.pending = [tuple(rc) for rc in np.argwhere(self.values == 0)][::-1]
+        if self.pending:
+            # At most ~60 ticks per second, several cells per tick on big boards
+            ticks = max(1, min(len(self.pending), duration * 60 // 1000))
+            self.per_tick = -(-len(self.pending) // ticks)
+            self.timer.start(max(1, duration // ticks))
+
+    def animation_step(self):
+        for _ in range(min(self.per_tick, len(self.pending))):
+            r, c = self.pending.pop()
+            self.set_cell(r, c, int(self.target[r, c]))
+        if not self.pending:
+            self.timer.stop()
+
+    # Geometry: square cells of whole pixels, board centered in the widget
+    def cell_size(self):
+        return max(1, min(self.width(), self.height()) // max(self.n, 1))
+
+    def origin(self):
+        size = self.cell_size() * self.n
+        return (self.width() - size) // 2, (self.height() - size) // 2
+
+    def cell_rect(self, r, c):
+        x0, y0 = self.origin()
+        size = self.cell_size()
+        return QRect(x0 + c * size, y0 + r * size, size, size)
+
+    def glyph(self, value, state):
+        """Pixmap of a value in a cell of `self.side` pixels"""
+        key = (value, state)
+        if key not in self.glyphs:
+            side = self.side
+            pixmap = QPixmap(side, side)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(pixmap)
+            font = painter.font()
+            font.setPixelSize(max(4, side // 2))
+            font.setBold(True)
+            painter.setFont(font)
+            painter.setPen(self.TEXT_COLORS[state])
+            painter.drawText(QRect(0, 0, side, side), Qt.AlignmentFlag.AlignCenter, str(value))
+            painter.end()
+            self.glyphs[key] = pixmap
+        return self.glyphs[key]
+
+    def draw_value(self, painter, r, c):
+        """Replace cell (r, c) of the value layer"""
+        side = self.side
+        painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+        painter.fillRect(c * side, r * side, side, side, Qt.GlobalColor.transparent)
+        if self.state[r, c] != EMPTY:
+            painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceOver)
+            painter.drawPixmap(c * side, r * side, self.glyph(int(self.values[r, c]), int(self.state[r, c])))
+
+    def refresh(self, side):
+        """Rebuild the caches that are missing or drawn for another cell size"""
+        if self.image is None:
+            self.pixels = np.ascontiguousarray(self.lut[self.state])
+            self.image = QImage(self.pixels.data, self.n, self.n, 4 * self.n, QImage.Format.Format_RGB32)
+        if self.layer is None or side != self.side:
+            if side != self.side:
+                self.glyphs, self.side = {}, side
+            self.layer = QPixmap(side * self.n, side * self.n)
+            self.layer.fill(Qt.GlobalColor.transparent)
+            painter = QPainter(self.layer)
+            for r, c in np.argwhere(self.state != EMPTY):
+                painter.drawPixmap(int(c) * side, int(r) * side, self.glyph(int(self.values[r, c]), int(self.state[r, c])))
+            painter.end()
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(event.rect(), QColor("#121212"))
+        n = self.n
+        if n == 0:
+            return
+        size = self.cell_size()
+        x0, y0 = self.origin()
+        self.refresh(size)
+
+        # Exposed cells only
+        exposed = event.rect()
+        r0 = max(0, (exposed.top() - y0) // size)
+        c0 = max(0, (exposed.left() - x0) // size)
+        r1 = min(n, (exposed.bottom() - y0) // size + 1)
+        c1 = min(n, (exposed.right() - x0) // size + 1)
+        if r0 >= r1 or c0 >= c1:
+            return
+
+        target = QRect(x0 + c0 * size, y0 + r0 * size, (c1 - c0) * size, (r1 - r0) * size)
+        painter.drawImage(target, self.image, QRect(c0, r0, c1 - c0, r1 - r0))
+        painter.drawPixmap(target, self.layer, target.translated(-x0, -y0))
+
+        # Grid lines, thicker on block borders
+        thin, thick = [], []
+        for r in range(r0, r1 + 1):
+            line = QLine(x0 + c0 * size, y0 + r * size, x0 + c1 * size, y0 + r * size)
+            (thick if r % self.br == 0 or r == n else thin).append(line)
+        for c in range(c0, c1 + 1):
+            line = QLine(x0 + c * size, y0 + r0 * size, x0 + c * size, y0 + r1 * size)
+            (thick if c % self.bc == 0 or c == n else thin).append(line)
+        painter.setPen(QPen(QColor("#808080"), 1))
+        painter.drawLines(thin)
+        painter.setPen(QPen(QColor("white"), 2))
+        painter.drawLines(thick)
+
+
 # ---------------------------- GUI ----------------------------
 class SudokuSolverGUI(QMainWindow):
     def __init__(self):
@@ -122,6 +303,12 @@ class SudokuSolverGUI(QMainWindow):
         self.remove_input.setStyleSheet(INPUT_STYLE)
         layout.addWidget(self.remove_input)
 
+        # Keep a unique solution while removing cells
+        self.unique_checkbox = QCheckBox("Unique solution")
+        self.unique_checkbox.setChecked(True)
+        self.unique_checkbox.setStyleSheet("color:white; font-size:18px;")
+        layout.addWidget(self.unique_checkbox)
+
         # Custom block size checkbox
         self.block_checkbox = QCheckBox("Use custom block size")
         self.block_checkbox.setStyleSheet("color:white; font-size:18px;")
@@ -129,7 +316,7 @@ class SudokuSolverGUI(QMainWindow):
 
         # Block size input, hidden initially
         self.block_input = QLineEdit()
-        self.block_input.setPlaceholderText("Block size (e.g., 3)")
+        self.block_input.setPlaceholderText("Block size (e.g., 3, or 2x3 for 6x6)")
         self.block_input.setStyleSheet(INPUT_STYLE)
         self.block_input.setVisible(False)
         layout.addWidget(self.block_input)
@@ -137,6 +324,18 @@ class SudokuSolverGUI(QMainWindow):
         # Connect checkbox to toggle function
         self.block_checkbox.stateChanged.connect(self.toggle_block_input)
 
+        # Solver backend (solving a puzzle; full grids are generated without a solver)
+        label_backend = QLabel("Solver:")
+        label_backend.setStyleSheet(LABEL_STYLE)
+        layout.addWidget(label_backend)
+
+        self.backend_combo = QComboBox()
+        self.backend_combo.addItem("Constraint propagation", "propagation")
+        self.backend_combo.addItem("Gurobi MILP", "gurobi")
+        self.backend_combo.setStyleSheet("color:white; font-size:16px; padding:6px;")
+        self.backend_combo.setToolTip("Used to solve a given puzzle; generated grids are built directly.")
+        layout.addWidget(self.backend_combo)
+
         # Solve button
         self.solve_btn = QPushButton("🚀 SOLVE")
         self.solve_btn.setMinimumHeight(50)
@@ -155,6 +354,39 @@ class SudokuSolverGUI(QMainWindow):
         self.solve_btn.clicked.connect(self.solve)
         layout.addWidget(self.solve_btn)
 
+        # Own puzzle: pasted or imported (text / CSV), 0 or '.' for empty cells
+        label_puzzle = QLabel("Or solve a puzzle:")
+        label_puzzle.setStyleSheet(LABEL_STYLE)
+        layout.addWidget(label_puzzle)
+
+        self.puzzle_input = QTextEdit()
+        self.puzzle_input.setPlaceholderText("One row per line, e.g.\n5 3 . . 7 . . . .\nor 5,3,0,0,7,0,0,0,0")
+        self.puzzle_input.setStyleSheet("""
+            QTextEdit {
+                padding: 8px;
+                border: 2px solid #555555;
+                border-radius: 6px;
+                font-size: 16px;
+                font-family: monospace;
+                background-color: #2C2C2C;
+                color: #FFFFFF;
+            }
+        """)
+        self.puzzle_input.setMinimumHeight(120)
+        layout.addWidget(self.puzzle_input)
+
+        puzzle_buttons = QHBoxLayout()
+        import_btn = QPushButton("📂 IMPORT FILE")
+        import_btn.setStyleSheet(BUTTON_STYLE)
+        import_btn.clicked.connect(self.import_puzzle)
+        puzzle_buttons.addWidget(import_btn)
+
+        solve_puzzle_btn = QPushButton("🧩 SOLVE PUZZLE")
+        solve_puzzle_btn.setStyleSheet(BUTTON_STYLE)
+        solve_puzzle_btn.clicked.connect(self.solve_puzzle)
+        puzzle_buttons.addWidget(solve_puzzle_btn)
+        layout.addLayout(puzzle_buttons)
+
         # Back button
         back_btn = QPushButton("⬅ BACK")
         back_btn.setMinimumHeight(50)
@@ -179,13 +411,9 @@ class SudokuSolverGUI(QMainWindow):
     def create_board_page(self):
         page = QWidget()
         layout = QVBoxLayout(page)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
 
-        self.board_widget = QWidget()
-        self.board_layout = QGridLayout()
-        self.board_layout.setSpacing(1)
-        self.board_widget.setLayout(self.board_layout)
-        layout.addWidget(self.board_widget)
+        self.board = SudokuBoard()
+        layout.addWidget(self.board, 1)
 
         self.back_btn_board = QPushButton("⬅ BACK")
         self.back_btn_board.setStyleSheet(BUTTON_STYLE)
@@ -238,9 +466,11 @@ class SudokuSolverGUI(QMainWindow):
         <ul>
         <li><b>Sudoku size (n):</b> Enter the size of the Sudoku grid. Standard Sudoku is 9x9.</li>
         <li><b>Cells to remove:</b> Enter the number of cells to remove to create the puzzle.</li>
+        <li><b>Unique solution:</b> Only removes a cell when the puzzle still has exactly one solution (on by default). If fewer cells than requested can be removed, you are told how many were.</li>
         <li><b>Use custom block size:</b> Check this box if you want to define a custom block size (default is √n).</li>
-        <li><b>Block size:</b> Enter the block size if using a custom block size.</li>
+        <li><b>Block size:</b> Enter the block size if using a custom block size: <b>3</b> for 3x3 blocks, or <b>rows x cols</b> for rectangular blocks (e.g. <b>2x3</b> for 6x6, <b>2x4</b> for 8x8, <b>3x4</b> for 12x12).</li>
         <li><b>🚀 SOLVE:</b> Generates the Sudoku solution and puzzle with removed cells.</li>
+        <li><b>Or solve a puzzle:</b> Paste a grid (one row per line, values separated by spaces or commas, 0 or '.' for empty cells) or load it with <b>📂 IMPORT FILE</b> (.txt / .csv), then press <b>🧩 SOLVE PUZZLE</b>. Clues stay white, solved cells are shown in turquoise.</li>
         <li><b>⬅ BACK:</b> Returns to the main menu.</li>
         </ul>
 
@@ -249,6 +479,8 @@ class SudokuSolverGUI(QMainWindow):
         <li>Displays the Sudoku grid after solving.</li>
         <li>Numbers in the cells represent the solution; empty cells are removed for the puzzle.</li>
         <li>Subgrid boundaries are highlighted for easier visualization.</li>
+        <li>When solving a puzzle, the clues are shown first and the solver's cells fill in one after another.</li>
+        <li>The board scales with the window, and large grids (up to 49x49 and beyond) stay responsive.</li>
         <li><b>⬅ BACK:</b> Return to the input page to change parameters or solve another puzzle.</li>
         </ul>
 
@@ -261,7 +493,7 @@ class SudokuSolverGUI(QMainWindow):
         <h2 style='color:#FFD700; font-size:28px;'>💡 Tips</h2>
         <ul>
         <li>Ensure that 'Cells to remove' is less than n².</li>
-        <li>Block size must satisfy n =block_size².</li>
+        <li>Block size must satisfy n = block_size², or rows × cols = n for rectangular blocks.</li>
         <li>If an invalid configuration is provided, the solver will alert you with a warning.</li>
         <li>Use proper Sudoku rules: each number 1–n appears exactly once in each row, column, and subgrid.</li>
         <li>Check your custom block size carefully; otherwise, the solver will indicate an error.</li>
@@ -313,121 +545,87 @@ class SudokuSolverGUI(QMainWindow):
 
 
 
-    # ---------------- Clear Board ----------------
-    def clear_board(self):
-        for i in reversed(range(self.board_layout.count())):
-            w = self.board_layout.itemAt(i).widget()
-            if w:
-                w.deleteLater()
+    # ---------------- Board Display ----------------
+    def show_board(self, grid, block_size, givens=None):
+        """Display grid with subgrid borders (givens: puzzle clues, shown in white)"""
+        self.board.set_grid(grid, block_size, givens)
+        self.stacked.setCurrentWidget(self.board_page)
 
     # ---------------- Solve ----------------
     def solve(self):
-        self.clear_board()
         try:
             n = int(self.n_input.text())
             eliminate = int(self.remove_input.text())
-            block_size = int(self.block_input.text()) if self.block_checkbox.isChecked() else -1
+            block_size = parse_block_size(self.block_input.text()) if self.block_checkbox.isChecked() else -1
         except:
             QMessageBox.warning(self, "Input Error", "Enter valid numbers.")
             return
 
-        if n < 1 or (block_size < 1 and self.block_checkbox.isChecked()) or block_size > n:
+        if n < 1:
             QMessageBox.warning(self, "Input Error", "Invalid sizes.")
             return
-        if eliminate >= n*n:
-            QMessageBox.warning(self, "Input Error", f"Cells to remove must be < {n*n}.")
+        # Block shape checked before any solve
+        try:
+            check_shape(n, block_size)
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Block Size", str(e))
+            return
+        if not 0 <= eliminate < n*n:
+            QMessageBox.warning(self, "Input Error", f"Cells to remove must be between 0 and {n*n-1}.")
             return
 
-        # ---------------- Gurobi Model ----------------
-        model = Model("Sudoku")
-        model.setParam("OutputFlag",0)
-        x = {}
-        for r in range(1,n+1):
-            for c in range(1,n+1):
-                for d in range(1,n+1):
-                    x[(r,c,d)] = model.addVar(vtype=GRB.BINARY)
-
-        # Constraints
-        for r in range(1,n+1):
-            for c in range(1,n+1):
-                model.addConstr(sum(x[(r,c,d)] for d in range(1,n+1))==1)
-        for r in range(1,n+1):
-            for d in range(1,n+1):
-                model.addConstr(sum(x[(r,c,d)] for c in range(1,n+1))==1)
-        for c in range(1,n+1):
-            for d in range(1,n+1):
-                model.addConstr(sum(x[(r,c,d)] for r in range(1,n+1))==1)
-        if block_size!=-1:
-            # subgrid constraints
-            for r in range(1,n+1,block_size):
-                for c in range(1,n+1,block_size):
-                    for d in range(1,n+1):
-                        model.addConstr(
-                            sum(
-                                x[rr,cc,d]
-                                for rr in range(r,min(r+block_size,n+1))
-                                for cc in range(c,min(c+block_size,n+1))
-                            )==1
-                        )
-
-        model.setObjective(0, GRB.MINIMIZE)
-        model.optimize()
-
-        if model.status != GRB.OPTIMAL:
-            QMessageBox.warning(self, "No Solution", "Sudoku could not be solved.")
-            if block_size**2 != n:
-                QMessageBox.warning(self, "Invalid Block Size", 
-                    f"Block size {block_size} is invalid for grid {n}x{n}. Must satisfy block_size^2 = n.")
-                
+        grid = generate(n, block_size)
+
+        # Remove cells
+        if self.unique_checkbox.isChecked():
+            grid = remove_cells_unique(grid, eliminate, block_size)
+            removed = sum(v == 0 for row in grid for v in row)
+            if removed < eliminate:
+                QMessageBox.information(self, "Unique Solution",
+                    f"Only {removed} cells could be removed while keeping a unique solution.")
+        else:
+            grid = remove_cells(grid, eliminate)
 
+        self.show_board(grid, block_size)
+
+    # ---------------- Puzzle Mode ----------------
+    def import_puzzle(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import puzzle", "", "Puzzles (*.txt *.csv);;All files (*)")
+        if not path:
             return
+        try:
+            with open(path) as f:
+                self.puzzle_input.setPlainText(f.read())
+        except OSError as e:
+            QMessageBox.warning(self, "Import Error", str(e))
 
-        # Build grid
-        grid = [[0]*n for _ in range(n)]
-        for (r,c,d), var in x.items():
-            if var.X > 0.5:
-                grid[r-1][c-1] = d
+    def solve_puzzle(self):
+        try:
+            puzzle = parse_grid(self.puzzle_input.toPlainText())
+        except ValueError as e:
+            QMessageBox.warning(self, "Input Error", str(e))
+            return
 
-        # Remove cells
-        removed = 0
-        while removed < eliminate:
-            i,j = rand(0,n-1), rand(0,n-1)
-            if grid[i][j] != 0:
-                grid[i][j] = 0
-                removed += 1
-
-        # Display grid with subgrid borders
-        cell_size = min(500//n,60)
-        for r in range(n):
-            for c in range(n):
-                cell = QLabel()
-                cell.setAlignment(Qt.AlignmentFlag.AlignCenter)
-                cell.setFixedSize(cell_size, cell_size)
-                val = grid[r][c]
-
-                if val != 0:
-                    bg_color = "#3A3A3A"
-                    cell.setText(str(val))
-                    cell.setStyleSheet(f"background-color:{bg_color}; color:white; font-size:{cell_size//2}px; font-weight:bold;")
-                else:
-                    bg_color = "#1E1E1E"
-                    cell.setText("")
-                    cell.setStyleSheet(f"background-color:{bg_color};")
-
-                # Borders for blocks
-                top = 2 if r % block_size == 0 else 1
-                left = 2 if c % block_size == 0 else 1
-                bottom = 2 if (r+1) % block_size == 0 else 1
-                right = 2 if (c+1) % block_size == 0 else 1
-
-                cell.setStyleSheet(cell.styleSheet() + f"""
-                    border-top:{top}px solid white;
-                    border-left:{left}px solid white;
-                    border-bottom:{bottom}px solid white;
-                    border-right:{right}px solid white;
-                """)
-
-                self.board_layout.addWidget(cell, r, c)
+        n = len(puzzle)
+        if self.block_checkbox.isChecked():
+            try:
+                block_size = parse_block_size(self.block_input.text())
+            except ValueError as e:
+                QMessageBox.warning(self, "Input Error", str(e))
+                return
+        else:
+            # Usual blocks for this size (3x3, 2x3 for 6x6...), Latin square for a prime n
+            block_size = default_block(n)
 
-        self.stacked.setCurrentWidget(self.board_page)
+        try:
+            grid = solve_grid(puzzle, block_size, self.backend_combo.currentData())
+        except ValueError as e:
+            QMessageBox.warning(self, "Invalid Puzzle", str(e))
+            return
+        if grid is None:
+            QMessageBox.warning(self, "No Solution", "This puzzle has no solution.")
+            return
 
+        # Clues first, then the solver's cells appear one by one
+        self.show_board(puzzle, block_size)
+        self.board.animate(grid)
@@ -0,0 +1,72 @@
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+pytest.importorskip("PySide6")
+from PySide6.QtGui import QColor
+from PySide6.QtWidgets import QApplication
+
+from graphical_interfaces.sudoku import EMPTY, GIVEN, SOLVED, SudokuBoard
+from non_interfaces.sudoku_core import pattern_grid
+
+
+@pytest.fixture
+def board():
+    app = QApplication.instance() or QApplication([])
+    widget = SudokuBoard()
+    widget.resize(540, 540)
+    yield widget
+    widget.deleteLater()
+    app.processEvents()
+
+
+def cell_color(board, image, r, c):
+    """Background colour near the corner of cell (r, c), away from lines and digits"""
+    rect = board.cell_rect(r, c)
+    return QColor(image.pixel(rect.left() + 4, rect.top() + 4))
+
+
+def test_states_follow_givens(board):
+    full = pattern_grid(6, 2, 3)
+    puzzle = [row[:] for row in full]
+    puzzle[0][0] = 0
+    board.set_grid(full, (2, 3), givens=puzzle)
+    assert (board.br, board.bc) == (2, 3)
+    assert board.state[0, 0] == SOLVED
+    assert board.state[0, 1] == GIVEN
+
+    board.set_grid(puzzle, (2, 3))
+    assert board.state[0, 0] == EMPTY
+    assert (board.state[1:] == GIVEN).all()
+
+
+def test_paint_and_set_cell(board):
+    puzzle = pattern_grid(9, 3, 3)
+    puzzle[4][4] = 0
+    board.set_grid(puzzle, 3)
+    image = board.grab().toImage()
+    assert cell_color(board, image, 4, 4) == SudokuBoard.BACKGROUNDS[EMPTY]
+    assert cell_color(board, image, 0, 0) == SudokuBoard.BACKGROUNDS[GIVEN]
+
+    board.set_cell(4, 4, 5)
+    assert board.values[4, 4] == 5
+    assert board.state[4, 4] == SOLVED
+    image = board.grab().toImage()
+    assert cell_color(board, image, 4, 4) == SudokuBoard.BACKGROUNDS[SOLVED]
+
+    board.set_cell(4, 4, 0)
+    assert board.state[4, 4] == EMPTY
+
+
+def test_animate_fills_empty_cells(board):
+    full = pattern_grid(9, 3, 3)
+    puzzle = [row[:] for row in full]
+    for r in range(9):
+        puzzle[r][r] = 0
+    board.set_grid(puzzle, 3)
+    board.animate(full, duration=0)
+    while board.pending:
+        board.animation_step()
+    assert board.values.tolist() == full
+    assert all(board.state[r, r] == SOLVED for r in range(9))
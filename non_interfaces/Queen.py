@@ -5,6 +5,7 @@ print("choose piece: 1 for Queen, 2 for Rook, 3 for Bishop")
 piece= int(input("Enter the number of the piece: "))
 n = int(input("Enter board size N: "))
 k = int(input("Enter number of Piece K (< N): "))
+symmetry = input("Symmetry breaking? (y/n): ").strip().lower() == "y"
 if k > n and piece ==1:
     raise ValueError("K must be <= N")
 
@@ -48,6 +49,10 @@ model.addConstr(sum(x[(r,c)] for r in range(1,n+1) for c in range(1,n+1)) == k)
 # --- Objective (feasibility problem) ---
 model.setObjective(0, GRB.MINIMIZE)
 
+# --- Optional symmetry handling: the 8 symmetries of the board, mostly for proving that K does not fit ---
+if symmetry:
+    model.setParam("Symmetry", 2)
+
 # --- Solve ---
 model.optimize()
 
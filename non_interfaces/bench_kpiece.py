@@ -0,0 +1,112 @@
+"""
+Micro-benchmark of the K-Pieces attack tables (non_interfaces/kpiece_attacks.py)
+against the per-square board scans graphical_interfaces/Kpiece.py used
+before them, for boards of size 8 to 64:
+    attacks   attack set of every square (get_attack_cells_for_piece)
+    pairs     attacking pairs of the maximize-X model (solve_maximize_X step 2)
+    table     building the table, and reading it from the cache
+The scan baseline is a copy of the previous code; both sides are checked
+to give the same pairs. Each timing is the best of REPEAT runs.
+Run from the repository root: python non_interfaces/bench_kpiece.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from non_interfaces.kpiece_attacks import (
+    attack_pairs, attack_table, build_attack_table, clear_table_cache, piece_rule
+)
+
+SIZES = [8, 16, 24, 32, 48, 64]
+PIECES = ["Queen", "Knight"]
+REPEAT = 3
+# The scan baseline is O(n^6) for the pairs; larger boards run it once
+SCAN_REPEAT_ABOVE = 24
+
+
+def scan_attacks(piece_name, r, c, n):
+    """Previous get_attack_cells_for_piece for the standard pieces (1-based, board scans)"""
+    attacked = set()
+    if piece_name == "Knight":
+        for dr, dc in [(-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1)]:
+            rr, cc = r + dr, c + dc
+            if 1 <= rr <= n and 1 <= cc <= n:
+                attacked.add((rr, cc))
+        return attacked
+    if piece_name in ["Rook", "Queen"]:
+        for rr in range(1, n + 1):
+            for cc in range(1, n + 1):
+                if rr == r:
+                    attacked.add((rr, cc))
+        for cc in range(1, n + 1):
+            for rr in range(1, n + 1):
+                if cc == c:
+                    attacked.add((rr, cc))
+    if piece_name in ["Bishop", "Queen"]:
+        for rr in range(1, n + 1):
+            cc = rr - (r - c)
+            if 1 <= cc <= n:
+                attacked.add((rr, cc))
+        for rr in range(1, n + 1):
+            cc = (r + c) - rr
+            if 1 <= cc <= n:
+                attacked.add((rr, cc))
+    return attacked
+
+
+def scan_all(piece_name, n):
+    return [scan_attacks(piece_name, r, c, n) for r in range(1, n + 1) for c in range(1, n + 1)]
+
+
+def scan_pairs(piece_name, n):
+    """Previous solve_maximize_X step 2 on an empty board"""
+    cells = [(r, c) for r in range(1, n + 1) for c in range(1, n + 1)]
+    pairs = []
+    for i in range(len(cells)):
+        r1, c1 = cells[i]
+        attacked_by_r1 = scan_attacks(piece_name, r1, c1, n)
+        for j in range(i + 1, len(cells)):
+            if cells[j] in attacked_by_r1:
+                pairs.append((i, j))
+    return pairs
+
+
+def table_all(piece_name, n):
+    table = attack_table(n, *piece_rule(piece_name))
+    return [np.flatnonzero(row) for row in table]
+
+
+def bench(fn, *args, repeat=REPEAT):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+if __name__ == "__main__":
+    print(f"{'n':>3} {'piece':>7} {'attacks scan':>13} {'attacks table':>14} {'pairs scan':>11} "
+          f"{'pairs table':>12} {'build':>8} {'cached':>9}   (s)")
+    for n in SIZES:
+        repeat = REPEAT if n <= SCAN_REPEAT_ABOVE else 1
+        for piece in PIECES:
+            rule = piece_rule(piece)
+            clear_table_cache()
+            build = bench(build_attack_table, n, *rule)
+            cached = bench(attack_table, n, *rule)
+
+            old_pairs = scan_pairs(piece, n)
+            new_pairs = attack_pairs(attack_table(n, *rule))
+            assert sorted(old_pairs) == sorted(map(tuple, new_pairs.tolist())), (n, piece)
+
+            print(f"{n:>3} {piece:>7} {bench(scan_all, piece, n, repeat=repeat):>13.4f} "
+                  f"{bench(table_all, piece, n):>14.4f} "
+                  f"{bench(scan_pairs, piece, n, repeat=repeat):>11.4f} "
+                  f"{bench(lambda: attack_pairs(attack_table(n, *rule))):>12.4f} "
+                  f"{build:>8.4f} {cached:>9.6f}")
@@ -0,0 +1,83 @@
+"""
+Benchmark of non_interfaces/kpiece_mis.py against the cold MILP of
+kpiece_model.py on "place existing pieces" boards: a random 20% of the
+squares is taken out (occupied or attacked by existing pieces) and the
+most pieces of a rule are placed on the rest. Columns: set size after
+greedy and local search, time of the MILP from scratch and of the whole
+pipeline (greedy, local search, MILP started from its set; "*" when not
+proven within TIME_LIMIT, "-" above the size-limited license), and on
+larger boards the anytime result within TIME_LIMIT, with its upper
+bound, against the known maximum of the empty board.
+Run from the repository root: python non_interfaces/bench_kpiece_mis.py
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from gurobipy import GRB, GurobiError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from non_interfaces.bench_kpiece_symmetry import jumps
+from non_interfaces.kpiece_attacks import PIECE_RULES
+from non_interfaces.kpiece_mis import maximum_placement
+from non_interfaces.kpiece_model import build_model
+
+TIME_LIMIT = 10
+BLOCKED = 0.2
+
+RULES = {
+    "Queen": PIECE_RULES["Queen"],
+    "Knight": PIECE_RULES["Knight"],
+    "Centaur": (jumps((1, 2), (1, 0), (1, 1)), ()),
+    "Camel+Wazir": (jumps((1, 3), (1, 0)), ()),
+}
+# name -> board sizes with blocked squares (MILP) / empty boards (anytime, known maximum)
+CASES = {"Queen": [20, 40], "Knight": [16, 20], "Centaur": [16, 20], "Camel+Wazir": [12, 16]}
+ANYTIME = {"Knight": [(64, 2048), (100, 5000)], "Centaur": [(64, 1024)]}
+
+
+def free_cells(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return np.flatnonzero(rng.random(n * n) >= BLOCKED)
+
+
+def cold_milp(n, rule, cells):
+    """Time column and size of the maximization from scratch"""
+    model, _ = build_model(n, *rule, cells=cells)
+    model.setParam("TimeLimit", TIME_LIMIT)
+    t0 = time.perf_counter()
+    try:
+        model.optimize()
+    except GurobiError:
+        return "-", 0
+    done = "" if model.status == GRB.OPTIMAL else "*"
+    return f"{time.perf_counter() - t0:.2f}{done}", round(model.ObjVal)
+
+
+if __name__ == "__main__":
+    print(f"{'piece':>12} {'n':>4} {'greedy':>7} {'local':>6} {'local s':>8} "
+          f"{'cold MILP s':>12} {'pipeline s':>11} {'max':>5}")
+    for name, sizes in CASES.items():
+        rule = RULES[name]
+        for n in sizes:
+            cells = free_cells(n)
+            heuristic = maximum_placement(n, *rule, cells=cells, exact=False)
+            cold_seconds, cold_size = cold_milp(n, rule, cells)
+            warm = maximum_placement(n, *rule, cells=cells, time_limit=TIME_LIMIT)
+            assert len(warm["squares"]) >= cold_size
+            pipeline = f"{warm['seconds']:.2f}" + ("" if warm["optimal"] else "*")
+            sizes_ = heuristic["sizes"]
+            print(f"{name:>12} {n:>4} {sizes_['greedy']:>7} {sizes_['local_search']:>6} "
+                  f"{heuristic['seconds']:>8.2f} {cold_seconds:>12} {pipeline:>11} "
+                  f"{len(warm['squares']):>5}")
+
+    print(f"\nAnytime within {TIME_LIMIT} s on empty boards")
+    print(f"{'piece':>12} {'n':>4} {'greedy':>7} {'found':>6} {'bound':>6} {'known':>6} {'s':>6}")
+    for name, runs in ANYTIME.items():
+        for n, known in runs:
+            result = maximum_placement(n, *RULES[name], time_limit=TIME_LIMIT)
+            print(f"{name:>12} {n:>4} {result['sizes']['greedy']:>7} {len(result['squares']):>6} "
+                  f"{result['bound']:>6.0f} {known:>6} {result['seconds']:>6.2f}")
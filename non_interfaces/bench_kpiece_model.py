@@ -0,0 +1,62 @@
+"""
+Benchmark of the K-pieces formulations (non_interfaces/kpiece_model.py):
+maximum number of pieces on an empty n x n board with one constraint per
+attacking pair ("pairs") or per clique of the attack graph ("clique").
+For each: constraint count, LP relaxation bound, MIP optimum and solve
+time (TIME_LIMIT seconds at most; "(errno)" on a Gurobi error such as a
+size-limited license). "King" is a custom piece with the eight king moves.
+Run from the repository root: python non_interfaces/bench_kpiece_model.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gurobipy import GRB, GurobiError
+
+from non_interfaces.kpiece_attacks import piece_rule
+from non_interfaces.kpiece_model import FORMULATIONS, build_model
+
+KING = tuple((dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if (dr, dc) != (0, 0))
+RULES = {
+    "Queen": piece_rule("Queen"),
+    "Bishop": piece_rule("Bishop"),
+    "Knight": piece_rule("Knight"),
+    "King": (KING, ()),
+}
+SIZES = [6, 8, 10, 16, 24, 32, 40]
+TIME_LIMIT = 30
+
+
+def run(n, rule, formulation):
+    """(constraints, LP bound, optimum, seconds) as text"""
+    model, _ = build_model(n, *rule, formulation=formulation)
+    model.setParam("TimeLimit", TIME_LIMIT)
+    model.update()
+    constraints = model.NumConstrs
+    try:
+        relaxed = model.relax()
+        relaxed.optimize()
+        bound = f"{relaxed.ObjVal:.1f}"
+        t0 = time.perf_counter()
+        model.optimize()
+        seconds = time.perf_counter() - t0
+    except GurobiError as e:
+        return constraints, f"({e.errno})", "", ""
+    best = f"{model.ObjVal:.0f}" + ("*" if model.status == GRB.TIME_LIMIT else "")
+    return constraints, bound, best, f"{seconds:.3f}"
+
+
+if __name__ == "__main__":
+    print(f"{'n':>3} {'piece':>7} " + " ".join(
+        f"{f + ' rows':>12} {'LP':>7} {'opt':>5} {'time (s)':>9}" for f in FORMULATIONS))
+    for name, rule in RULES.items():
+        for n in SIZES:
+            cols = []
+            for formulation in FORMULATIONS:
+                rows, bound, best, seconds = run(n, rule, formulation)
+                cols.append(f"{rows:>12} {bound:>7} {best:>5} {seconds:>9}")
+            print(f"{n:>3} {name:>7} " + " ".join(cols))
+    print(f"(* time limit of {TIME_LIMIT} s reached)")
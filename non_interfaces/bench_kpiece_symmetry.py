@@ -0,0 +1,64 @@
+"""
+Benchmark of the symmetry modes of non_interfaces/kpiece_model.py on
+infeasibility proofs: the maximum number of pieces of a rule is found
+first, then one more piece is asked for and each mode has to prove that
+it does not fit. "off" disables Gurobi's own symmetry detection
+(Symmetry=0), "default" leaves it as is; see SYMMETRY_MODES for the
+others. Pieces are fairy pieces given by their jumps (all 8 orientations)
+and lines, whose LP bound is not tight; for the standard chess pieces
+the clique model proves infeasibility at the root.
+Run from the repository root: python non_interfaces/bench_kpiece_symmetry.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gurobipy import GRB
+
+from non_interfaces.kpiece_model import build_model
+
+TIME_LIMIT = 60
+MODES = ["off", "default", "gurobi", "lex"]
+
+
+def jumps(*moves):
+    """Offsets of leaper moves in all 8 orientations"""
+    return tuple(sorted({(sr * a, sc * b) for dr, dc in moves for a, b in ((dr, dc), (dc, dr))
+                         for sr in (1, -1) for sc in (1, -1)}))
+
+
+# name -> (rule, board sizes)
+CASES = {
+    "Centaur": ((jumps((1, 2), (1, 0), (1, 1)), ()), [10, 12]),
+    "Camel+Wazir": ((jumps((1, 3), (1, 0)), ()), [10, 12]),
+    "Knight+Dabbaba": ((jumps((1, 2), (2, 0)), ()), [12]),
+    "Amazon": ((jumps((1, 2)), ("col", "diag", "row")), [8]),
+}
+
+
+def prove(n, rule, k, mode):
+    """Time and nodes to prove that k pieces do not fit"""
+    model, _ = build_model(n, *rule, k=k, symmetry=None if mode in ("off", "default") else mode)
+    if mode == "off":
+        model.setParam("Symmetry", 0)
+    model.setParam("TimeLimit", TIME_LIMIT)
+    t0 = time.perf_counter()
+    model.optimize()
+    seconds = time.perf_counter() - t0
+    done = "" if model.status == GRB.INFEASIBLE else "*"
+    return f"{seconds:.2f}{done} ({int(model.NodeCount)})"
+
+
+if __name__ == "__main__":
+    print(f"{'piece':>15} {'n':>3} {'max':>4} " + " ".join(f"{m + ' s (nodes)':>20}" for m in MODES))
+    for name, (rule, sizes) in CASES.items():
+        for n in sizes:
+            model, _ = build_model(n, *rule)
+            model.optimize()
+            best = round(model.ObjVal)
+            cols = [prove(n, rule, best + 1, mode) for mode in MODES]
+            print(f"{name:>15} {n:>3} {best:>4} " + " ".join(f"{c:>20}" for c in cols))
+    print(f"(* not proven within {TIME_LIMIT} s)")
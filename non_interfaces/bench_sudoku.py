@@ -0,0 +1,74 @@
+"""
+Micro-benchmark of the headless Sudoku core (non_interfaces/sudoku_core.py):
+full grid (search from an empty grid vs pattern generator), remove
+(plain and uniqueness-preserving) and solve for grids of size 9, 16, 25
+and 36, with the constraint-propagation engine and the Gurobi MILP.
+Each timing is the best of REPEAT runs; index tables are timed with
+and without the per-shape cache. The MILP solve of a puzzle is presolved by its clues.
+Run from the repository root: python non_interfaces/bench_sudoku.py
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from gurobipy import GurobiError
+
+from non_interfaces.sudoku_core import (
+    BACKENDS, build_milp, generate, remove_cells, remove_cells_unique, solve
+)
+from non_interfaces.sudoku_engine import block_shape, index_tables, unit_tables
+
+# (n, block_size, fraction of cells removed for the puzzle case)
+# Random 36x36 puzzles with half the cells removed can fall outside the
+# reach of plain singles + MRV search, hence the smaller fraction there.
+SIZES = [(9, 3, 0.6), (16, 4, 0.5), (25, 5, 0.5), (36, 6, 0.4)]
+REPEAT = 3
+
+
+def bench(fn, *args, repeat=REPEAT):
+    """Best wall time of `repeat` calls, as text ("(errno)" on a Gurobi error)."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        try:
+            fn(*args)
+        except GurobiError as e:
+            return f"({e.errno})"
+        best = min(best, time.perf_counter() - t0)
+    return f"{best:.4f}"
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    print(f"{'n':>3} {'step':>9} " + " ".join(f"{b + ' (s)':>16}" for b in BACKENDS))
+
+    for n, b, removed in SIZES:
+        full = generate(n, b, rng=rng)
+        puzzle = remove_cells(full, int(n * n * removed), rng)
+
+        empty = [[0] * n for _ in range(n)]
+        rows = [
+            ("empty", lambda backend: bench(solve, empty, b, backend)),
+            ("solve", lambda backend: bench(solve, puzzle, b, backend)),
+        ]
+        for step, run in rows:
+            print(f"{n:>3} {step:>9} " + " ".join(f"{run(backend):>16}" for backend in BACKENDS))
+        print(f"{n:>3} {'pattern':>9} {bench(generate, n, b):>16}")
+        print(f"{n:>3} {'remove':>9} {bench(remove_cells, full, int(n * n * removed)):>16}")
+        print(f"{n:>3} {'unique':>9} {bench(remove_cells_unique, full, int(n * n * removed), b):>16}")
+
+        # Index tables: what every solve paid before the per-shape cache
+        shape = block_shape(n, b)
+        uncached = bench(lambda: (index_tables.__wrapped__(n, shape), unit_tables.__wrapped__(n, shape)))
+        cached = bench(lambda: (index_tables(n, shape), unit_tables(n, shape)))
+        print(f"{n:>3} {'tables':>9} {uncached:>16} built, {cached} cached")
+        print(f"{n:>3} {'milp':>9} {bench(build_milp, empty, b):>16} model build, empty grid")
+
+        # Presolve: MILP size of the puzzle vs the n^3 variables of the full model
+        model = build_milp(puzzle, b)[0]
+        model.update()
+        print(f"{n:>3} {'presolve':>9} {model.NumVars:>7} of {n ** 3} variables, {model.NumConstrs} constraints")
@@ -0,0 +1,165 @@
+"""
+K-Pieces Attack Tables
+Which squares a piece attacks, as one boolean matrix per (piece rule,
+board size) instead of a scan of the board per square. Squares are
+numbered r*n + c (0-based); table[a, b] is True when a piece on a
+attacks b. A rule is (offsets, specials): finite jumps (dr, dc) and the
+sliding lines 'row', 'col', 'diag' of graphical_interfaces/Kpiece.py
+custom pieces. Lines are not blocked by other pieces. Tables are
+cached up to TABLE_CACHE_BYTES in total (one n = 100 table is 100 MB);
+is_independent checks a placement without a table, for boards too large
+for one.
+"""
+
+from collections import OrderedDict
+
+import numpy as np
+
+KNIGHT_MOVES = ((-2, -1), (-2, 1), (-1, -2), (-1, 2), (1, -2), (1, 2), (2, -1), (2, 1))
+
+# Standard pieces as rules
+PIECE_RULES = {
+    "Queen": ((), ("col", "diag", "row")),
+    "Rook": ((), ("col", "row")),
+    "Bishop": ((), ("diag",)),
+    "Knight": (KNIGHT_MOVES, ()),
+}
+PIECE_SYMBOLS = {"Queen": "♛", "Rook": "♜", "Bishop": "♝", "Knight": "♞"}
+
+# Total size of the cached attack tables; the most recent one is always kept
+TABLE_CACHE_BYTES = 256 * 2**20
+_tables = OrderedDict()
+
+
+def piece_rule(piece_name, custom_pieces=None):
+    """
+    Rule (offsets, specials) of a piece name as shown in the GUI: a
+    custom piece name, with or without " ⭐" (custom_pieces: name ->
+    {'offsets': [...], 'special': [...]}), is looked up first, by its
+    full name; otherwise "Queen" or "Queen ♛" give the standard rules.
+    Unknown names attack nothing.
+    """
+    base = piece_name.replace(" ⭐", "").strip()
+    custom = (custom_pieces or {}).get(base)
+    if custom is not None:
+        offsets = {tuple(o) for o in custom.get('offsets', [])}
+        return tuple(sorted(offsets)), tuple(sorted(set(custom.get('special', []))))
+
+    words = base.split()
+    if len(words) == 1 or len(words) == 2 and PIECE_SYMBOLS.get(words[0]) == words[1]:
+        return PIECE_RULES.get(words[0], ((), ()))
+    return (), ()
+
+
+def build_attack_table(n, offsets=(), specials=()):
+    """
+    (n*n, n*n) boolean attack matrix of a rule on an n x n board (a square
+    never attacks itself), built with NumPy index arithmetic. Read-only,
+    since attack_table shares it between callers.
+    """
+    r, c = np.divmod(np.arange(n * n), n)
+    table = np.zeros((n * n, n * n), dtype=bool)
+
+    for dr, dc in offsets:
+        rr, cc = r + dr, c + dc
+        inside = (rr >= 0) & (rr < n) & (cc >= 0) & (cc < n)
+        table[np.flatnonzero(inside), (rr * n + cc)[inside]] = True
+
+    if 'row' in specials:
+        table |= r[:, None] == r[None, :]
+    if 'col' in specials:
+        table |= c[:, None] == c[None, :]
+    if 'diag' in specials:
+        table |= (r - c)[:, None] == (r - c)[None, :]
+        table |= (r + c)[:, None] == (r + c)[None, :]
+
+    np.fill_diagonal(table, False)
+    table.setflags(write=False)
+    return table
+
+
+def attack_table(n, offsets=(), specials=()):
+    """
+    build_attack_table, cached per (n, rule) with LRU eviction once the
+    cached tables exceed TABLE_CACHE_BYTES.
+    """
+    key = (n, tuple(offsets), tuple(specials))
+    table = _tables.get(key)
+    if table is not None:
+        _tables.move_to_end(key)
+        return table
+
+    table = _tables[key] = build_attack_table(n, offsets, specials)
+    while len(_tables) > 1 and sum(t.nbytes for t in _tables.values()) > TABLE_CACHE_BYTES:
+        _tables.popitem(last=False)
+    return table
+
+
+def clear_table_cache():
+    """Drop every cached attack table"""
+    _tables.clear()
+
+
+def piece_attacks(n, piece_name, custom_pieces=None):
+    """attack_table of a piece name (see piece_rule)"""
+    return attack_table(n, *piece_rule(piece_name, custom_pieces))
+
+
+def attack_pairs(table, cells=None):
+    """
+    Pairs (a, b), a < b, of squares where either piece attacks the other,
+    as a (P, 2) array; `cells` (sorted square indices) restricts both ends.
+    """
+    if cells is not None:
+        cells = np.asarray(cells)
+        table = table[np.ix_(cells, cells)]
+    a, b = np.nonzero(table)
+    upper = a < b
+    one_way = ~upper & ~table[b, a]   # b attacked by a only, not the reverse
+    pairs = np.concatenate([np.stack([a[upper], b[upper]], axis=1),
+                            np.stack([b[one_way], a[one_way]], axis=1)])
+    return pairs if cells is None else cells[pairs]
+
+
+def line_keys(n, specials):
+    """Per-square line numbers of each sliding special (squares on one line share a number)"""
+    r, c = np.divmod(np.arange(n * n), n)
+    keys = []
+    if 'row' in specials:
+        keys.append(r)
+    if 'col' in specials:
+        keys.append(c)
+    if 'diag' in specials:
+        keys += [r - c, r + c]
+    return keys
+
+
+def is_independent(n, squares, offsets=(), specials=()):
+    """
+    True when no piece of a rule on `squares` attacks another, without
+    building the n^2 x n^2 table: each line of a special holds at most
+    one piece, and the occupancy mask shifted by each offset does not
+    meet itself. O(n^2) memory, so usable for boards in the thousands.
+    """
+    squares = np.asarray(squares, dtype=np.int64)
+    r, c = np.divmod(squares, n)
+    occupied = np.zeros((n, n), dtype=bool)
+    occupied[r, c] = True
+    if occupied.sum() < len(squares):
+        return False  # a square used twice
+
+    lines = {'row': [r], 'col': [c], 'diag': [r - c, r + c]}
+    for special in specials:
+        for key in lines[special]:
+            if len(key) and np.bincount(key - key.min()).max() > 1:
+                return False
+
+    for dr, dc in offsets:
+        if abs(dr) >= n or abs(dc) >= n:
+            continue  # the jump leaves the board from every square
+        # piece on (i, j) attacks (i + dr, j + dc): overlap of the mask with its shift
+        src = occupied[max(0, -dr):n - max(0, dr), max(0, -dc):n - max(0, dc)]
+        dst = occupied[max(0, dr):n - max(0, -dr), max(0, dc):n - max(0, -dc)]
+        if (src & dst).any():
+            return False
+    return True
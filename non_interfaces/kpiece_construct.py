@@ -0,0 +1,80 @@
+"""
+K-Pieces Constructions
+Maximum placements of the standard chess pieces on an empty n x n board
+in closed form, O(n^2) at most, so boards in the thousands are answered
+without a solver (squares numbered r*n + c, 0-based):
+    Rook     n          the main diagonal
+    Bishop   2n - 2     the whole first row and the last row without its corners
+    Knight   ceil(n^2/2) all squares of one colour (all 4 squares for n = 2)
+    Queen    n          the explicit N-queens construction for n >= 4
+                        (evens then odds, with the n mod 6 = 2 / 3 fixes);
+                        1 for n = 2, 2 for n = 3
+Any subset of a maximum placement is valid, so K pieces fit exactly
+when K <= the maximum. Every construction is checked with
+kpiece_attacks.is_independent before it is returned.
+"""
+
+import numpy as np
+
+from non_interfaces.kpiece_attacks import PIECE_RULES, is_independent
+
+
+# Maximum placements below 4, one queen per row from the first
+SMALL_QUEENS = {1: [0], 2: [0], 3: [0, 2]}
+
+
+def queen_columns(n):
+    """Column of the queen of each row (0-based) of a maximum placement"""
+    if n in SMALL_QUEENS:
+        return SMALL_QUEENS[n]
+    evens = list(range(2, n + 1, 2))
+    odds = list(range(1, n + 1, 2))
+    if n % 6 == 2:
+        odds[0], odds[1] = odds[1], odds[0]
+        odds.remove(5)
+        odds.append(5)
+    elif n % 6 == 3:
+        evens.remove(2)
+        evens.append(2)
+        odds = odds[2:] + [1, 3]
+    return [col - 1 for col in evens + odds]
+
+
+def _rook(n):
+    return np.arange(n) * (n + 1)
+
+
+def _bishop(n):
+    if n == 1:
+        return np.array([0])
+    return np.concatenate([np.arange(n), (n - 1) * n + np.arange(1, n - 1)])
+
+
+def _knight(n):
+    if n == 2:
+        return np.arange(4)
+    return np.flatnonzero((np.add.outer(np.arange(n), np.arange(n)) % 2 == 0).ravel())
+
+
+def _queen(n):
+    cols = queen_columns(n)
+    return np.arange(len(cols)) * n + np.array(cols)
+
+
+CONSTRUCTIONS = {"Rook": _rook, "Bishop": _bishop, "Knight": _knight, "Queen": _queen}
+
+
+def construct(piece, n):
+    """
+    Squares of a maximum placement of a standard piece ("Queen", "Rook",
+    "Bishop", "Knight") on an empty n x n board, or None for any other
+    piece or if the construction does not pass the attack check (the
+    caller then falls back to a solver).
+    """
+    build = CONSTRUCTIONS.get(piece)
+    if build is None or n < 1:
+        return None
+    squares = build(n)
+    if not is_independent(n, squares, *PIECE_RULES[piece]):
+        return None
+    return squares
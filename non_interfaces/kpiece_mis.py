@@ -0,0 +1,291 @@
+"""
+K-Pieces Maximum Independent Set
+Most pieces of one rule on the free squares of a board, as a maximum
+independent set of the attack graph (squares numbered r*n + c):
+    greedy        repeatedly take a square of minimum remaining degree
+    local search  Andrade-Resende-Werneck iterated local search: (1,2)-swaps
+                  (one piece out, two in) until none is left, then a random
+                  forced insertion as perturbation, keeping the best set
+    exact         the clique MILP of kpiece_model.py, started from the
+                  local-search set (Start) so its incumbent is never worse
+The conflict cliques, cut into disjoint parts, bound the answer from
+above: local search stops, and the MILP is skipped, once a set reaches
+that bound. All stages share one deadline: with a time limit the best
+set found so far is returned when it runs out (anytime), with `optimal`
+telling whether it was proven maximum.
+"""
+
+import random
+import time
+
+import numpy as np
+
+from non_interfaces.kpiece_attacks import attack_pairs, attack_table
+from non_interfaces.kpiece_model import build_model, conflict_cliques
+
+try:
+    from gurobipy import GRB, GurobiError
+except ImportError:  # greedy and local search do not need Gurobi
+    GRB = None
+    GurobiError = RuntimeError
+
+# Local search stops after PATIENCE perturbations in a row without a larger
+# set. Before the MILP it also stops after LOCAL_SEARCH_SECONDS_PER_SQUARE
+# per free square (at most LOCAL_SEARCH_SECONDS, or LOCAL_SEARCH_SHARE of
+# a time limit); without the MILP it may use LOCAL_SEARCH_SECONDS or the
+# whole time limit
+PATIENCE = 200
+LOCAL_SEARCH_SECONDS_PER_SQUARE = 5e-5
+LOCAL_SEARCH_SECONDS = 1.0
+LOCAL_SEARCH_SHARE = 0.3
+
+
+def attack_graph(n, offsets=(), specials=(), cells=None):
+    """
+    Attack graph of a rule on the squares `cells` (default: all):
+    neighbors[i] is the array of vertices attacking or attacked by vertex
+    i, vertices being positions in `cells`.
+
+    Returns: (cells, neighbors)
+    """
+    cells = np.arange(n * n) if cells is None else np.asarray(cells, dtype=np.int64)
+    pairs = attack_pairs(attack_table(n, offsets, specials), cells)
+    local = np.searchsorted(cells, pairs)
+    edges = np.concatenate([local, local[:, ::-1]])
+    edges = edges[np.lexsort((edges[:, 1], edges[:, 0]))]
+    bounds = np.searchsorted(edges[:, 0], np.arange(len(cells) + 1))
+    neighbors = [edges[bounds[i]:bounds[i + 1], 1] for i in range(len(cells))]
+    return cells, neighbors
+
+
+def clique_bound(n, offsets=(), specials=(), cells=None):
+    """
+    Upper bound on the pieces of a rule on `cells`: the conflict cliques
+    (largest first) restricted to the squares no earlier clique took,
+    kept when two or more remain, plus one per square left over; each
+    part holds at most one piece.
+    """
+    taken = np.ones(n * n, dtype=bool)
+    taken[np.arange(n * n) if cells is None else cells] = False
+    parts = 0
+    for clique in sorted(conflict_cliques(n, offsets, specials), key=len, reverse=True):
+        rest = clique[~taken[clique]]
+        if len(rest) > 1:
+            taken[rest] = True
+            parts += 1
+    return parts + int((~taken).sum())
+
+
+def greedy_mis(neighbors):
+    """Independent set by minimum remaining degree (vertex lists, no randomness)"""
+    degree = np.array([len(nb) for nb in neighbors])
+    alive = np.ones(len(neighbors), dtype=bool)
+    chosen = []
+    # Buckets of vertices per degree; stale entries are skipped when popped
+    buckets = {}
+    for v in np.argsort(degree, kind="stable")[::-1].tolist():
+        buckets.setdefault(int(degree[v]), []).append(v)
+    low = 0
+    while low <= len(neighbors):
+        bucket = buckets.get(low)
+        if not bucket:
+            low += 1
+            continue
+        v = bucket.pop()
+        if not alive[v] or degree[v] != low:
+            continue
+        chosen.append(v)
+        alive[v] = False
+        removed = neighbors[v][alive[neighbors[v]]]
+        alive[removed] = False
+        # Neighbors of the removed vertices lose one degree per removed neighbor
+        for u in removed.tolist():
+            nb = neighbors[u][alive[neighbors[u]]]
+            degree[nb] -= 1
+            for w in nb.tolist():
+                buckets.setdefault(int(degree[w]), []).append(w)
+            if len(nb):
+                low = min(low, int(degree[nb].min()))
+    return chosen
+
+
+class _LocalSearch:
+    """Solution state of the ARW local search (tight[v]: solution neighbors of v)"""
+
+    def __init__(self, neighbors, solution, rng):
+        self.neighbors = neighbors
+        self.adjacent = [set(nb.tolist()) for nb in neighbors]
+        self.rng = rng
+        self.in_set = np.zeros(len(neighbors), dtype=bool)
+        self.tight = np.zeros(len(neighbors), dtype=np.int64)
+        for v in solution:
+            self.insert(v)
+
+    @property
+    def size(self):
+        return int(self.in_set.sum())
+
+    def insert(self, v):
+        self.in_set[v] = True
+        self.tight[self.neighbors[v]] += 1
+
+    def remove(self, v):
+        self.in_set[v] = False
+        self.tight[self.neighbors[v]] -= 1
+
+    def fill(self, vertices):
+        """Insert the free vertices (no solution neighbor) among `vertices`, in random order"""
+        vertices = list(vertices)
+        self.rng.shuffle(vertices)
+        for u in vertices:
+            if not self.in_set[u] and self.tight[u] == 0:
+                self.insert(u)
+
+    def two_improvement(self, x):
+        """(1,2)-swap around solution vertex x; True when the set grew"""
+        nb = self.neighbors[x]
+        candidates = nb[self.tight[nb] == 1].tolist()
+        for i, u in enumerate(candidates):
+            adjacent = self.adjacent[u]
+            for v in candidates[i + 1:]:
+                if v not in adjacent:
+                    self.remove(x)
+                    self.insert(u)
+                    self.insert(v)
+                    self.fill(nb.tolist())
+                    return True
+        return False
+
+    def improve(self, deadline):
+        """(1,2)-swaps until none is left (or the deadline)"""
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            for x in np.flatnonzero(self.in_set).tolist():
+                if self.in_set[x] and self.two_improvement(x):
+                    improved = True
+
+    def perturb(self):
+        """Force a random non-solution vertex in, dropping its solution neighbors"""
+        outside = np.flatnonzero(~self.in_set)
+        if not len(outside):
+            return
+        v = int(outside[self.rng.randrange(len(outside))])
+        dropped = self.neighbors[v][self.in_set[self.neighbors[v]]]
+        for u in dropped.tolist():
+            self.remove(u)
+        self.insert(v)
+        # Vertices freed by the removals
+        freed = set()
+        for u in dropped.tolist():
+            freed.update(self.neighbors[u].tolist())
+        self.fill(freed)
+
+
+def local_search(neighbors, solution, deadline, patience=PATIENCE, target=None, rng=None):
+    """
+    Iterated local search from an independent set (vertex list) until the
+    deadline (time.perf_counter() value), `patience` perturbations in a
+    row without a larger set, or a set of `target` vertices. Returns the
+    largest set seen.
+    """
+    rng = rng or random.Random(0)
+    state = _LocalSearch(neighbors, solution, rng)
+    state.fill(range(len(neighbors)))
+    state.improve(deadline)
+    best = state.in_set.copy()
+    best_size = state.size
+
+    target = len(neighbors) if target is None else target
+    idle = 0
+    while best_size < target and idle < patience and time.perf_counter() < deadline:
+        state.perturb()
+        state.improve(deadline)
+        if state.size > best_size:
+            best, best_size, idle = state.in_set.copy(), state.size, 0
+        else:
+            idle += 1
+            if state.size < best_size - 1:
+                state = _LocalSearch(neighbors, np.flatnonzero(best).tolist(), rng)
+    return np.flatnonzero(best).tolist()
+
+
+def maximum_placement(n, offsets=(), specials=(), cells=None, time_limit=None, exact=True,
+                      symmetry=None, seed=0):
+    """
+    Largest set of non-attacking pieces of a rule on the squares `cells`
+    (default: every square). Greedy, then local search, then (with
+    `exact` and gurobipy, unless the set already meets clique_bound) the
+    MILP started from the local-search set. `time_limit` (seconds, None
+    for none) bounds the whole run; the best set found is returned when
+    it runs out. Before the MILP, local search gets a budget that grows
+    with the number of free squares; when the MILP cannot run, local
+    search goes on instead.
+
+    Returns: dict with keys
+        'squares': list[int] - squares of the pieces
+        'optimal': bool - proven maximum (by the clique bound or the MILP)
+        'bound': float - upper bound (clique bound, or the MILP's if lower)
+        'sizes': dict[str, int] - set size after each stage that ran
+        'error': str or None - why the MILP could not run (gurobipy
+                 missing, license or size limit, ...); the set is then
+                 the local-search one, optimal only if it meets the bound
+        'seconds': float
+    """
+    t0 = time.perf_counter()
+    deadline = t0 + time_limit if time_limit is not None else float("inf")
+    cells, neighbors = attack_graph(n, offsets, specials, cells)
+    bound = clique_bound(n, offsets, specials, cells)
+
+    solution = greedy_mis(neighbors)
+    sizes = {"greedy": len(solution)}
+
+    # Local search before the MILP: a budget growing with the free squares
+    budget = min(LOCAL_SEARCH_SECONDS, LOCAL_SEARCH_SECONDS_PER_SQUARE * len(cells))
+    if not exact:
+        search_end = deadline if time_limit is not None else t0 + LOCAL_SEARCH_SECONDS
+    elif time_limit is not None:
+        search_end = t0 + min(budget, LOCAL_SEARCH_SHARE * time_limit)
+    else:
+        search_end = t0 + budget
+    solution = local_search(neighbors, solution, min(search_end, deadline), target=bound,
+                            rng=random.Random(seed))
+    sizes["local_search"] = len(solution)
+
+    optimal = len(solution) >= bound
+    error = None
+    if exact and not optimal and GRB is None:
+        error = "gurobipy is not installed"
+    elif exact and not optimal and time.perf_counter() < deadline:
+        try:
+            model, x = build_model(n, offsets, specials, cells=cells, symmetry=symmetry)
+            chosen = set(cells[solution].tolist())
+            for a, var in x.items():
+                var.Start = 1 if a in chosen else 0
+            if time_limit is not None:
+                model.setParam("TimeLimit", max(0.0, deadline - time.perf_counter()))
+            model.optimize()
+        except GurobiError as e:
+            error = str(e)  # e.g. a size-limited license: keep the local-search set
+        else:
+            if model.SolCount and model.ObjVal > len(solution) - 0.5:
+                solution = [i for i, a in enumerate(cells.tolist()) if x[a].X > 0.5]
+            optimal = model.status == GRB.OPTIMAL
+            bound = min(bound, model.ObjBound)
+            sizes["milp"] = len(solution)
+
+    if error is not None:
+        # No MILP: the rest of the time limit (or LOCAL_SEARCH_SECONDS) goes to local search
+        end = deadline if time_limit is not None else time.perf_counter() + LOCAL_SEARCH_SECONDS
+        solution = local_search(neighbors, solution, end, target=bound, rng=random.Random(seed + 1))
+        sizes["local_search"] = len(solution)
+        optimal = len(solution) >= bound
+
+    return {
+        "squares": sorted(cells[solution].tolist()),
+        "optimal": optimal,
+        "bound": bound,
+        "sizes": sizes,
+        "error": error,
+        "seconds": time.perf_counter() - t0,
+    }
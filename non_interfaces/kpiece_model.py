@@ -0,0 +1,175 @@
+"""
+K-Pieces MILP Formulation
+Gurobi models of the K-pieces problems over the attack graph of
+non_interfaces/kpiece_attacks.py (squares numbered r*n + c). "No two
+pieces attack each other" is written as one `sum <= 1` per clique of
+the graph rather than one x_a + x_b <= 1 per attacking pair:
+    lines     every row / column / diagonal of a sliding rule
+    jumps     cliques grown greedily from the finite offsets (2x2 blocks
+              for king moves); the knight graph is bipartite, so its
+              cliques are its edges and its pairwise LP is already tight
+Together they cover every attacking pair of the rule.
+Optional symmetry handling uses the symmetries of the square board that
+map the attack graph (and the free squares) onto themselves.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+from non_interfaces.kpiece_attacks import attack_pairs, attack_table, line_keys
+
+try:
+    from gurobipy import Model, GRB, LinExpr
+except ImportError:  # the attack tables and cliques do not need Gurobi
+    Model = GRB = LinExpr = None
+
+FORMULATIONS = ("clique", "pairs")
+# None: Gurobi defaults; "gurobi": aggressive symmetry detection (Symmetry=2);
+# "lex": leader constraints x_j >= x_g(j) for each board symmetry g
+SYMMETRY_MODES = (None, "gurobi", "lex")
+
+
+def _line_cliques(n, specials):
+    cliques = []
+    for key in line_keys(n, specials):
+        order = np.argsort(key, kind="stable")
+        bounds = np.flatnonzero(np.diff(key[order])) + 1
+        cliques += [line for line in np.split(order, bounds) if len(line) > 1]
+    return cliques
+
+
+def _jump_cliques(n, offsets, specials):
+    """Greedy clique cover of the offset attacks that no line already covers"""
+    pairs = attack_pairs(attack_table(n, offsets))
+    on_line = np.zeros(len(pairs), dtype=bool)
+    for key in line_keys(n, specials):
+        on_line |= key[pairs[:, 0]] == key[pairs[:, 1]]
+    pairs = pairs[~on_line].tolist()
+
+    neighbors = [set() for _ in range(n * n)]
+    for a, b in pairs:
+        neighbors[a].add(b)
+        neighbors[b].add(a)
+    uncovered = {(min(a, b), max(a, b)) for a, b in pairs}
+
+    cliques = []
+    for edge in sorted(uncovered):
+        if edge not in uncovered:
+            continue
+        clique = list(edge)
+        common = neighbors[edge[0]] & neighbors[edge[1]]
+        while common:
+            # Grow with the square closing the most uncovered edges
+            v = max(common, key=lambda v: (sum((min(u, v), max(u, v)) in uncovered for u in clique), -v))
+            clique.append(v)
+            common &= neighbors[v]
+        for i, a in enumerate(clique):
+            for b in clique[i + 1:]:
+                uncovered.discard((min(a, b), max(a, b)))
+        cliques.append(np.array(sorted(clique)))
+    return cliques
+
+
+@lru_cache(maxsize=16)
+def conflict_cliques(n, offsets=(), specials=()):
+    """
+    Cliques (arrays of squares, size >= 2) covering every attacking pair
+    of a rule (see kpiece_attacks.piece_rule) on an n x n board.
+    Cached per (n, rule); arrays are read-only.
+    """
+    cliques = _line_cliques(n, specials) + _jump_cliques(n, offsets, specials)
+    for clique in cliques:
+        clique.setflags(write=False)
+    return tuple(cliques)
+
+
+def board_symmetries(n):
+    """The 7 non-identity symmetries of the n x n board as square permutations (g[a]: image of a)"""
+    r, c = np.divmod(np.arange(n * n), n)
+    m = n - 1
+    images = [(c, m - r), (m - r, m - c), (m - c, r),   # rotations
+              (r, m - c), (m - r, c), (c, r), (m - c, m - r)]  # reflections
+    return [rr * n + cc for rr, cc in images]
+
+
+@lru_cache(maxsize=16)
+def rule_symmetries(n, offsets=(), specials=()):
+    """Board symmetries mapping the attack graph of a rule onto itself (all 7 for the chess pieces)"""
+    table = attack_table(n, offsets, specials)
+    return tuple(g for g in board_symmetries(n) if np.array_equal(table[np.ix_(g, g)], table))
+
+
+def leader_constraints(n, offsets, specials, cells):
+    """
+    Pairs (j, g(j)) for x_j >= x_g(j): for every symmetry g of the rule
+    that also maps `cells` onto itself, j is the first square g moves.
+    All of them hold for the lexicographically largest placement of each
+    orbit, so no placement count is lost.
+    """
+    inside = np.zeros(n * n, dtype=bool)
+    inside[cells] = True
+    pairs = []
+    for g in rule_symmetries(n, offsets, specials):
+        if np.array_equal(inside[g], inside):
+            moved = np.flatnonzero((g != np.arange(n * n)) & inside)
+            if len(moved):
+                pairs.append((int(moved[0]), int(g[moved[0]])))
+    return pairs
+
+
+def build_model(n, offsets=(), specials=(), cells=None, k=None, formulation="clique", symmetry=None):
+    """
+    Gurobi model placing pieces of one rule on an n x n board with no two
+    attacking each other: a binary x[a] per square a of `cells` (default:
+    every square), and one `sum <= 1` per clique restricted to those
+    squares ("clique") or per attacking pair ("pairs"). With `k` the
+    model asks for exactly k pieces, otherwise it maximizes their number.
+    `symmetry` is one of SYMMETRY_MODES (opt-in, mainly for proving that
+    k pieces do not fit).
+
+    Returns: (model, x) - x maps square index -> variable
+    """
+    if Model is None:
+        raise RuntimeError("K-pieces models require gurobipy")
+    if formulation not in FORMULATIONS:
+        raise ValueError(f"Unknown formulation {formulation!r} (expected one of {FORMULATIONS})")
+    if symmetry not in SYMMETRY_MODES:
+        raise ValueError(f"Unknown symmetry mode {symmetry!r} (expected one of {SYMMETRY_MODES})")
+
+    cells = np.arange(n * n) if cells is None else np.asarray(cells, dtype=np.int64)
+    model = Model("K_Pieces")
+    model.setParam("OutputFlag", 0)
+    xs = list(model.addVars(len(cells), vtype=GRB.BINARY).values())
+
+    # var[a]: variable index of square a, -1 without one
+    var = np.full(n * n, -1)
+    var[cells] = np.arange(len(cells))
+
+    # rows: variable indices of each "at most one" constraint
+    if formulation == "pairs":
+        rows = var[attack_pairs(attack_table(n, offsets, specials), cells)].tolist()
+    else:
+        rows = []
+        for clique in conflict_cliques(n, offsets, specials):
+            ids = var[clique]
+            ids = ids[ids >= 0]
+            if len(ids) > 1:
+                rows.append(tuple(ids.tolist()))
+        rows = list(dict.fromkeys(rows))  # cut down to the same squares, cliques can repeat
+    for ids in rows:
+        model.addLConstr(LinExpr([1.0] * len(ids), [xs[i] for i in ids]), GRB.LESS_EQUAL, 1)
+
+    if symmetry == "gurobi":
+        model.setParam("Symmetry", 2)
+    elif symmetry == "lex":
+        for j, gj in leader_constraints(n, offsets, specials, cells):
+            model.addLConstr(LinExpr([1.0, -1.0], [xs[var[j]], xs[var[gj]]]), GRB.GREATER_EQUAL, 0)
+
+    total = LinExpr([1.0] * len(xs), xs)
+    if k is None:
+        model.setObjective(total, GRB.MAXIMIZE)
+    else:
+        model.addLConstr(total, GRB.EQUAL, k)
+        model.setObjective(0, GRB.MINIMIZE)
+    return model, dict(zip(cells.tolist(), xs))
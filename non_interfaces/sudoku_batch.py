@@ -0,0 +1,238 @@
+"""
+Sudoku Batch Generation
+Generates puzzle packs offline on a process pool and streams them to a
+text file, one puzzle per line in the sudoku_core.encode_grid format
+(81 characters for 9x9), optionally followed by a space and the solution.
+Puzzle i is generated from the seed (seed, i), so running the same
+command again resumes after the last complete line with the same output
+an uninterrupted run would have produced. The generation settings are
+saved next to the pack (pack.txt.json) and a resume with different
+settings is refused rather than mixing two kinds of puzzles in one
+pack. With a difficulty, candidates are graded
+(non_interfaces/sudoku_grader.py) and only puzzles of that level are
+kept.
+
+Command line, from the repository root:
+    python -m non_interfaces.sudoku_batch pack.txt 1000 -n 9 --remove 50 --seed 0
+    python -m non_interfaces.sudoku_batch hard.txt 100 --difficulty hard
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from non_interfaces.sudoku_core import (
+    SYMBOLS, check_shape, decode_grid, default_block, encode_grid, generate, parse_block_size,
+    remove_cells, remove_cells_unique
+)
+from non_interfaces.sudoku_grader import LEVELS, grade
+
+# Candidates tried per puzzle before giving up on a difficulty level
+MAX_ATTEMPTS = 1000
+
+
+# Per-process copy of the batch settings (set by _init_worker)
+_shared = {}
+
+
+def _init_worker(n, block_size, remove, unique, seed, with_solution, difficulty):
+    _shared.update(n=n, block_size=block_size, remove=remove, unique=unique,
+                   seed=seed, with_solution=with_solution, difficulty=difficulty)
+
+
+def _candidate(index, attempt):
+    """(full grid, puzzle) of one generation attempt for puzzle `index`"""
+    n, block_size, remove = _shared["n"], _shared["block_size"], _shared["remove"]
+    key = f"{_shared['seed']}-{index}" + (f"-{attempt}" if attempt else "")
+    rng = random.Random(key)
+
+    full = generate(n, block_size, rng=rng)
+    if _shared["unique"]:
+        puzzle = remove_cells_unique(full, remove, block_size, rng)
+    else:
+        puzzle = remove_cells(full, remove, rng)
+    return full, puzzle
+
+
+def _generate_line(index):
+    """Line of puzzle `index` (without the newline)"""
+    difficulty = _shared["difficulty"]
+    for attempt in range(MAX_ATTEMPTS):
+        full, puzzle = _candidate(index, attempt)
+        if difficulty is None or grade(puzzle, _shared["block_size"])["level"] == difficulty:
+            break
+    else:
+        raise RuntimeError(f"No {difficulty} puzzle in {MAX_ATTEMPTS} attempts "
+                           f"(try another --remove or level)")
+
+    line = encode_grid(puzzle)
+    if _shared["with_solution"]:
+        line += " " + encode_grid(full)
+    return line
+
+
+def _is_pack_line(line, n, with_solution):
+    """True when `line` is one puzzle (and its solution) of an n x n pack"""
+    parts = line.split(" ")
+    if len(parts) != (2 if with_solution else 1) or any(len(part) != n * n for part in parts):
+        return False
+    try:
+        for part in parts:
+            decode_grid(part)
+    except ValueError:
+        return False
+    return True
+
+
+def count_done(path, n, with_solution=False):
+    """
+    Number of complete puzzles already in `path` (0 when missing).
+    Every complete line is checked first; only then is a trailing
+    partial line, left by an interrupted run, truncated (or, when it is
+    a whole puzzle missing its newline, completed).
+    Raises ValueError, leaving the file untouched, when a line does not
+    match the requested format.
+    """
+    if not os.path.exists(path):
+        return 0
+
+    with open(path, "rb") as f:
+        data = f.read()
+    end = data.rfind(b"\n") + 1
+    width = n * n * (2 if with_solution else 1) + (1 if with_solution else 0)
+    kind = f"{n}x{n} puzzle line ({'with' if with_solution else 'without'} solution)"
+
+    try:
+        lines = data[:end].decode("ascii").splitlines()
+        tail = data[end:].decode("ascii")
+    except UnicodeDecodeError:
+        raise ValueError(f"{path} is not a puzzle pack") from None
+    for k, line in enumerate(lines):
+        if not _is_pack_line(line, n, with_solution):
+            raise ValueError(f"{path}:{k + 1} is not a {kind}")
+
+    if not tail:
+        return len(lines)
+    if _is_pack_line(tail, n, with_solution):
+        with open(path, "ab") as f:
+            f.write(b"\n")
+        return len(lines) + 1
+    allowed = set(SYMBOLS[:n] + ".0" + (" " if with_solution else ""))
+    if len(tail) >= width or not set(tail) <= allowed:
+        raise ValueError(f"{path}:{len(lines) + 1} is not a {kind}")
+    with open(path, "rb+") as f:
+        f.truncate(end)
+    return len(lines)
+
+
+def settings_path(path):
+    """Sidecar file holding the generation settings of the pack at `path`"""
+    return path + ".json"
+
+
+def check_settings(path, settings):
+    """
+    Raise ValueError unless `settings` (a dict) are the ones the pack at
+    `path` was generated with. A missing or empty pack has no settings
+    to match; a non-empty pack without its settings file is refused,
+    since nothing tells how its puzzles were made.
+    """
+    sidecar = settings_path(path)
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return
+    if not os.path.exists(sidecar):
+        raise ValueError(f"{path} exists without {sidecar}: cannot tell its settings, "
+                         f"use another output file")
+    with open(sidecar) as f:
+        saved = json.load(f)
+    current = json.loads(json.dumps(settings))  # tuples as lists, like the saved copy
+    changed = [f"{key} {saved.get(key)!r} -> {value!r}" for key, value in current.items()
+               if saved.get(key) != value]
+    if changed:
+        raise ValueError(f"{path} was generated with other settings ({', '.join(changed)}); "
+                         f"use another output file")
+
+
+def generate_batch(path, count, n, block_size=-1, remove=0, unique=True, seed=0,
+                   processes=None, with_solution=False, chunksize=4, difficulty=None):
+    """
+    Append puzzles to `path` until it holds `count` of them; an existing
+    pack is only resumed with the settings it was generated with
+    (check_settings), which are saved next to it.
+    Workers generate puzzles in parallel; lines are written (and flushed)
+    in puzzle order as soon as they are ready. `difficulty` (one of
+    sudoku_grader.LEVELS) keeps only puzzles graded at that level.
+
+    Returns: (generated, seconds) - puzzles added by this run and wall time
+    """
+    check_shape(n, block_size)
+    if not 0 <= remove < n * n:
+        raise ValueError(f"Cells to remove must be between 0 and {n * n - 1}")
+    if difficulty is not None and difficulty not in LEVELS:
+        raise ValueError(f"Unknown difficulty {difficulty!r} (expected one of {LEVELS})")
+    settings = (n, block_size, remove, unique, seed, with_solution, difficulty)
+    recorded = dict(n=n, block_size=block_size, remove=remove, unique=unique, seed=seed,
+                    with_solution=with_solution, difficulty=difficulty)
+
+    check_settings(path, recorded)
+    done = count_done(path, n, with_solution)
+    with open(settings_path(path), "w") as f:
+        json.dump(recorded, f)
+    todo = range(done, count)
+    t0 = time.perf_counter()
+
+    with open(path, "a") as out:
+        if processes == 1:
+            _init_worker(*settings)
+            for line in map(_generate_line, todo):
+                out.write(line + "\n")
+                out.flush()
+        else:
+            with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                                     initargs=settings) as pool:
+                for line in pool.map(_generate_line, todo, chunksize=chunksize):
+                    out.write(line + "\n")
+                    out.flush()
+
+    return len(todo), time.perf_counter() - t0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a Sudoku puzzle pack, one puzzle per line.")
+    parser.add_argument("output", help="pack file (appended to, resumed if it exists)")
+    parser.add_argument("count", type=int, help="number of puzzles the pack should hold")
+    parser.add_argument("-n", type=int, default=9, help="grid size (default 9)")
+    parser.add_argument("--block", type=parse_block_size, default=None,
+                        help="block size: 3, 2x3 or -1 for a Latin square (default: see default_block)")
+    parser.add_argument("--remove", type=int, default=None,
+                        help="cells to remove per puzzle (default: half of the grid)")
+    parser.add_argument("--no-unique", action="store_true",
+                        help="remove cells without keeping a unique solution")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: all CPUs)")
+    parser.add_argument("--with-solution", action="store_true", help="append the solution to each line")
+    parser.add_argument("--difficulty", choices=LEVELS, default=None,
+                        help="only keep puzzles graded at this level")
+    args = parser.parse_args(argv)
+
+    block_size = args.block if args.block is not None else default_block(args.n)
+    remove = args.remove if args.remove is not None else args.n * args.n // 2
+
+    try:
+        generated, seconds = generate_batch(
+            args.output, args.count, args.n, block_size, remove, not args.no_unique,
+            args.seed, args.processes, args.with_solution, difficulty=args.difficulty
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    rate = generated / seconds if seconds > 0 else 0.0
+    print(f"{generated} puzzles generated in {seconds:.2f} s ({rate:.1f} puzzles/s), "
+          f"{args.count} in {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,483 @@
+"""
+Sudoku Core - generate, solve and remove cells without any GUI.
+Two backends: "propagation" (non_interfaces/sudoku_engine.py) and
+"gurobi" (MILP with one binary x[r,c,d] per cell and digit).
+
+Command line (batch runs), from the repository root:
+    python -m non_interfaces.sudoku_core 9 --remove 40 --count 5 --seed 0 --unique
+    python -m non_interfaces.sudoku_core --puzzle puzzle.csv
+"""
+
+import argparse
+import random
+
+import numpy as np
+
+from non_interfaces.sudoku_engine import (
+    SearchLimit, block_shape, build_units, eliminate, index_tables, initial_candidates,
+    solutions, solve_sudoku, unit_tables
+)
+from non_interfaces.sudoku_grader import grade
+
+try:
+    from gurobipy import Model, GRB, LinExpr
+except ImportError:  # the propagation backend does not need Gurobi
+    Model = GRB = LinExpr = None
+
+BACKENDS = ("propagation", "gurobi")
+
+
+def check_shape(n, block_size=-1):
+    """
+    Raise ValueError unless an n x n grid can be tiled by the boxes of
+    `block_size`: an int b for b x b boxes, a pair (br, bc) for boxes of
+    br rows and bc columns, -1 for a Latin square (no boxes). Called
+    before any model or search is built.
+    """
+    if n < 1:
+        raise ValueError("Grid size must be at least 1")
+    block_shape(n, block_size)
+
+
+def default_block(n):
+    """
+    Usual block size for an n x n grid: b when n = b^2, otherwise the
+    most square (br, bc) with br * bc = n and br > 1 (2x3 for 6x6, 2x4
+    for 8x8, 3x4 for 12x12), -1 (Latin square) for a prime n.
+    """
+    b = round(n ** 0.5)
+    if b * b == n:
+        return b
+    for br in range(b, 1, -1):
+        if n % br == 0:
+            return br, n // br
+    return -1
+
+
+def parse_block_size(text):
+    """Block size from text: "3" (3x3 boxes), "2x3" (2 rows, 3 columns) or "-1"."""
+    parts = text.strip().lower().replace("*", "x").split("x")
+    try:
+        values = [int(p) for p in parts]
+    except ValueError:
+        raise ValueError(f"Invalid block size {text!r} (e.g. 3 or 2x3)") from None
+    if len(values) == 1:
+        return values[0]
+    if len(values) == 2:
+        return tuple(values)
+    raise ValueError(f"Invalid block size {text!r} (e.g. 3 or 2x3)")
+
+
+def build_milp(grid, block_size=-1):
+    """
+    Gurobi model of a puzzle (list of rows, 0 for empty cells), presolved:
+    the givens are propagated first and only the (row, column, digit)
+    triples still possible get a binary x[r,c,d]. Decided cells get no
+    variable, and a unit only keeps "exactly once" constraints for the
+    digits it still misses, so the model shrinks with the clue count.
+    Constraint rows are read from the cached index_tables of the shape.
+
+    Returns: (model, x, known) with `known` the grid of decided cells,
+             or None when the givens contradict
+    """
+    if Model is None:
+        raise RuntimeError("The gurobi backend requires gurobipy")
+
+    n = len(grid)
+    shape = block_shape(n, block_size)
+    cands = initial_candidates(grid, block_size, unit_tables(n, shape))
+    if cands is None:
+        return None
+    units, _, _ = index_tables(n, shape)
+
+    # possible[q, d-1]: digit d still possible in cell q
+    possible = (np.array(cands, dtype=np.int64)[:, None] >> np.arange(n)) & 1 == 1
+    is_open = possible.sum(axis=1) > 1
+    known = np.where(is_open, 0, possible.argmax(axis=1) + 1).reshape(n, n).tolist()
+
+    # var[q, d-1]: variable index, -1 when the triple is decided or impossible
+    possible &= is_open[:, None]
+    var = np.full((n * n, n), -1)
+    var[possible] = np.arange(possible.sum())
+
+    model = Model("Sudoku")
+    model.setParam("OutputFlag", 0)
+    xs = list(model.addVars(int(possible.sum()), vtype=GRB.BINARY).values())
+
+    # Constraints: one digit per open cell, each missing digit once per unit
+    for row in var[is_open]:
+        ids = row[row >= 0]
+        model.addLConstr(LinExpr([1.0] * len(ids), [xs[i] for i in ids]), GRB.EQUAL, 1)
+    for block in var[units].transpose(0, 2, 1).reshape(-1, n):
+        ids = block[block >= 0]
+        if len(ids):  # none left: the digit is already placed
+            model.addLConstr(LinExpr([1.0] * len(ids), [xs[i] for i in ids]), GRB.EQUAL, 1)
+
+    model.setObjective(0, GRB.MINIMIZE)
+    q, d = np.nonzero(possible)
+    x = {(int(k) // n + 1, int(k) % n + 1, int(v) + 1): xs[i] for i, (k, v) in enumerate(zip(q, d))}
+    return model, x, known
+
+
+def solve_milp(grid, block_size=-1):
+    """
+    Solve the presolved MILP of build_milp.
+
+    Returns: list[list[int]] - the completed grid, or None when infeasible
+    """
+    built = build_milp(grid, block_size)
+    if built is None:
+        return None
+    model, x, solution = built
+
+    model.optimize()
+    if model.status != GRB.OPTIMAL:
+        return None
+
+    for (r, c, d), var in x.items():
+        if var.X > 0.5:
+            solution[r - 1][c - 1] = d
+    return solution
+
+
+def solve(grid, block_size=-1, backend="propagation", rng=None):
+    """
+    Complete a grid (list of rows, 0 for empty cells).
+    `rng` (random.Random) randomizes the propagation search.
+
+    Returns: list[list[int]] - the completed grid, or None when unsolvable
+    Raises ValueError for an invalid shape or value.
+    """
+    n = len(grid)
+    check_shape(n, block_size)
+    if any(len(row) != n for row in grid):
+        raise ValueError(f"Grid must be {n}x{n}")
+
+    if backend == "propagation":
+        return solve_sudoku(grid, block_size, rng)
+    if backend == "gurobi":
+        return solve_milp(grid, block_size)
+    raise ValueError(f"Unknown backend {backend!r} (expected one of {BACKENDS})")
+
+
+def pattern_grid(n, br, bc):
+    """
+    Valid full grid with br x bc boxes (br * bc = n) in O(n^2):
+    value(r, c) = (bc * (r mod br) + r div br + c) mod n + 1
+    """
+    return [[(bc * (r % br) + r // br + c) % n + 1 for c in range(n)] for r in range(n)]
+
+
+def random_full_grid(n, br, bc, rng=None):
+    """
+    Pattern grid randomized by transformations that keep it valid:
+    digit relabelling, band (br rows) and stack (bc columns) shuffles,
+    row shuffles inside each band, column shuffles inside each stack,
+    and a transpose when the boxes are square.
+    """
+    rng = rng or random
+    base = pattern_grid(n, br, bc)
+
+    def shuffled(seq):
+        seq = list(seq)
+        rng.shuffle(seq)
+        return seq
+
+    rows = [band * br + r for band in shuffled(range(n // br)) for r in shuffled(range(br))]
+    cols = [stack * bc + c for stack in shuffled(range(n // bc)) for c in shuffled(range(bc))]
+    digits = [0] + shuffled(range(1, n + 1))
+
+    grid = [[digits[base[r][c]] for c in cols] for r in rows]
+    if br == bc and rng.random() < 0.5:
+        grid = [list(col) for col in zip(*grid)]
+    return grid
+
+
+def generate(n, block_size=-1, rng=None):
+    """
+    Random full n x n grid: the pattern grid of the boxes (1 x 1 for a
+    Latin square), randomized by random_full_grid. Every shape accepted
+    by check_shape has one, so no solver is needed.
+    `block_size` is an int, a pair (rows, cols) or -1 (see check_shape).
+    """
+    check_shape(n, block_size)
+    return random_full_grid(n, *(block_shape(n, block_size) or (1, 1)), rng)
+
+
+def remove_cells(grid, count, rng=None):
+    """
+    Copy of `grid` with `count` filled cells, picked at random, set to 0.
+    Raises ValueError when fewer than `count` cells are filled.
+    """
+    rng = rng or random
+    filled = [(r, c) for r, row in enumerate(grid) for c, v in enumerate(row) if v]
+    if not 0 <= count <= len(filled):
+        raise ValueError(f"Cells to remove must be between 0 and {len(filled)}")
+
+    puzzle = [row[:] for row in grid]
+    for r, c in rng.sample(filled, count):
+        puzzle[r][c] = 0
+    return puzzle
+
+
+def remove_cells_unique(solution, count=None, block_size=-1, rng=None, max_nodes=20):
+    """
+    Copy of a full grid with up to `count` cells (as many as possible when
+    None) set to 0, keeping the solution unique. Cells are tried in a
+    shuffled order; after removing one, the puzzle is checked with the
+    extra constraint "this cell differs from the known solution":
+        - propagation alone reaches a contradiction: unique
+        - otherwise a search preferring the known digits looks for
+          another solution; none found means unique
+    The candidates left by the givens are kept up to date instead of
+    being rebuilt: a removal only changes the masks of the cell and its
+    peers, which are restored when the clue has to stay. A check that
+    needs more than `max_nodes` search nodes keeps the clue, so
+    uniqueness is always proven, at the cost of a few extra clues.
+
+    Returns: list[list[int]] - the puzzle (fewer than `count` cells may
+             be removed when the solution would stop being unique)
+    """
+    rng = rng or random
+    n = len(solution)
+    check_shape(n, block_size)
+    shape = block_shape(n, block_size)
+    units, units_of, peers = unit_tables(n, shape)
+    unit_ids = index_tables(n, shape)[1].tolist()
+    full = (1 << n) - 1
+    known = [1 << (v - 1) if v else 0 for row in solution for v in row]
+
+    puzzle = [row[:] for row in solution]
+    cells = [q for q in range(n * n) if known[q]]
+
+    # given[u]: digits given in unit u; base[q]: candidates of q from the givens alone
+    given = [0] * len(units)
+    for q in cells:
+        for u in unit_ids[q]:
+            given[u] |= known[q]
+
+    def mask(q):
+        if puzzle[q // n][q % n]:
+            return known[q]
+        m = full
+        for u in unit_ids[q]:
+            m &= ~given[u]
+        return m
+
+    base = [mask(q) for q in range(n * n)]
+    # Empty cells with one candidate left, whose digit still has to leave their peers
+    singles = {q for q in range(n * n) if not puzzle[q // n][q % n] and not base[q] & (base[q] - 1)}
+
+    rng.shuffle(cells)
+    target = len(cells) if count is None else count
+
+    removed = 0
+    for q in cells:
+        if removed == target:
+            break
+        r, c = divmod(q, n)
+        saved = [(p, base[p]) for p in (q,) + peers[q]]
+        puzzle[r][c] = 0
+        for u in unit_ids[q]:
+            given[u] &= ~known[q]
+        for p, _ in saved:
+            base[p] = mask(p)
+
+        # Propagate the puzzle with "q is not its known digit"
+        cands = base[:]
+        cands[q] &= ~known[q]
+        stack = []
+        for s in singles | {q}:
+            if cands[s] and not cands[s] & (cands[s] - 1):
+                stack += [(p, cands[s]) for p in peers[s] if cands[p] & cands[s]]
+        unique = not cands[q] or not eliminate(cands, stack, units_of, peers, touched=units)
+        if not unique:
+            try:
+                unique = next(solutions(cands, units_of, peers, prefer=known, max_nodes=max_nodes), None) is None
+            except SearchLimit:
+                unique = False
+
+        if unique:
+            removed += 1
+            for p, _ in saved:
+                if not puzzle[p // n][p % n] and not base[p] & (base[p] - 1):
+                    singles.add(p)
+                else:
+                    singles.discard(p)
+        else:
+            puzzle[r][c] = solution[r][c]
+            for u in unit_ids[q]:
+                given[u] |= known[q]
+            for p, m in saved:
+                base[p] = m
+    return puzzle
+
+
+def count_solutions(grid, block_size=-1, limit=2):
+    """Number of solutions of a puzzle, counting no further than `limit`."""
+    n = len(grid)
+    check_shape(n, block_size)
+    tables = build_units(n, block_size)
+    cands = initial_candidates(grid, block_size, tables)
+    if cands is None:
+        return 0
+
+    found = 0
+    for _ in solutions(cands, tables[1], tables[2]):
+        found += 1
+        if found == limit:
+            break
+    return found
+
+
+def is_valid_solution(grid, block_size=-1):
+    """True when every row, column and block holds 1..n exactly once."""
+    n = len(grid)
+    units, _, _ = build_units(n, block_size)
+    cells = [v for row in grid for v in row]
+    digits = set(range(1, n + 1))
+    return all({cells[q] for q in unit} == digits for unit in units)
+
+
+# Symbols of the one-line format: value v is SYMBOLS[v - 1], '.' is empty
+SYMBOLS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+
+
+def encode_grid(grid):
+    """
+    Grid as one line of n*n characters, row by row ('.' for empty cells,
+    1-9 then A-Z, a-z above 9): 81 characters for 9x9, n <= 61.
+    """
+    if len(grid) > len(SYMBOLS):
+        raise ValueError(f"One-line format supports n <= {len(SYMBOLS)}")
+    return "".join(SYMBOLS[v - 1] if v else "." for row in grid for v in row)
+
+
+def decode_grid(line):
+    """Inverse of encode_grid. Raises ValueError on a malformed line."""
+    line = line.strip()
+    n = round(len(line) ** 0.5)
+    if n * n != len(line) or n > len(SYMBOLS):
+        raise ValueError(f"A one-line grid needs n*n characters (n <= {len(SYMBOLS)}), got {len(line)}")
+
+    values = []
+    for ch in line:
+        if ch in ".0":
+            values.append(0)
+        else:
+            v = SYMBOLS.find(ch) + 1
+            if not 1 <= v <= n:
+                raise ValueError(f"Invalid symbol {ch!r} for a {n}x{n} grid")
+            values.append(v)
+    return [values[r * n:(r + 1) * n] for r in range(n)]
+
+
+def parse_grid(text):
+    """
+    Puzzle from text: one row per line, values separated by commas (CSV)
+    or spaces, with 0, '.' or an empty CSV field for empty cells. A single
+    line in the encode_grid format (e.g. 81 characters for 9x9) is also
+    accepted. Lines starting with '#' are ignored.
+
+    Returns: list[list[int]]
+    Raises ValueError when the text is not a square grid of numbers.
+    """
+    lines = [l.strip() for l in text.strip().splitlines() if l.strip() and not l.strip().startswith("#")]
+    if not lines:
+        raise ValueError("Empty puzzle")
+
+    if len(lines) == 1 and "," not in lines[0] and " " not in lines[0]:
+        return decode_grid(lines[0])
+
+    grid = []
+    for line in lines:
+        tokens = [t.strip() for t in line.split(",")] if "," in line else line.split()
+        row = []
+        for t in tokens:
+            if t in ("", ".", "_"):
+                row.append(0)
+            elif t.isdigit():
+                row.append(int(t))
+            else:
+                raise ValueError(f"Invalid value {t!r} in row {len(grid) + 1}")
+        grid.append(row)
+
+    n = len(grid)
+    for r, row in enumerate(grid):
+        if len(row) != n:
+            raise ValueError(f"Row {r + 1} has {len(row)} values, expected {n}")
+        for v in row:
+            if v > n:
+                raise ValueError(f"Value {v} in row {r + 1} is outside 1..{n}")
+    return grid
+
+
+def format_grid(grid):
+    """One text line per row, '.' for empty cells."""
+    width = len(str(len(grid)))
+    return "\n".join(
+        " ".join(str(v).rjust(width) if v else ".".rjust(width) for v in row)
+        for row in grid
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate or solve Sudoku puzzles without the GUI.")
+    parser.add_argument("n", type=int, nargs="?", help="grid size (9 for 9x9)")
+    parser.add_argument("--block", type=parse_block_size, default=None,
+                        help="block size: 3, 2x3 or -1 for a Latin square (default: see default_block)")
+    parser.add_argument("--remove", type=int, default=0, help="cells to remove per puzzle")
+    parser.add_argument("--count", type=int, default=1, help="number of puzzles")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--backend", choices=BACKENDS, default="propagation",
+                        help="solver used with --puzzle (grids are generated without one)")
+    parser.add_argument("--solution", action="store_true", help="also print the full grid")
+    parser.add_argument("--unique", action="store_true",
+                        help="only remove cells while the solution stays unique")
+    parser.add_argument("--puzzle", metavar="FILE", help="solve the puzzle in FILE (text or CSV) instead")
+    parser.add_argument("--grade", action="store_true",
+                        help="with --puzzle: print the difficulty and the techniques needed")
+    args = parser.parse_args(argv)
+
+    if args.puzzle:
+        try:
+            with open(args.puzzle) as f:
+                grid = parse_grid(f.read())
+            block_size = args.block if args.block is not None else default_block(len(grid))
+            solution = solve(grid, block_size, args.backend)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        if solution is None:
+            parser.error("the puzzle has no solution")
+        print(format_grid(solution))
+        if args.grade:
+            result = grade(grid, block_size)
+            print(f"\nDifficulty: {result['level']} ({result['branches']} branch points)")
+            for technique, rounds in result["techniques"].items():
+                print(f"  {technique}: {rounds}")
+        return
+
+    if args.n is None:
+        parser.error("give a grid size n or --puzzle FILE")
+    block_size = args.block if args.block is not None else default_block(args.n)
+    rng = random.Random(args.seed)
+
+    for k in range(args.count):
+        try:
+            full = generate(args.n, block_size, rng=rng)
+        except ValueError as e:
+            parser.error(str(e))
+        if k:
+            print()
+        if args.unique:
+            puzzle = remove_cells_unique(full, args.remove, block_size, rng)
+        else:
+            puzzle = remove_cells(full, args.remove, rng)
+        print(format_grid(puzzle))
+        if args.solution:
+            print()
+            print(format_grid(full))
+
+
+if __name__ == "__main__":
+    main()
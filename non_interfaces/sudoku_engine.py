@@ -0,0 +1,276 @@
+"""
+Sudoku Constraint-Propagation Engine
+Exact solver without Gurobi: candidate sets are bitmasks (bit d-1 set when
+digit d is still possible), naked and hidden singles are propagated after
+every elimination, and the search branches on the cell with the fewest
+candidates (MRV).
+"""
+
+from functools import lru_cache
+
+import numpy as np
+
+
+class SearchLimit(Exception):
+    """Raised by solutions() when its node budget is spent."""
+
+
+def block_shape(n, block_size=None):
+    """
+    Box shape (rows, cols) of a block size: an int b for b x b boxes or a
+    pair (br, bc) for boxes of br rows and bc columns; None or -1 is a
+    Latin square and gives None.
+    Raises ValueError when the boxes cannot tile an n x n grid.
+    """
+    if block_size is None or block_size == -1:
+        return None
+    if isinstance(block_size, int):
+        if block_size < 1 or block_size * block_size != n:
+            raise ValueError(f"Block size {block_size} is invalid for grid {n}x{n}. "
+                             f"Must satisfy block_size^2 = n.")
+        return block_size, block_size
+
+    br, bc = block_size
+    if br < 1 or bc < 1 or br * bc != n:
+        raise ValueError(f"Block {br}x{bc} is invalid for grid {n}x{n}. "
+                         f"Must satisfy rows * cols = n.")
+    return br, bc
+
+
+def build_units(n, block_size=None):
+    """
+    Units of an n x n grid (cells numbered r*n + c): rows, columns and,
+    unless block_size is None (or -1, a Latin square), the boxes
+    (see block_shape). Tables are cached per (n, box shape).
+
+    Returns: (units, units_of, peers)
+        units: list[tuple[int]] - every unit
+        units_of: list[list[tuple[int]]] - units containing each cell
+        peers: list[tuple[int]] - cells sharing a unit with each cell
+    """
+    return unit_tables(n, block_shape(n, block_size))
+
+
+@lru_cache(maxsize=32)
+def index_tables(n, shape=None):
+    """
+    NumPy index tables of an n x n grid with boxes `shape` (rows, cols),
+    or None for a Latin square; cells are numbered r*n + c:
+        units: (U, n) cells of every row, then column, then box
+        units_of: (n*n, U // n) indices into `units` of the units of each cell
+        peers: (n*n, P) cells sharing a unit with each cell, sorted
+    Cached per (n, shape) with LRU eviction; arrays are read-only since
+    every caller shares them.
+    """
+    cells = np.arange(n * n).reshape(n, n)
+    parts = [cells, cells.T]
+    if shape:
+        br, bc = shape
+        parts.append(cells.reshape(n // br, br, n // bc, bc).transpose(0, 2, 1, 3).reshape(-1, n))
+    units = np.concatenate(parts).astype(np.int32)
+
+    # Each cell is in exactly one unit of each kind
+    units_of = (np.argsort(units.ravel(), kind="stable") // n).reshape(n * n, -1).astype(np.int32)
+
+    member = np.zeros((n * n, n * n), dtype=bool)
+    member[np.arange(n * n)[:, None, None], units[units_of]] = True
+    member[np.arange(n * n), np.arange(n * n)] = False
+    peers = np.nonzero(member)[1].reshape(n * n, -1).astype(np.int32)
+
+    for table in (units, units_of, peers):
+        table.setflags(write=False)
+    return units, units_of, peers
+
+
+@lru_cache(maxsize=32)
+def unit_tables(n, shape=None):
+    """build_units for a validated box shape: index_tables as Python tuples"""
+    units, units_of, peers = index_tables(n, shape)
+    units = [tuple(u) for u in units.tolist()]
+    units_of = [[units[k] for k in row] for row in units_of.tolist()]
+    peers = [tuple(p) for p in peers.tolist()]
+    return units, units_of, peers
+
+
+def popcount(mask):
+    return bin(mask).count("1")
+
+
+def eliminate(cands, stack, units_of, peers, touched=()):
+    """
+    Remove (cell, bit) pairs from the candidates, propagating
+    naked singles (a cell with one candidate left clears it from its peers)
+    and hidden singles (a digit with one place left in a unit goes there).
+    Units in `touched` are scanned for hidden singles even if unchanged.
+    Returns False on contradiction.
+    """
+    touched = set(touched)
+    while stack or touched:
+        # Naked singles, collecting the units that changed
+        while stack:
+            cell, bit = stack.pop()
+            c = cands[cell]
+            if not c & bit:
+                continue
+            c &= ~bit
+            cands[cell] = c
+            if not c:
+                return False
+            if not c & (c - 1):
+                for p in peers[cell]:
+                    if cands[p] & c:
+                        stack.append((p, c))
+            touched.update(units_of[cell])
+
+        # Hidden singles: digits seen exactly once in a touched unit
+        for unit in touched:
+            once = twice = 0
+            for q in unit:
+                c = cands[q]
+                twice |= once & c
+                once |= c
+            if once != (1 << len(unit)) - 1:
+                return False  # a digit has no place left
+            hidden = once & ~twice
+            while hidden:
+                bit = hidden & -hidden
+                hidden ^= bit
+                for q in unit:
+                    if cands[q] & bit:
+                        rest = cands[q] & ~bit
+                        while rest:
+                            low = rest & -rest
+                            stack.append((q, low))
+                            rest ^= low
+                        break
+        touched = set()
+    return True
+
+
+def assign(cands, cell, bit, units_of, peers):
+    """Keep only `bit` in the cell; False on contradiction."""
+    rest = cands[cell] & ~bit
+    stack = []
+    while rest:
+        low = rest & -rest
+        stack.append((cell, low))
+        rest ^= low
+    return eliminate(cands, stack, units_of, peers)
+
+
+def initial_candidates(grid, block_size=None, tables=None):
+    """
+    Candidate bitmasks of a grid (list of rows, 0 for empty cells) with
+    every given propagated, or None when the givens contradict.
+    """
+    n = len(grid)
+    units, units_of, peers = tables or build_units(n, block_size)
+    full = (1 << n) - 1
+    cands = [full] * (n * n)
+
+    for r, row in enumerate(grid):
+        for c, d in enumerate(row):
+            if d:
+                if not 1 <= d <= n:
+                    raise ValueError(f"Value {d} at ({r + 1},{c + 1}) is outside 1..{n}")
+                cands[r * n + c] = 1 << (d - 1)
+
+    # Digits given in a unit leave its other cells in one pass
+    for unit in units:
+        used = 0
+        for q in unit:
+            c = cands[q]
+            if not c & (c - 1):
+                if used & c:
+                    return None  # same digit given twice
+                used |= c
+        for q in unit:
+            if cands[q] & (cands[q] - 1):
+                cands[q] &= ~used
+                if not cands[q]:
+                    return None
+
+    # Then the singles this creates
+    stack = []
+    for q, c in enumerate(cands):
+        if not c & (c - 1):
+            stack += [(p, c) for p in peers[q] if cands[p] & c]
+    if not eliminate(cands, stack, units_of, peers, touched=units):
+        return None
+    return cands
+
+
+def solutions(cands, units_of, peers, rng=None, prefer=None, max_nodes=None):
+    """
+    Depth-first search over candidate states (MRV branching), yielding
+    each solved candidate list. `rng` (random.Random) shuffles the digit
+    order of every branch; `prefer` (one bit per cell, e.g. a known
+    solution) is tried first in each branch. Raises SearchLimit after
+    `max_nodes` search nodes.
+    """
+    stack = [(cands, None, None)]
+    nodes = 0
+
+    while stack:
+        state, cell, bit = stack.pop()
+        nodes += 1
+        if max_nodes is not None and nodes > max_nodes:
+            raise SearchLimit(f"No answer within {max_nodes} search nodes")
+        if cell is not None:
+            state = state[:]
+            if not assign(state, cell, bit, units_of, peers):
+                continue
+
+        # Minimum remaining values
+        best, best_count = None, None
+        for q, c in enumerate(state):
+            if c & (c - 1):
+                k = popcount(c)
+                if best is None or k < best_count:
+                    best, best_count = q, k
+                    if k == 2:
+                        break
+
+        if best is None:
+            yield state
+            continue
+
+        c = state[best]
+        bits = []
+        while c:
+            low = c & -c
+            bits.append(low)
+            c ^= low
+        if rng is not None:
+            rng.shuffle(bits)
+        if prefer is not None and prefer[best] in bits:
+            bits.remove(prefer[best])
+            bits.insert(0, prefer[best])
+
+        # Stack: push in reverse so the first digit is explored first
+        for b in reversed(bits):
+            stack.append((state, best, b))
+
+
+def to_grid(cands, n):
+    return [[cands[r * n + c].bit_length() for c in range(n)] for r in range(n)]
+
+
+def solve_sudoku(grid, block_size=None, rng=None):
+    """
+    Solve an n x n Sudoku (list of rows, 0 for empty cells).
+    block_size None (or -1) solves a Latin square without boxes.
+
+    Returns: list[list[int]] - the completed grid, or None when unsolvable
+    Raises ValueError for a block size that cannot tile the grid.
+    """
+    n = len(grid)
+    tables = build_units(n, block_size)
+    cands = initial_candidates(grid, block_size, tables)
+    if cands is None:
+        return None
+
+    _, units_of, peers = tables
+    for solved in solutions(cands, units_of, peers, rng):
+        return to_grid(solved, n)
+    return None
@@ -0,0 +1,228 @@
+"""
+Sudoku Difficulty Grader
+Solves a puzzle the way a person would: ranked techniques are tried from
+the simplest, and after any progress the grader starts again from the
+simplest one. The level is given by the hardest technique needed:
+    easy    naked singles, hidden singles
+    medium  naked pairs, pointing (box/line locked candidates)
+    hard    X-wing
+    expert  search (guessing), with the number of branch points
+Candidates are NumPy bitmasks (bit d-1 for digit d, one int64 per cell),
+and every technique works on all cells / units at once through the
+cached index tables of non_interfaces/sudoku_engine.py.
+"""
+
+import numpy as np
+
+from non_interfaces.sudoku_engine import block_shape, index_tables
+
+TECHNIQUES = ("naked_single", "hidden_single", "naked_pair", "pointing", "x_wing", "search")
+LEVELS = ("easy", "medium", "hard", "expert")
+TECHNIQUE_LEVEL = {
+    "naked_single": "easy",
+    "hidden_single": "easy",
+    "naked_pair": "medium",
+    "pointing": "medium",
+    "x_wing": "hard",
+    "search": "expert",
+}
+
+
+class _Context:
+    """Index tables of one grid shape, shared by the techniques"""
+
+    def __init__(self, n, shape):
+        self.n = n
+        self.units, self.units_of, _ = index_tables(n, shape)
+        self.boxes = self.units[2 * n:]
+        self.bits = np.left_shift(1, np.arange(n, dtype=np.int64))
+        self.full = (1 << n) - 1
+
+
+def _bits(cands, ctx):
+    """(cells, digits) boolean matrix of the candidates"""
+    return (cands[:, None] & ctx.bits) != 0
+
+
+def _solved(cands):
+    """Cells with exactly one candidate"""
+    return (cands & (cands - 1)) == 0
+
+
+def _remove(cands, elim):
+    """cands &= ~elim on unsolved cells; True when something changed"""
+    keep = np.where(_solved(cands), cands, cands & ~elim)
+    changed = bool((keep != cands).any())
+    cands[:] = keep
+    return changed
+
+
+def _contradiction(cands, ctx):
+    """A cell without candidates, a unit missing a digit or a digit placed twice"""
+    if (cands == 0).any():
+        return True
+    bits = _bits(cands, ctx)
+    if not bits[ctx.units].any(axis=1).all():
+        return True
+    placed = bits & _solved(cands)[:, None]
+    return bool((placed[ctx.units].sum(axis=1) > 1).any())
+
+
+def naked_single(cands, ctx):
+    """Digits of solved cells leave every peer"""
+    per_unit = np.bitwise_or.reduce(np.where(_solved(cands)[ctx.units], cands[ctx.units], 0), axis=1)
+    return _remove(cands, np.bitwise_or.reduce(per_unit[ctx.units_of], axis=1))
+
+
+def hidden_single(cands, ctx):
+    """A digit with one place left in a unit goes there"""
+    bits = _bits(cands, ctx)
+    in_unit = bits[ctx.units]                       # (units, cells, digits)
+    uu, dd = np.nonzero(in_unit.sum(axis=1) == 1)
+    cells = ctx.units[uu, in_unit[uu, :, dd].argmax(axis=1)]
+    new = ctx.bits[dd]
+    todo = cands[cells] != new
+    if not todo.any():
+        return False
+    cands[cells[todo]] = new[todo]
+    return True
+
+
+def naked_pair(cands, ctx):
+    """Two cells of a unit with the same two candidates clear them from the unit"""
+    counts = _bits(cands, ctx).sum(axis=1)
+    c = cands[ctx.units]                            # (units, cells)
+    pair = (counts == 2)[ctx.units]
+    same = (c[:, :, None] == c[:, None, :]) & pair[:, :, None] & pair[:, None, :]
+    same &= ~np.eye(ctx.n, dtype=bool)
+    in_pair = same.any(axis=2)
+    if not in_pair.any():
+        return False
+
+    digits = np.bitwise_or.reduce(np.where(in_pair, c, 0), axis=1)[:, None]
+    elim_in_unit = np.where(in_pair, digits & ~c, digits)
+    elim = np.zeros_like(cands)
+    np.bitwise_or.at(elim, ctx.units.ravel(), elim_in_unit.ravel())
+    return _remove(cands, elim)
+
+
+def pointing(cands, ctx):
+    """A digit confined to one row (column) of a box leaves the rest of that row (column)"""
+    if not len(ctx.boxes):
+        return False
+    n = ctx.n
+    in_box = _bits(cands, ctx)[ctx.boxes]           # (boxes, cells, digits)
+    several = in_box.sum(axis=1) >= 2
+    elim = np.zeros_like(cands)
+
+    for by_row, line in ((True, ctx.boxes // n), (False, ctx.boxes % n)):
+        lo = np.where(in_box, line[:, :, None], n).min(axis=1)
+        hi = np.where(in_box, line[:, :, None], -1).max(axis=1)
+        for b, d in zip(*np.nonzero(several & (lo == hi))):
+            k = lo[b, d]
+            cells = k * n + np.arange(n) if by_row else np.arange(n) * n + k
+            cells = np.setdiff1d(cells, ctx.boxes[b])
+            elim[cells] |= ctx.bits[d]
+    return _remove(cands, elim)
+
+
+def x_wing(cands, ctx):
+    """A digit in the same two columns of two rows leaves those columns elsewhere (and transposed)"""
+    n = ctx.n
+    bits = _bits(cands, ctx).reshape(n, n, n)       # (rows, cols, digits)
+    elim = np.zeros((n, n), dtype=np.int64)
+    weights = np.left_shift(1, np.arange(n, dtype=np.int64))
+
+    for d in range(n):
+        for grid, transposed in ((bits[:, :, d], False), (bits[:, :, d].T, True)):
+            keys = grid.astype(np.int64) @ weights
+            seen = {}
+            for r in np.flatnonzero(grid.sum(axis=1) == 2):
+                other = seen.setdefault(keys[r], r)
+                if other == r:
+                    continue
+                cols = np.flatnonzero(grid[r])
+                rows = np.setdiff1d(np.arange(n), (r, other))
+                if transposed:
+                    elim[np.ix_(cols, rows)] |= ctx.bits[d]
+                else:
+                    elim[np.ix_(rows, cols)] |= ctx.bits[d]
+    return _remove(cands, elim.ravel())
+
+
+STEPS = (
+    ("naked_single", naked_single),
+    ("hidden_single", hidden_single),
+    ("naked_pair", naked_pair),
+    ("pointing", pointing),
+    ("x_wing", x_wing),
+)
+
+
+def _logic(cands, ctx, counts):
+    """Apply the techniques until solved (True), stuck (None) or contradicted (False)"""
+    while True:
+        if _contradiction(cands, ctx):
+            return False
+        if _solved(cands).all():
+            return True
+        for name, step in STEPS:
+            if step(cands, ctx):
+                counts[name] += 1
+                break
+        else:
+            return None
+
+
+def _search(cands, ctx, counts):
+    """Logic first, then branch on the cell with the fewest candidates"""
+    state = _logic(cands, ctx, counts)
+    if state is not None:
+        return cands if state else None
+
+    counts["search"] += 1
+    sizes = np.where(_solved(cands), ctx.n + 1, _bits(cands, ctx).sum(axis=1))
+    q = int(sizes.argmin())
+    for d in np.flatnonzero(cands[q] & ctx.bits):
+        guess = cands.copy()
+        guess[q] = ctx.bits[d]
+        solved = _search(guess, ctx, counts)
+        if solved is not None:
+            return solved
+    return None
+
+
+def grade(puzzle, block_size=-1):
+    """
+    Grade a puzzle (list of rows, 0 for empty cells; block_size as in
+    sudoku_core.check_shape).
+
+    Returns: dict with keys
+        'level': str - one of LEVELS ("unsolvable" when there is no solution)
+        'techniques': dict[str, int] - rounds in which each technique made progress
+        'branches': int - branch points of the search (0 without guessing)
+        'solution': list[list[int]] or None
+    """
+    n = len(puzzle)
+    ctx = _Context(n, block_shape(n, block_size))
+    values = np.array(puzzle, dtype=np.int64).ravel()
+    if ((values < 0) | (values > n)).any():
+        raise ValueError(f"Values must be in 0..{n}")
+    cands = np.where(values > 0, np.left_shift(1, np.maximum(values - 1, 0)), ctx.full).astype(np.int64)
+
+    counts = dict.fromkeys(TECHNIQUES, 0)
+    solved = _search(cands, ctx, counts)
+
+    used = [TECHNIQUE_LEVEL[t] for t in TECHNIQUES if counts[t]]
+    level = max(used, key=LEVELS.index) if used else LEVELS[0]
+    solution = None
+    if solved is None:
+        level = "unsolvable"
+    else:
+        solution = (np.log2(solved).round().astype(int) + 1).reshape(n, n).tolist()
+    return {
+        "level": level,
+        "techniques": {t: c for t, c in counts.items() if c},
+        "branches": counts["search"],
+        "solution": solution,
+    }
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from non_interfaces import kpiece_attacks
+from non_interfaces.kpiece_attacks import (
+    KNIGHT_MOVES, PIECE_RULES, attack_pairs, attack_table, clear_table_cache, is_independent,
+    piece_rule
+)
+
+RULES = list(PIECE_RULES.values()) + [(((0, 1), (1, 3)), ()), (((2, 2),), ("row",))]
+
+
+def brute_force_table(n, offsets, specials):
+    """Attack matrix square by square, as the GUI used to compute it"""
+    table = np.zeros((n * n, n * n), dtype=bool)
+    for a in range(n * n):
+        r, c = divmod(a, n)
+        for b in range(n * n):
+            rr, cc = divmod(b, n)
+            if a == b:
+                continue
+            table[a, b] = ((rr - r, cc - c) in offsets
+                           or 'row' in specials and rr == r
+                           or 'col' in specials and cc == c
+                           or 'diag' in specials and abs(rr - r) == abs(cc - c))
+    return table
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_table_matches_brute_force(rule):
+    for n in (1, 3, 6):
+        assert np.array_equal(attack_table(n, *rule), brute_force_table(n, *rule))
+
+
+@pytest.mark.parametrize("rule", RULES)
+def test_pairs_and_independence(rule):
+    n = 5
+    table = attack_table(n, *rule)
+    cells = np.flatnonzero(np.arange(n * n) % 3 != 0)
+    pairs = attack_pairs(table, cells)
+    expected = {(a, b) for a in cells for b in cells if a < b and (table[a, b] or table[b, a])}
+    assert set(map(tuple, pairs.tolist())) == expected
+
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        squares = rng.choice(n * n, size=rng.integers(1, 6), replace=False)
+        independent = not table[np.ix_(squares, squares)].any()
+        assert is_independent(n, squares, *rule) == independent
+
+
+def test_piece_rule_names():
+    custom = {
+        "Knight X": {"offsets": [[1, 1], [-1, -1]], "special": ["row"]},
+        "Camel": {"offsets": [[1, 3]], "special": []},
+    }
+    assert piece_rule("Queen") == PIECE_RULES["Queen"]
+    assert piece_rule("Queen ") == PIECE_RULES["Queen"]
+    assert piece_rule("Knight ♞") == (KNIGHT_MOVES, ())
+    # A custom piece is found by its full name, even when it starts like a standard one
+    assert piece_rule("Knight X ⭐", custom) == (((-1, -1), (1, 1)), ("row",))
+    assert piece_rule("Camel ⭐", custom) == (((1, 3),), ())
+    assert piece_rule("Knight X") == ((), ())
+    assert piece_rule("Dragon", custom) == ((), ())
+
+
+def test_table_cache_is_bounded(monkeypatch):
+    clear_table_cache()
+    one = attack_table(10, *PIECE_RULES["Rook"]).nbytes
+    monkeypatch.setattr(kpiece_attacks, "TABLE_CACHE_BYTES", 2 * one)
+    tables = [attack_table(10, *rule) for rule in RULES]
+    assert len(kpiece_attacks._tables) == 2
+    # The most recent tables are kept, and one larger than the budget still is
+    assert attack_table(10, *RULES[-1]) is tables[-1]
+    attack_table(40, *PIECE_RULES["Queen"])
+    assert list(kpiece_attacks._tables) == [(40,) + PIECE_RULES["Queen"]]
+    clear_table_cache()
@@ -0,0 +1,37 @@
+import pytest
+
+from non_interfaces.kpiece_attacks import PIECE_RULES, is_independent
+from non_interfaces.kpiece_construct import construct
+from non_interfaces.kpiece_model import build_model
+
+
+def known_maximum(piece, n):
+    if piece == "Rook":
+        return n
+    if piece == "Queen":
+        return {2: 1, 3: 2}.get(n, n)
+    if piece == "Bishop":
+        return 1 if n == 1 else 2 * n - 2
+    return {2: 4}.get(n, (n * n + 1) // 2)  # Knight
+
+
+@pytest.mark.parametrize("piece", list(PIECE_RULES))
+def test_constructions_reach_known_maxima(piece):
+    for n in list(range(1, 40)) + [100, 501]:
+        squares = construct(piece, n)
+        assert len(set(squares.tolist())) == len(squares) == known_maximum(piece, n)
+        assert is_independent(n, squares, *PIECE_RULES[piece])
+
+
+@pytest.mark.parametrize("piece", list(PIECE_RULES))
+def test_constructions_match_milp(piece):
+    pytest.importorskip("gurobipy")
+    for n in range(1, 8):
+        model, _ = build_model(n, *PIECE_RULES[piece])
+        model.optimize()
+        assert len(construct(piece, n)) == round(model.ObjVal)
+
+
+def test_other_pieces_are_not_constructed():
+    assert construct("Camel", 8) is None
+    assert construct("Queen", 0) is None
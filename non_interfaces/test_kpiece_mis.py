@@ -0,0 +1,94 @@
+import time
+
+import numpy as np
+import pytest
+
+from non_interfaces import kpiece_mis
+from non_interfaces.kpiece_attacks import PIECE_RULES, is_independent
+from non_interfaces.kpiece_mis import (
+    attack_graph, clique_bound, greedy_mis, local_search, maximum_placement
+)
+from non_interfaces.kpiece_model import build_model
+
+RULES = dict(PIECE_RULES,
+             Centaur=(((-2, -1), (-2, 1), (-1, -2), (-1, -1), (-1, 0), (-1, 1), (-1, 2), (0, -2),
+                       (0, -1), (0, 1), (0, 2), (1, -2), (1, -1), (1, 0), (1, 1), (1, 2), (2, -1),
+                       (2, 1)), ()),
+             Camel=(((1, 3), (3, 1), (-1, 3), (3, -1), (1, -3), (-3, 1), (-1, -3), (-3, -1)), ()))
+
+
+def free_cells(n, seed):
+    return np.flatnonzero(np.random.default_rng(seed).random(n * n) >= 0.2)
+
+
+def milp_optimum(n, rule, cells):
+    model, _ = build_model(n, *rule, cells=cells)
+    model.optimize()
+    return round(model.ObjVal)
+
+
+@pytest.mark.parametrize("name", RULES)
+def test_heuristics_give_independent_sets(name):
+    n = 9
+    cells, neighbors = attack_graph(n, *RULES[name], free_cells(n, 0))
+    greedy = greedy_mis(neighbors)
+    improved = local_search(neighbors, greedy, time.perf_counter() + 1.0)
+    assert len(improved) >= len(greedy)
+    for solution in (greedy, improved):
+        assert is_independent(n, cells[solution], *RULES[name])
+    assert len(improved) <= clique_bound(n, *RULES[name], cells)
+
+
+@pytest.mark.parametrize("name", RULES)
+def test_maximum_placement_matches_milp(name):
+    pytest.importorskip("gurobipy")
+    for n, seed in ((6, 0), (7, 1), (8, 2)):
+        cells = free_cells(n, seed)
+        result = maximum_placement(n, *RULES[name], cells=cells)
+        assert result["error"] is None
+        assert result["optimal"]
+        assert set(result["squares"]) <= set(cells.tolist())
+        assert is_independent(n, result["squares"], *RULES[name])
+        assert len(result["squares"]) == milp_optimum(n, RULES[name], cells)
+
+
+def test_bound_met_without_milp():
+    # 2048 knights on 64x64 meet the clique bound: proven, and local search stops there
+    result = maximum_placement(64, *PIECE_RULES["Knight"], time_limit=30, exact=False)
+    assert len(result["squares"]) == result["bound"] == 2048
+    assert result["optimal"]
+    assert result["seconds"] < 30
+    assert is_independent(64, result["squares"], *PIECE_RULES["Knight"])
+
+
+def test_milp_failure_is_reported(monkeypatch):
+    gp = pytest.importorskip("gurobipy")
+
+    def too_large(*args, **kwargs):
+        raise gp.GurobiError(10010, "Model too large for size-limited license")
+
+    monkeypatch.setattr(kpiece_mis, "build_model", too_large)
+    # The clique bound (30) is above the optimum (27) here, so the MILP is always tried
+    n, rule = 8, RULES["Camel"]
+    result = maximum_placement(n, *rule, cells=free_cells(n, 3))
+    assert result["error"] == "Model too large for size-limited license"
+    assert "milp" not in result["sizes"]
+    assert is_independent(n, result["squares"], *rule)
+    assert result["optimal"] == (len(result["squares"]) >= result["bound"])
+
+
+def test_missing_gurobi_is_reported(monkeypatch):
+    monkeypatch.setattr(kpiece_mis, "GRB", None)
+    n, rule = 8, RULES["Camel"]
+    result = maximum_placement(n, *rule, cells=free_cells(n, 3))
+    assert result["error"] == "gurobipy is not installed"
+    assert is_independent(n, result["squares"], *rule)
+
+    heuristic = maximum_placement(n, *rule, cells=free_cells(n, 3), exact=False)
+    assert heuristic["error"] is None
+
+
+def test_time_limit_is_respected():
+    result = maximum_placement(60, *RULES["Centaur"], time_limit=0.5)
+    assert result["seconds"] < 3
+    assert is_independent(60, result["squares"], *RULES["Centaur"])
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from non_interfaces.kpiece_attacks import PIECE_RULES, attack_pairs, attack_table
+from non_interfaces.kpiece_model import (
+    SYMMETRY_MODES, build_model, conflict_cliques, leader_constraints, rule_symmetries
+)
+
+KING = (((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)), ())
+RULES = dict(PIECE_RULES, King=KING, Camel=(((1, 3), (3, 1), (-1, 3), (3, -1)), ()))
+# Maximum pieces on an empty 6x6 board
+MAXIMA_6 = {"Queen": 6, "Rook": 6, "Bishop": 10, "Knight": 18, "King": 9, "Camel": 18}
+
+
+def optimum(model):
+    model.optimize()
+    return round(model.ObjVal)
+
+
+@pytest.mark.parametrize("name", RULES)
+def test_cliques_cover_exactly_the_attacks(name):
+    n = 7
+    table = attack_table(n, *RULES[name])
+    table = table | table.T
+    covered = set()
+    for clique in conflict_cliques(n, *RULES[name]):
+        assert len(clique) >= 2
+        assert table[np.ix_(clique, clique)].sum() == len(clique) * (len(clique) - 1)
+        covered.update((int(a), int(b)) for a in clique for b in clique if a < b)
+    assert covered == set(map(tuple, attack_pairs(table).tolist()))
+
+
+@pytest.mark.parametrize("name", RULES)
+def test_clique_and_pair_models_agree(name):
+    pytest.importorskip("gurobipy")
+    n = 6
+    cells = np.flatnonzero(np.random.default_rng(1).random(n * n) >= 0.2)
+    for free in (None, cells):
+        values = {optimum(build_model(n, *RULES[name], cells=free, formulation=f)[0])
+                  for f in ("clique", "pairs")}
+        assert len(values) == 1
+        if free is None:
+            assert values == {MAXIMA_6[name]}
+
+
+def test_fixed_count_feasibility():
+    gp = pytest.importorskip("gurobipy")
+    for k, status in ((8, gp.GRB.OPTIMAL), (9, gp.GRB.INFEASIBLE)):
+        model, _ = build_model(8, *PIECE_RULES["Queen"], k=k)
+        model.optimize()
+        assert model.status == status
+    with pytest.raises(ValueError):
+        build_model(4, *PIECE_RULES["Queen"], formulation="triples")
+
+
+def test_rule_symmetries():
+    assert len(rule_symmetries(5, *PIECE_RULES["Knight"])) == 7
+    assert len(rule_symmetries(5, *RULES["Camel"])) == 1  # only the transpose keeps its offsets
+    # Removing a corner square leaves only the diagonal reflection through it
+    assert leader_constraints(4, *PIECE_RULES["Queen"], np.arange(1, 16)) == [(1, 4)]
+
+
+@pytest.mark.parametrize("name", ["Queen", "Bishop", "King", "Camel"])
+def test_symmetry_modes_keep_the_optimum(name):
+    pytest.importorskip("gurobipy")
+    n = 5
+    center_out = np.delete(np.arange(n * n), n * n // 2)  # symmetric under every board symmetry
+    for cells in (None, center_out, np.arange(3, n * n)):
+        best = {optimum(build_model(n, *RULES[name], cells=cells, symmetry=mode)[0])
+                for mode in SYMMETRY_MODES}
+        assert len(best) == 1
+        k = best.pop()
+        for mode in SYMMETRY_MODES:
+            for count, feasible in ((k, True), (k + 1, False)):
+                model, _ = build_model(n, *RULES[name], cells=cells, k=count, symmetry=mode)
+                model.optimize()
+                assert (model.SolCount > 0) == feasible
+    with pytest.raises(ValueError):
+        build_model(4, *PIECE_RULES["Queen"], symmetry="orbital")
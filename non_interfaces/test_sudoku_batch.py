@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from non_interfaces.sudoku_batch import count_done, generate_batch, settings_path
+from non_interfaces.sudoku_core import count_solutions, decode_grid
+
+SETTINGS = dict(n=4, block_size=2, remove=8, seed=3, processes=1)
+
+
+def test_missing_pack_has_nothing_done(tmp_path):
+    assert count_done(str(tmp_path / "pack.txt"), 9) == 0
+
+
+def test_pack_lines_are_unique_puzzles(tmp_path):
+    path = str(tmp_path / "pack.txt")
+    assert generate_batch(path, 5, **SETTINGS)[0] == 5
+    lines = open(path).read().splitlines()
+    assert len(lines) == 5
+    for line in lines:
+        assert count_solutions(decode_grid(line), 2) == 1
+
+
+def test_resume_truncates_partial_line(tmp_path):
+    path = str(tmp_path / "pack.txt")
+    generate_batch(path, 6, **SETTINGS)
+    expected = open(path).read()
+
+    # Interrupted run: 3 complete lines and half of the 4th
+    partial = tmp_path / "partial.txt"
+    partial.write_text(expected[:3 * 17 + 8])
+    with open(settings_path(str(partial)), "w") as f:
+        f.write(open(settings_path(path)).read())
+    assert count_done(str(partial), 4) == 3
+    assert partial.read_text() == expected[:3 * 17]
+
+    assert generate_batch(str(partial), 6, **SETTINGS)[0] == 3
+    assert partial.read_text() == expected
+
+
+def test_whole_last_line_without_newline_is_kept(tmp_path):
+    path = tmp_path / "pack.txt"
+    path.write_text("1234341221434321\n12..34..21..43..")
+    assert count_done(str(path), 4) == 2
+    assert path.read_text() == "1234341221434321\n12..34..21..43..\n"
+
+
+@pytest.mark.parametrize("content", ["1234341221434321\nnot a puzzle\n12", "123434122143432\n12",
+                                     "1234341221434321\n12x"])
+def test_bad_pack_is_refused_untouched(tmp_path, content):
+    path = tmp_path / "pack.txt"
+    path.write_text(content)
+    with pytest.raises(ValueError):
+        count_done(str(path), 4)
+    assert path.read_text() == content
+
+
+def test_resume_with_other_settings_is_refused(tmp_path):
+    path = str(tmp_path / "pack.txt")
+    generate_batch(path, 2, **SETTINGS)
+    before = open(path).read()
+    with pytest.raises(ValueError, match="remove"):
+        generate_batch(path, 4, **dict(SETTINGS, remove=6))
+    with pytest.raises(ValueError, match="seed"):
+        generate_batch(path, 4, **dict(SETTINGS, seed=4))
+    assert open(path).read() == before
+
+    os.remove(settings_path(path))
+    with pytest.raises(ValueError):
+        generate_batch(path, 4, **SETTINGS)
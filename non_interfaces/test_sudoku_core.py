@@ -0,0 +1,129 @@
+import random
+
+import pytest
+
+from non_interfaces.sudoku_core import (
+    check_shape, count_solutions, decode_grid, default_block, encode_grid, generate,
+    is_valid_solution, parse_block_size, parse_grid, pattern_grid, random_full_grid,
+    remove_cells, remove_cells_unique, solve
+)
+
+PUZZLE = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+SOLUTION = "534678912672195348198342567859761423426853791713924856961537284287419635345286179"
+
+
+def test_solve_dispatches_to_propagation():
+    assert solve(decode_grid(PUZZLE), 3) == decode_grid(SOLUTION)
+
+
+def test_solve_rejects_bad_input():
+    with pytest.raises(ValueError):
+        solve(decode_grid(PUZZLE), 3, backend="simplex")
+    with pytest.raises(ValueError):
+        solve([[0] * 9 for _ in range(8)], 3)
+
+
+def test_remove_cells_blanks_exactly_count():
+    full = generate(9, 3, rng=random.Random(0))
+    puzzle = remove_cells(full, 40, random.Random(1))
+    assert sum(v == 0 for row in puzzle for v in row) == 40
+    assert all(p in (0, f) for prow, frow in zip(puzzle, full) for p, f in zip(prow, frow))
+    with pytest.raises(ValueError):
+        remove_cells(puzzle, 42)
+
+
+def test_encode_decode_round_trip():
+    grid = decode_grid(PUZZLE)
+    assert encode_grid(grid) == PUZZLE
+    assert is_valid_solution(decode_grid(SOLUTION), 3)
+    assert not is_valid_solution(grid, 3)
+
+
+def test_parse_grid_formats():
+    expected = [[1, 0, 0, 0], [0, 0, 3, 0], [0, 4, 0, 0], [0, 0, 0, 2]]
+    assert parse_grid("# 4x4\n1 . 0 .\n0 0 3 0\n. 4 . .\n0 0 0 2\n") == expected
+    assert parse_grid("1,,,\n,,3,\n,4,,\n,,,2") == expected
+    assert parse_grid("1.....3..4.....2") == expected
+    with pytest.raises(ValueError):
+        parse_grid("1 2 3\n4 5")
+    with pytest.raises(ValueError):
+        parse_grid("1 2\n3 x")
+
+
+def test_milp_matches_propagation():
+    pytest.importorskip("gurobipy")
+    assert solve(decode_grid(PUZZLE), 3, backend="gurobi") == decode_grid(SOLUTION)
+
+
+def test_milp_reports_infeasible_puzzle():
+    pytest.importorskip("gurobipy")
+    grid = decode_grid(PUZZLE)
+    grid[0][2] = 5
+    assert solve(grid, 3, backend="gurobi") is None
+
+
+@pytest.mark.parametrize("n,block_size,seed", [(4, 2, 0), (6, (2, 3), 1), (9, 3, 2), (9, 3, 3)])
+def test_remove_cells_unique_keeps_one_solution(n, block_size, seed):
+    full = generate(n, block_size, rng=random.Random(seed))
+    puzzle = remove_cells_unique(full, None, block_size, random.Random(seed))
+    assert count_solutions(puzzle, block_size) == 1
+    assert solve(puzzle, block_size) == full
+    assert sum(v == 0 for row in puzzle for v in row) >= n * n // 2
+
+
+@pytest.mark.parametrize("n,block_size,max_nodes", [(9, 3, 0), (16, 4, 20)])
+def test_remove_cells_unique_node_cap_keeps_one_solution(n, block_size, max_nodes):
+    # A check cut short by the node cap keeps its clue instead of guessing
+    full = generate(n, block_size, rng=random.Random(1))
+    puzzle = remove_cells_unique(full, None, block_size, random.Random(1), max_nodes=max_nodes)
+    assert count_solutions(puzzle, block_size) == 1
+    assert sum(v == 0 for row in puzzle for v in row) >= n * n // 2
+
+
+def test_remove_cells_unique_stops_at_count():
+    full = decode_grid(SOLUTION)
+    puzzle = remove_cells_unique(full, 30, 3, random.Random(0))
+    assert sum(v == 0 for row in puzzle for v in row) == 30
+    assert count_solutions(puzzle, 3) == 1
+    assert count_solutions(remove_cells(full, 81), 3) == 2
+
+
+@pytest.mark.parametrize("br,bc", [(3, 3), (2, 3), (3, 2), (3, 4), (2, 5), (4, 4), (1, 7)])
+def test_pattern_grids_are_valid(br, bc):
+    n = br * bc
+    block_size = -1 if br == 1 else (br, bc)
+    assert is_valid_solution(pattern_grid(n, br, bc), block_size)
+    for seed in range(5):
+        assert is_valid_solution(random_full_grid(n, br, bc, random.Random(seed)), block_size)
+
+
+def test_generate_is_seeded_and_valid():
+    grids = [generate(12, (3, 4), rng=random.Random(seed)) for seed in (0, 0, 1)]
+    assert grids[0] == grids[1] != grids[2]
+    assert is_valid_solution(grids[0], (3, 4))
+    assert is_valid_solution(generate(7, -1, rng=random.Random(0)), -1)
+
+
+@pytest.mark.parametrize("n,block_size", [(9, 2), (9, (2, 3)), (6, (0, 6)), (0, -1), (12, (5, 3))])
+def test_check_shape_rejects_impossible_boxes(n, block_size):
+    with pytest.raises(ValueError):
+        check_shape(n, block_size)
+    with pytest.raises(ValueError):
+        solve([[0] * n for _ in range(n)], block_size)
+
+
+def test_block_size_helpers():
+    assert [default_block(n) for n in (4, 6, 8, 9, 10, 12, 7)] == [2, (2, 3), (2, 4), 3, (2, 5), (3, 4), -1]
+    assert parse_block_size("3") == 3
+    assert parse_block_size(" 2x3 ") == (2, 3)
+    assert parse_block_size("2*5") == (2, 5)
+    assert parse_block_size("-1") == -1
+    with pytest.raises(ValueError):
+        parse_block_size("3x")
+
+
+@pytest.mark.parametrize("n,block_size", [(6, (2, 3)), (8, (4, 2)), (10, (2, 5))])
+def test_rectangular_boxes_are_solved(n, block_size):
+    full = generate(n, block_size, rng=random.Random(n))
+    puzzle = remove_cells_unique(full, None, block_size, random.Random(0))
+    assert solve(puzzle, block_size) == full
@@ -0,0 +1,64 @@
+import random
+
+import numpy as np
+import pytest
+
+from non_interfaces.sudoku_engine import build_units, index_tables, solve_sudoku
+
+# Well-known puzzles with a unique solution, '.' for empty cells
+PUZZLES = [
+    ("53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79",
+     "534678912672195348198342567859761423426853791713924856961537284287419635345286179"),
+    # "Arto Inkala" puzzle: needs search beyond singles
+    ("8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+     "812753649943682175675491283154237896369845721287169534521974368438526917796318452"),
+]
+
+
+def grid_of(line):
+    return [[0 if ch == "." else int(ch) for ch in line[r * 9:(r + 1) * 9]] for r in range(9)]
+
+
+def is_complete(grid, block_size):
+    units, _, _ = build_units(len(grid), block_size)
+    cells = [v for row in grid for v in row]
+    return all({cells[q] for q in unit} == set(range(1, len(grid) + 1)) for unit in units)
+
+
+@pytest.mark.parametrize("puzzle,solution", PUZZLES)
+def test_solves_known_puzzles(puzzle, solution):
+    assert solve_sudoku(grid_of(puzzle), 3) == grid_of(solution)
+
+
+def test_unsolvable_puzzle_gives_none():
+    grid = grid_of(PUZZLES[0][0])
+    grid[0][2] = 5  # the first row already holds a 5
+    assert solve_sudoku(grid, 3) is None
+
+
+@pytest.mark.parametrize("n,block_size", [(4, 2), (9, 3), (6, (2, 3)), (16, 4), (5, None)])
+def test_empty_grid_is_completed(n, block_size):
+    grid = solve_sudoku([[0] * n for _ in range(n)], block_size, random.Random(0))
+    assert is_complete(grid, block_size)
+
+
+def test_rejects_block_size_that_cannot_tile():
+    with pytest.raises(ValueError):
+        solve_sudoku([[0] * 9 for _ in range(9)], 2)
+
+
+@pytest.mark.parametrize("n,shape,peer_count", [(9, (3, 3), 20), (6, (2, 3), 12), (12, (3, 4), 28), (5, None, 8)])
+def test_index_tables(n, shape, peer_count):
+    units, units_of, peers = index_tables(n, shape)
+    assert units.shape == ((3 if shape else 2) * n, n)
+    # every unit holds each cell once per kind, and lists its own cells
+    assert (np.bincount(units.ravel(), minlength=n * n) == len(units) // n).all()
+    for q in range(n * n):
+        assert (units[units_of[q]] == q).any(axis=1).all()
+        expected = set(units[units_of[q]].ravel().tolist()) - {q}
+        assert peers[q].tolist() == sorted(expected)
+    assert peers.shape == (n * n, peer_count)
+
+    assert index_tables(n, shape)[0] is units
+    with pytest.raises(ValueError):
+        units[0, 0] = 1
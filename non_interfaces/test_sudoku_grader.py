@@ -0,0 +1,43 @@
+import random
+
+import pytest
+
+from non_interfaces.sudoku_core import decode_grid, generate, remove_cells_unique, solve
+from non_interfaces.sudoku_grader import LEVELS, grade
+
+EASY = "53..7....6..195....98....6.8...6...34..8.3..17...2...6.6....28....419..5....8..79"
+EXPERT = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+
+def test_known_levels():
+    easy = grade(decode_grid(EASY), 3)
+    assert easy["level"] == "easy"
+    assert easy["branches"] == 0
+    assert easy["solution"] == solve(decode_grid(EASY), 3)
+
+    expert = grade(decode_grid(EXPERT), 3)
+    assert expert["level"] == "expert"
+    assert expert["branches"] > 0
+    assert expert["solution"] == solve(decode_grid(EXPERT), 3)
+
+
+@pytest.mark.parametrize("n,block_size,seed", [(4, 2, 0), (6, (2, 3), 0), (9, 3, 0), (9, 3, 1), (9, 3, 2),
+                                                (12, (3, 4), 0)])
+def test_solution_matches_solver(n, block_size, seed):
+    rng = random.Random(seed)
+    puzzle = remove_cells_unique(generate(n, block_size, rng=rng), None, block_size, rng)
+    graded = grade(puzzle, block_size)
+    assert graded["level"] in LEVELS
+    assert graded["solution"] == solve(puzzle, block_size)
+
+
+def test_unsolvable_and_invalid_puzzles():
+    grid = decode_grid(EASY)
+    grid[0][2] = 5
+    graded = grade(grid, 3)
+    assert graded["level"] == "unsolvable"
+    assert graded["solution"] is None
+
+    grid[0][2] = 10
+    with pytest.raises(ValueError):
+        grade(grid, 3)
@@ -0,0 +1,38 @@
+import sys, os, time, tracemalloc
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from core.grid_builder import build_grid_graph
+from core.grid_graph import build_grid_arrays
+
+SIZES = [50, 100, 200, 300]
+
+
+def measure(fn, *args):
+    """(result, seconds, peak bytes allocated while building)"""
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    # dict MB: memory held by the dict form; array MB: GridGraph.nbytes;
+    # peak MB: largest allocation while building the arrays
+    print(f"{'n':>5} {'diag':>5} {'arcs':>9} {'dict MB':>9} {'dict s':>7} "
+          f"{'array MB':>9} {'peak MB':>8} {'array s':>8} {'ratio':>6}")
+    for diagonal in (False, True):
+        for n in SIZES:
+            danger = {(i, j) for i in range(n) for j in range(n) if (i + j) % 7 == 0}
+            forbid = {(i, n // 2) for i in range(1, n - 1)}
+
+            graph_dict, t_dict, mem_dict = measure(build_grid_graph, n, danger, forbid, diagonal)
+            graph, t_arr, mem_arr = measure(build_grid_arrays, n, danger, forbid, diagonal)
+
+            print(f"{n:>5} {str(diagonal):>5} {graph.num_arcs:>9} "
+                  f"{mem_dict / 1e6:>9.1f} {t_dict:>7.2f} "
+                  f"{graph.nbytes / 1e6:>9.1f} {mem_arr / 1e6:>8.1f} {t_arr:>8.3f} "
+                  f"{mem_dict / graph.nbytes:>6.0f}x")
+            del graph_dict, graph
@@ -0,0 +1,83 @@
+import sys, os, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+
+from PyQt5.QtWidgets import QApplication, QGraphicsView, QGraphicsScene, QGraphicsRectItem
+from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtCore import QRectF, Qt
+
+from ui.grid_view import GridView, CELL_SIZE
+from core.grid_graph import build_grid_arrays
+from core.fast_path import TieredSolver
+
+SIZES = [50, 100, 300]
+LEGACY_MAX_N = 300
+FRAMES = 10
+
+
+def frame_time(view):
+    """Average time to repaint the whole viewport (ms)"""
+    view.grab()
+    t0 = time.perf_counter()
+    for _ in range(FRAMES):
+        view.viewport().update()
+        view.grab()
+    return 1000 * (time.perf_counter() - t0) / FRAMES
+
+
+def legacy_view(n):
+    """Previous rendering: one QGraphicsRectItem per cell"""
+    scene = QGraphicsScene()
+    for i in range(n):
+        for j in range(n):
+            rect = QGraphicsRectItem(QRectF(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE))
+            rect.setPen(Qt.black)
+            rect.setBrush(QBrush(Qt.white))
+            scene.addItem(rect)
+    view = QGraphicsView(scene)
+    view.scene_ref = scene
+    return view
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+
+    print(f"{'n':>5} {'view':>7} {'build ms':>9} {'fit ms':>8} {'zoom ms':>8} {'path ms':>8}")
+    for n in SIZES:
+        rng = np.random.default_rng(n)
+        forbidden = {(int(i), int(j)) for i, j in rng.integers(0, n, (n * n // 10, 2))} - {(0, 0), (n - 1, n - 1)}
+        graph = build_grid_arrays(n, None, forbidden, diagonal=True)
+        _, _, _, arc_ids = TieredSolver(graph).solve((0, 0), (n - 1, n - 1), float(n))
+        path_arcs = graph.path_arcs(arc_ids)
+
+        for kind in ("item", "legacy"):
+            if kind == "legacy" and n > LEGACY_MAX_N:
+                continue
+
+            t0 = time.perf_counter()
+            view = GridView(n) if kind == "item" else legacy_view(n)
+            build = 1000 * (time.perf_counter() - t0)
+            view.resize(800, 600)
+
+            view.fitInView(view.sceneRect(), Qt.KeepAspectRatio)
+            fit = frame_time(view)
+
+            view.resetTransform()
+            zoom = frame_time(view)
+
+            t0 = time.perf_counter()
+            if kind == "item":
+                view.color_path(arc_ids, graph=graph)
+            else:
+                cells = {c for arc in path_arcs for c in arc}
+                for item in view.scene().items():
+                    r = item.rect()
+                    if (int(r.y() // CELL_SIZE), int(r.x() // CELL_SIZE)) in cells:
+                        item.setBrush(QBrush(QColor(150, 255, 150)))
+            view.fitInView(view.sceneRect(), Qt.KeepAspectRatio)
+            view.grab()
+            path = 1000 * (time.perf_counter() - t0)
+
+            print(f"{n:>5} {kind:>7} {build:>9.1f} {fit:>8.1f} {zoom:>8.1f} {path:>8.1f}")
@@ -0,0 +1,54 @@
+import sys, os, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import numpy as np
+
+from core.grid_graph import build_grid_arrays
+from core.fast_path import TieredSolver
+from core.hierarchical import solve_hierarchical
+
+EXACT_MAX_N = 1000  # flat exact solve, for the optimality gap
+
+
+def benchmark_map(n, seed):
+    """Random obstacles and dangerous zones, start and end corners kept free."""
+    rng = np.random.default_rng(seed)
+    forbidden = rng.random((n, n)) < 0.15
+    dangerous = np.zeros((n, n), dtype=bool)
+    for _ in range(n // 10):
+        i, j = rng.integers(0, n, 2)
+        r = rng.integers(2, max(3, n // 20))
+        dangerous[max(0, i - r):i + r, max(0, j - r):j + r] = True
+    forbidden[0, 0] = forbidden[-1, -1] = False
+    return dangerous, forbidden
+
+
+if __name__ == "__main__":
+    print(f"{'n':>5} {'diag':>5} {'R_max':>6} {'exact d':>8} {'exact s':>8} "
+          f"{'hier d':>8} {'hier s':>7} {'gap %':>6} {'radius':>6} {'corridor':>9}")
+
+    for n in (100, 200, 400, 1000):
+        for diagonal in (False, True):
+            dangerous, forbidden = benchmark_map(n, seed=n)
+            start, end = (0, 0), (n - 1, n - 1)
+
+            for R_max in (n / 50, n / 5):
+                t0 = time.perf_counter()
+                (status, d, r, path), info = solve_hierarchical(
+                    n, start, end, R_max, dangerous, forbidden, diagonal, block=max(5, n // 40)
+                )
+                t_hier = time.perf_counter() - t0
+
+                exact_d, t_exact, gap = "-", "-", "-"
+                if n <= EXACT_MAX_N:
+                    t0 = time.perf_counter()
+                    graph = build_grid_arrays(n, dangerous, forbidden, diagonal)
+                    exact = TieredSolver(graph).solve(start, end, R_max)
+                    t_exact = f"{time.perf_counter() - t0:.2f}"
+                    exact_d = exact[1]
+                    if exact[0] == "optimal" and status == "optimal":
+                        gap = f"{100 * (d - exact[1]) / exact[1]:.2f}"
+
+                print(f"{n:>5} {str(diagonal):>5} {R_max:>6.0f} {str(exact_d):>8} {t_exact:>8} "
+                      f"{str(d):>8} {t_hier:>7.2f} {gap:>6} {str(info['radius']):>6} "
+                      f"{info['corridor_cells']:>9}")
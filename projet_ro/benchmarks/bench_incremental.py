@@ -0,0 +1,60 @@
+import sys, os, time, random
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gurobipy as gp
+
+from core.grid_builder import build_grid_graph
+from core.solver import solve_shortest_path_with_risk
+from core.session import PathPlanningSession
+
+N = 20          # keeps the model within the size-limited Gurobi license
+EDITS = 30
+
+
+def edits(n, seed=0):
+    """Simulated GUI session: one extra forbidden / dangerous cell per click."""
+    rng = random.Random(seed)
+    forbidden, dangerous, R_max = set(), set(), 4.0
+    for _ in range(EDITS):
+        cell = (rng.randrange(n), rng.randrange(n))
+        if cell in {(0, 0), (n - 1, n - 1)}:
+            continue
+        kind = rng.random()
+        if kind < 0.5:
+            forbidden.add(cell)
+        elif kind < 0.9:
+            dangerous.add(cell)
+        else:
+            R_max = rng.choice([1.0, 2.0, 4.0])
+        yield set(forbidden), set(dangerous), R_max
+
+
+if __name__ == "__main__":
+    gp.setParam("OutputFlag", 0)
+    start = (0, 0)
+
+    for diagonal in (False, True):
+        n = N if not diagonal else N * 2 // 3
+        end = (n - 1, n - 1)
+        t_cold = t_warm = 0.0
+
+        t0 = time.perf_counter()
+        session = PathPlanningSession(n, diagonal)
+        t_setup = time.perf_counter() - t0
+
+        for forbidden, dangerous, R_max in edits(n):
+            t0 = time.perf_counter()
+            nodes, arcs, dist, risk = build_grid_graph(n, dangerous, forbidden, diagonal)
+            cold = solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, R_max)
+            t_cold += time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            warm = session.solve(start, end, R_max, forbidden, dangerous)
+            t_warm += time.perf_counter() - t0
+
+            assert cold[0] == warm[0] and cold[1] == warm[1], (cold[:3], warm[:3])
+
+        session.dispose()
+        print(f"n={n:>3} diagonal={str(diagonal):>5}: {EDITS} edits, "
+              f"cold {t_cold:.3f}s, session {t_warm:.3f}s (+{t_setup:.3f}s setup), "
+              f"{t_cold / t_warm:.1f}x")
@@ -0,0 +1,60 @@
+import sys, os, time
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from core.grid_builder import build_grid_graph
+from core.solver import build_shortest_path_model
+
+SIZES = [10, 25, 50, 100, 200, 300]
+LEGACY_MAX_N = 50   # the per-node arc scan is O(|V|.|A|): too slow beyond this
+
+
+def build_legacy(nodes, arcs, dist, risk, start, end, R_max):
+    """Previous construction: scans the full arc list twice per node."""
+    m = gp.Model("legacy")
+    x = m.addVars(arcs, vtype=GRB.BINARY, name="x")
+    m.setObjective(gp.quicksum(dist[a] * x[a] for a in arcs), GRB.MINIMIZE)
+    m.addConstr(gp.quicksum(risk[a] * x[a] for a in arcs) <= R_max)
+    for i in nodes:
+        out_i = gp.quicksum(x[a] for a in arcs if a[0] == i)
+        in_i = gp.quicksum(x[a] for a in arcs if a[1] == i)
+        rhs = 1 if i == start else (-1 if i == end else 0)
+        m.addConstr(out_i - in_i == rhs)
+    m.update()
+    return m
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    gp.setParam("OutputFlag", 0)
+
+    print(f"{'n':>5} {'arcs':>9} {'graph (s)':>10} {'model (s)':>10} {'legacy (s)':>11}")
+    for n in SIZES:
+        danger = {(i, i) for i in range(n)}
+        forbid = {(i, n // 2) for i in range(1, n - 1)}
+
+        (nodes, arcs, dist, risk), t_graph = timed(build_grid_graph, n, danger, forbid)
+        args = (nodes, arcs, dist, risk, (0, 0), (n - 1, n - 1), n / 2)
+
+        def build(*a):
+            m, _, _ = build_shortest_path_model(*a)
+            m.update()
+            return m
+
+        m, t_model = timed(build, *args)
+        m.dispose()
+
+        legacy = "-"
+        if n <= LEGACY_MAX_N:
+            m, t_legacy = timed(build_legacy, *args)
+            m.dispose()
+            legacy = f"{t_legacy:.3f}"
+
+        print(f"{n:>5} {len(arcs):>9} {t_graph:>10.3f} {t_model:>10.3f} {legacy:>11}")
@@ -0,0 +1,51 @@
+import sys, os, time, random
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import gurobipy as gp
+
+from core.grid_builder import build_grid_graph
+from core.solver import build_shortest_path_model, add_cycle_elimination, find_subtours
+
+# Sizes kept within the size-limited Gurobi license
+SIZES = {False: [8, 14, 20], True: [6, 10, 14]}
+SEEDS = range(5)
+
+
+def solve(nodes, arcs, dist, risk, start, end, R_max, lazy):
+    m, x, _ = build_shortest_path_model(nodes, arcs, dist, risk, start, end, R_max)
+    t0 = time.perf_counter()
+    if lazy:
+        m.optimize(add_cycle_elimination(m, x, nodes, arcs, start))
+    else:
+        m.optimize()
+    elapsed = time.perf_counter() - t0
+    path = [a for a in arcs if x[a].X > 0.5] if m.SolCount else []
+    cuts = getattr(m, "_cuts", 0)
+    m.dispose()
+    return elapsed, path, cuts
+
+
+if __name__ == "__main__":
+    gp.setParam("OutputFlag", 0)
+
+    print(f"{'diag':>5} {'n':>4} {'plain (s)':>10} {'lazy (s)':>9} {'cuts':>5} {'subtours plain':>15}")
+    for diagonal in (False, True):
+        for n in SIZES[diagonal]:
+            t_plain = t_lazy = 0.0
+            cuts = subtours = 0
+            for seed in SEEDS:
+                rng = random.Random(seed)
+                danger = {(rng.randrange(n), rng.randrange(n)) for _ in range(n * n // 3)}
+                forbid = {(rng.randrange(n), rng.randrange(n)) for _ in range(n)} - {(0, 0), (n - 1, n - 1)}
+                args = build_grid_graph(n, danger, forbid, diagonal) + ((0, 0), (n - 1, n - 1), n / 4)
+
+                t, path, _ = solve(*args, lazy=False)
+                t_plain += t
+                subtours += len(find_subtours(path, (0, 0)))
+
+                t, path, c = solve(*args, lazy=True)
+                t_lazy += t
+                cuts += c
+                assert not find_subtours(path, (0, 0))
+
+            print(f"{str(diagonal):>5} {n:>4} {t_plain:>10.3f} {t_lazy:>9.3f} {cuts:>5} {subtours:>15}")
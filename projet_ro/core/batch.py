@@ -0,0 +1,119 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from core.label_setting import label_setting, reverse_dijkstra
+
+
+def landmark_tables(graph, count=8):
+    """
+    Distance and risk from `count` landmarks to every node of a GridGraph
+    (arcs and their values are symmetric on the grid, so "from" = "to").
+    Landmarks are picked by farthest-point selection on distance.
+    Returns (landmarks, dist_table, risk_table), tables shaped (count, nodes).
+    """
+
+    in_ptr, in_order = (a.tolist() for a in graph.in_csr())
+    src = graph.src.tolist()
+    dist = graph.dist.tolist()
+    risk = graph.risk.tolist()
+
+    # Only nodes with arcs can be reached at all
+    candidates = np.flatnonzero(np.diff(graph.indptr))
+    if len(candidates) == 0:
+        empty = np.empty((0, graph.num_nodes))
+        return [], empty, empty
+
+    landmarks = [int(candidates[0])]
+    dist_rows, risk_rows = [], []
+    closest = np.full(graph.num_nodes, np.inf)
+
+    while True:
+        L = landmarks[-1]
+        dist_rows.append(reverse_dijkstra(graph.num_nodes, src, dist, in_ptr, in_order, L))
+        risk_rows.append(reverse_dijkstra(graph.num_nodes, src, risk, in_ptr, in_order, L))
+        if len(landmarks) == count:
+            break
+
+        # Next landmark: reachable node farthest from the chosen ones
+        row = np.array(dist_rows[-1])
+        closest = np.minimum(closest, np.where(np.isinf(row), -1.0, row))
+        nxt = int(np.argmax(closest))
+        if closest[nxt] <= 0 or nxt in landmarks:
+            break
+        landmarks.append(nxt)
+
+    return landmarks, np.array(dist_rows), np.array(risk_rows)
+
+
+def landmark_bounds(table, t):
+    """
+    Lower bound of the cost from every node to t by triangle inequality:
+    max over landmarks of |d(L, t) - d(L, v)| (INF when v and t are not
+    connected, 0 when a landmark reaches neither).
+    """
+
+    if len(table) == 0:
+        return [0.0] * table.shape[1]
+
+    with np.errstate(invalid="ignore"):
+        diff = np.abs(table[:, t:t + 1] - table)
+    diff[np.isnan(diff)] = 0.0
+    return diff.max(axis=0).tolist()
+
+
+# Per-process copy of the shared structures (set by _init_worker)
+_shared = {}
+
+
+def _init_worker(graph, dist_table, risk_table):
+    out_ptr, out_order = graph.out_csr()
+    _shared.update(
+        graph=graph,
+        src=graph.src.tolist(),
+        dst=graph.dst.tolist(),
+        dist=graph.dist.tolist(),
+        risk=graph.risk.tolist(),
+        out_csr=(out_ptr.tolist(), out_order.tolist()),
+        dist_table=dist_table,
+        risk_table=risk_table,
+    )
+
+
+def _solve_query(index, query):
+    start, end, R_max = query
+    g = _shared["graph"]
+    s, t = g.node_index(start), g.node_index(end)
+
+    return index, label_setting(
+        g.num_nodes, _shared["src"], _shared["dst"], _shared["dist"], _shared["risk"],
+        s, t, R_max,
+        lb_dist=landmark_bounds(_shared["dist_table"], t),
+        lb_risk=landmark_bounds(_shared["risk_table"], t),
+        out_csr=_shared["out_csr"]
+    )
+
+
+def solve_batch(graph, queries, processes=None, landmarks=8):
+    """
+    Solve many (start, end, R_max) queries on one GridGraph.
+    Adjacency and landmark tables are computed once and shared by the
+    worker processes (processes=1 solves in the calling process).
+
+    Yields (query index, (status, best_distance, total_risk, arc_ids))
+    in completion order.
+    """
+
+    _, dist_table, risk_table = landmark_tables(graph, landmarks)
+
+    if processes == 1:
+        _init_worker(graph, dist_table, risk_table)
+        for index, query in enumerate(queries):
+            yield _solve_query(index, query)
+        return
+
+    with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker,
+                             initargs=(graph, dist_table, risk_table)) as pool:
+        futures = [pool.submit(_solve_query, index, query) for index, query in enumerate(queries)]
+        for future in as_completed(futures):
+            yield future.result()
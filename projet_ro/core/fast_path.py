@@ -0,0 +1,111 @@
+import heapq
+
+import numpy as np
+
+from core.label_setting import INF, EPS, label_setting
+from core.solver import solve_grid_graph
+
+
+def grid_heuristic(graph, t):
+    """
+    Admissible, consistent lower bound of the distance from every node to t:
+    Manhattan distance on 4-neighbour grids, Chebyshev distance with
+    diagonals (a diagonal move costs the same as a straight one here),
+    scaled by the smallest arc distance.
+    """
+
+    if graph.num_arcs == 0:
+        return [0.0] * graph.num_nodes
+
+    ti, tj = graph.cell(t)
+    rows, cols = np.divmod(np.arange(graph.num_nodes), graph.n)
+    di, dj = np.abs(rows - ti), np.abs(cols - tj)
+    steps = np.maximum(di, dj) if graph.diagonal else di + dj
+    return (steps * float(graph.dist.min())).tolist()
+
+
+class TieredSolver:
+    """
+    Shortest path with risk constraint on one GridGraph, answered by the
+    cheapest tier that can prove optimality:
+        "astar": A* on distance (ties broken by risk); the path is optimal
+                 when it fits in R_max, and no path at all is infeasible
+        "exact": label setting (or Gurobi) when the budget is binding
+    `counters` records how many queries each tier answered.
+    """
+
+    def __init__(self, graph, exact_backend="labels"):
+        self.graph = graph
+        self.exact_backend = exact_backend
+        self.counters = {"astar": 0, "exact": 0}
+
+        out_ptr, out_order = graph.out_csr()
+        in_ptr, in_order = graph.in_csr()
+        self.out_csr = (out_ptr.tolist(), out_order.tolist())
+        self.in_csr = (in_ptr.tolist(), in_order.tolist())
+        self.src = graph.src.tolist()
+        self.dst = graph.dst.tolist()
+        self.dist = graph.dist.tolist()
+        self.risk = graph.risk.tolist()
+
+    def astar(self, s, t):
+        """
+        Shortest path from s to t, least risky among the shortest ones.
+        Returns (distance, risk, arc_ids) or None when t is unreachable.
+        """
+
+        h = grid_heuristic(self.graph, t)
+        out_ptr, out_order = self.out_csr
+        best = [(INF, INF)] * self.graph.num_nodes
+        parent = [-1] * self.graph.num_nodes
+        best[s] = (0.0, 0.0)
+        heap = [(h[s], 0.0, 0.0, s)]
+
+        while heap:
+            _, r, d, v = heapq.heappop(heap)
+            if (d, r) > best[v]:
+                continue
+            if v == t:
+                path = []
+                while v != s:
+                    a = parent[v]
+                    path.append(a)
+                    v = self.src[a]
+                path.reverse()
+                return d, r, path
+
+            for p in range(out_ptr[v], out_ptr[v + 1]):
+                a = out_order[p]
+                w = self.dst[a]
+                cost = (d + self.dist[a], r + self.risk[a])
+                if cost < best[w]:
+                    best[w] = cost
+                    parent[w] = a
+                    heapq.heappush(heap, (cost[0] + h[w], cost[1], cost[0], w))
+
+        return None
+
+    def solve(self, start, end, R_max):
+        """Returns (status, best_distance, total_risk, arc_ids)"""
+
+        s, t = self.graph.node_index(start), self.graph.node_index(end)
+
+        shortest = self.astar(s, t)
+        if shortest is None:
+            self.counters["astar"] += 1
+            return "infeasible", None, None, []
+
+        d, r, path = shortest
+        if r <= R_max + EPS:
+            self.counters["astar"] += 1
+            return "optimal", d, r, path
+
+        # The risk budget is binding: exact resource-constrained solve
+        self.counters["exact"] += 1
+        if self.exact_backend != "labels":
+            return solve_grid_graph(self.graph, start, end, R_max, backend=self.exact_backend)
+
+        return label_setting(
+            self.graph.num_nodes, self.src, self.dst, self.dist, self.risk,
+            s, t, R_max, out_csr=self.out_csr, in_csr=self.in_csr
+        )
@@ -0,0 +1,79 @@
+from bisect import bisect_left
+from collections import OrderedDict
+
+from core.grid_graph import build_grid_arrays
+from core.label_setting import EPS, pareto_frontier
+
+
+def compute_frontier(graph, start, end):
+    """
+    Pareto frontier of distance versus risk between start and end on a
+    GridGraph, in one label-setting pass.
+    Returns a list of (distance, risk, path_arcs) by increasing distance.
+    """
+
+    out_ptr, out_order = graph.out_csr()
+    in_ptr, in_order = graph.in_csr()
+
+    points = pareto_frontier(
+        graph.num_nodes, graph.src.tolist(), graph.dst.tolist(),
+        graph.dist.tolist(), graph.risk.tolist(),
+        graph.node_index(start), graph.node_index(end),
+        out_csr=(out_ptr.tolist(), out_order.tolist()),
+        in_csr=(in_ptr.tolist(), in_order.tolist())
+    )
+
+    return [(d, r, graph.path_arcs(arc_ids)) for d, r, arc_ids in points]
+
+
+def lookup(frontier, R_max):
+    """
+    Shortest path of a frontier whose risk fits in R_max.
+    Returns (status, best_distance, total_risk, path_arcs)
+    """
+
+    # Risks decrease along the frontier: first point with risk <= R_max
+    neg_risks = [-r for _, r, _ in frontier]
+    k = bisect_left(neg_risks, -(R_max + EPS))
+    if k == len(frontier):
+        return "infeasible", None, None, []
+
+    d, r, path_arcs = frontier[k]
+    return "optimal", d, r, path_arcs
+
+
+class FrontierCache:
+    """
+    Pareto frontiers keyed by grid configuration
+    (n, diagonal, forbidden, dangerous, start, end), least recently used
+    evicted first. Any R_max on a cached configuration is a lookup.
+    """
+
+    def __init__(self, maxsize=16):
+        self.maxsize = maxsize
+        self.frontiers = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(n, diagonal, forbidden, dangerous, start, end):
+        return n, diagonal, frozenset(forbidden), frozenset(dangerous), start, end
+
+    def frontier(self, n, diagonal, forbidden, dangerous, start, end):
+        key = self.key(n, diagonal, forbidden, dangerous, start, end)
+
+        if key in self.frontiers:
+            self.hits += 1
+            self.frontiers.move_to_end(key)
+            return self.frontiers[key]
+
+        self.misses += 1
+        graph = build_grid_arrays(n, dangerous, forbidden, diagonal)
+        self.frontiers[key] = compute_frontier(graph, start, end)
+        if len(self.frontiers) > self.maxsize:
+            self.frontiers.popitem(last=False)
+        return self.frontiers[key]
+
+    def query(self, n, diagonal, forbidden, dangerous, start, end, R_max):
+        """Returns (status, best_distance, total_risk, path_arcs)"""
+        return lookup(self.frontier(n, diagonal, forbidden, dangerous, start, end), R_max)
@@ -1,3 +1,30 @@
+# Allowed directions (4-neighbors), plus diagonals when enabled
+DIRECTIONS = [
+    (0, 1),   # right
+    (0, -1),  # left
+    (1, 0),   # down
+    (-1, 0),  # up
+]
+DIAGONALS = [
+    (1, 1), (1, -1),
+    (-1, 1), (-1, -1)
+]
+
+# Arc risk according to the danger of its two endpoints
+RISK_SAFE = 0.0001
+RISK_ONE_DANGEROUS = 0.4     # xor : only one is dangerous → medium
+RISK_BOTH_DANGEROUS = 0.8    # both dangerous → high risk
+
+
+def arc_risk(src_danger, dst_danger):
+    """Risk of an arc given whether its source / destination is dangerous."""
+    if src_danger and dst_danger:
+        return RISK_BOTH_DANGEROUS
+    if src_danger ^ dst_danger:
+        return RISK_ONE_DANGEROUS
+    return RISK_SAFE
+
+
 def build_grid_graph(n, dangerous_cells=None, forbidden_cells=None, diagonal=False):
     """
     Build a grid of size n x n and return:
@@ -23,18 +50,8 @@ def build_grid_graph(n, dangerous_cells=None, forbidden_cells=None, diagonal=Fal
         for j in range(n):
             nodes.append((i, j))
 
-    # 2) Allowed directions (4-neighbors)
-    directions = [
-        (0, 1),   # right
-        (0, -1),  # left
-        (1, 0),   # down
-        (-1, 0),  # up
-    ]
-    if diagonal:
-        directions += [
-            (1, 1), (1, -1),
-            (-1, 1), (-1, -1)
-        ]
+    # 2) Allowed directions
+    directions = DIRECTIONS + DIAGONALS if diagonal else DIRECTIONS
 
     # 3) Build arcs with distance and risk
     for i in range(n):
@@ -65,13 +82,24 @@ def build_grid_graph(n, dangerous_cells=None, forbidden_cells=None, diagonal=Fal
                     src_danger = (i, j) in dangerous_cells
                     dst_danger = (ni, nj) in dangerous_cells
 
-                    risk_value=0.0001
+                    risk[arc] = arc_risk(src_danger, dst_danger)
 
-                    if src_danger and dst_danger:
-                        risk_value = 0.8      # both dangerous → high risk
-                    elif src_danger ^ dst_danger:  
-                        risk_value = 0.4      # xor : only one is dangerous → medium
+    return nodes, arcs, dist, risk
 
-                    risk[arc] = risk_value
 
-    return nodes, arcs, dist, risk
+def build_adjacency(nodes, arcs):
+    """
+    Index the arcs by node in a single pass over `arcs`.
+    Returns:
+        out_arcs: dict {node: [positions in arcs leaving node]}
+        in_arcs:  dict {node: [positions in arcs entering node]}
+    """
+
+    out_arcs = {i: [] for i in nodes}
+    in_arcs = {i: [] for i in nodes}
+
+    for k, (u, v) in enumerate(arcs):
+        out_arcs[u].append(k)
+        in_arcs[v].append(k)
+
+    return out_arcs, in_arcs
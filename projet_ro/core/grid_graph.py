@@ -0,0 +1,129 @@
+import numpy as np
+
+from core.grid_builder import (
+    DIRECTIONS, DIAGONALS,
+    RISK_SAFE, RISK_ONE_DANGEROUS, RISK_BOTH_DANGEROUS
+)
+
+
+class GridGraph:
+    """
+    Compact n x n grid graph.
+    Node (i, j) has index i*n + j. Arcs are sorted by source node (CSR):
+        src, dst:   int32 node indices of each arc
+        dist:       float32 arc lengths (small integers, exact in float32)
+        risk:       float64 arc risks, the RISK_* constants exactly, so
+                    sums compared against R_max match the dict form
+        indptr:     int32, arcs leaving node v are indptr[v]:indptr[v+1]
+    """
+
+    def __init__(self, n, diagonal, src, dst, dist, risk):
+        self.n = n
+        self.diagonal = diagonal
+        self.src = src
+        self.dst = dst
+        self.dist = dist
+        self.risk = risk
+
+        counts = np.bincount(src, minlength=n * n)
+        self.indptr = np.zeros(n * n + 1, dtype=np.int32)
+        np.cumsum(counts, out=self.indptr[1:])
+
+    @property
+    def num_nodes(self):
+        return self.n * self.n
+
+    @property
+    def num_arcs(self):
+        return len(self.src)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.src, self.dst, self.dist, self.risk, self.indptr))
+
+    def node_index(self, cell):
+        i, j = cell
+        return i * self.n + j
+
+    def cell(self, index):
+        return divmod(int(index), self.n)
+
+    def out_csr(self):
+        """(ptr, order) of the arcs grouped by source."""
+        return self.indptr, np.arange(self.num_arcs, dtype=np.int32)
+
+    def in_csr(self):
+        """(ptr, order) of the arcs grouped by target."""
+        order = np.argsort(self.dst, kind="stable").astype(np.int32)
+        ptr = np.zeros(self.num_nodes + 1, dtype=np.int32)
+        np.cumsum(np.bincount(self.dst, minlength=self.num_nodes), out=ptr[1:])
+        return ptr, order
+
+    def arc_cells(self, a):
+        """Arc id -> ((i, j), (k, l))"""
+        return self.cell(self.src[a]), self.cell(self.dst[a])
+
+    def path_arcs(self, arc_ids):
+        return [self.arc_cells(a) for a in arc_ids]
+
+    def to_dicts(self):
+        """
+        Same graph in the build_grid_graph form:
+        (nodes, arcs, dist, risk)
+        """
+        nodes = [(i, j) for i in range(self.n) for j in range(self.n)]
+        arcs = [(nodes[u], nodes[v]) for u, v in zip(self.src.tolist(), self.dst.tolist())]
+        dist = dict(zip(arcs, self.dist.tolist()))
+        risk = dict(zip(arcs, self.risk.tolist()))
+        return nodes, arcs, dist, risk
+
+
+def cell_mask(n, cells):
+    """Boolean n x n array from a set of (i, j) cells (or an existing mask)."""
+    if isinstance(cells, np.ndarray):
+        return cells.astype(bool, copy=False)
+
+    mask = np.zeros((n, n), dtype=bool)
+    if cells:
+        rows, cols = zip(*cells)
+        mask[list(rows), list(cols)] = True
+    return mask
+
+
+def build_grid_arrays(n, dangerous_cells=None, forbidden_cells=None, diagonal=False):
+    """
+    Array counterpart of build_grid_graph: same arcs, in the same order,
+    with the same distances and risks, returned as a GridGraph.
+    Cells can be given as sets of (i, j) or as boolean n x n arrays.
+    """
+
+    danger = cell_mask(n, dangerous_cells).ravel()
+    forbid = cell_mask(n, forbidden_cells).ravel()
+
+    directions = np.array(DIRECTIONS + DIAGONALS if diagonal else DIRECTIONS, dtype=np.int32)
+
+    # (n, n, directions) candidate targets, flattened in source-major order
+    rows = np.arange(n, dtype=np.int32)[:, None, None]
+    cols = np.arange(n, dtype=np.int32)[None, :, None]
+    ti = rows + directions[:, 0]
+    tj = cols + directions[:, 1]
+
+    inside = (ti >= 0) & (ti < n) & (tj >= 0) & (tj < n)
+    src = np.broadcast_to(rows * n + cols, inside.shape)[inside]
+    dst = (ti * n + tj)[inside]
+
+    keep = ~forbid[src] & ~forbid[dst]
+    src = src[keep].astype(np.int32)
+    dst = dst[keep].astype(np.int32)
+
+    # Risk according to the danger of both endpoints
+    src_danger = danger[src]
+    dst_danger = danger[dst]
+    risk = np.full(len(src), RISK_SAFE, dtype=np.float64)
+    risk[src_danger ^ dst_danger] = RISK_ONE_DANGEROUS
+    risk[src_danger & dst_danger] = RISK_BOTH_DANGEROUS
+
+    # Distances are uniform
+    dist = np.ones(len(src), dtype=np.float32)
+
+    return GridGraph(n, diagonal, src, dst, dist, risk)
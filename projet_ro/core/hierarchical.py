@@ -0,0 +1,124 @@
+import numpy as np
+
+from core.grid_builder import RISK_SAFE, RISK_ONE_DANGEROUS, RISK_BOTH_DANGEROUS
+from core.grid_graph import build_grid_arrays, cell_mask
+from core.fast_path import TieredSolver
+from core.label_setting import EPS, pareto_frontier
+
+
+def block_fractions(mask, block):
+    """Fraction of True cells in each block x block tile (grid padded with False)."""
+    n = mask.shape[0]
+    nb = -(-n // block)
+    padded = np.zeros((nb * block, nb * block), dtype=bool)
+    padded[:n, :n] = mask
+    return padded.reshape(nb, block, nb, block).mean(axis=(1, 3))
+
+
+def coarsen(n, dangerous, forbidden, diagonal, block):
+    """
+    Coarse GridGraph with one node per block x block tile.
+    A tile is forbidden when all its cells are (padding counts as
+    forbidden). Arc costs aggregate the cells of the two tiles:
+        dist = block * (1 + mean forbidden fraction)   (detours)
+        risk = block * expected risk of one step, with p = danger fraction
+               of the free cells of each tile
+    """
+
+    nb = -(-n // block)
+    padding = np.ones((nb * block, nb * block), dtype=bool)
+    padding[:n, :n] = forbidden
+    blocked = block_fractions(padding, block)
+
+    free_cells = np.maximum(1.0 - blocked, 1.0 / block ** 2)
+    p = np.clip(block_fractions(dangerous & ~forbidden, block) / free_cells, 0.0, 1.0)
+
+    graph = build_grid_arrays(nb, None, blocked >= 1.0, diagonal)
+
+    blocked, p = blocked.ravel(), p.ravel()
+    pu, pv = p[graph.src], p[graph.dst]
+    step_risk = (pu * pv * RISK_BOTH_DANGEROUS
+                 + (pu * (1 - pv) + pv * (1 - pu)) * RISK_ONE_DANGEROUS
+                 + (1 - pu) * (1 - pv) * RISK_SAFE)
+
+    graph.dist = (block * (1.0 + (blocked[graph.src] + blocked[graph.dst]) / 2)).astype(np.float32)
+    graph.risk = block * step_risk
+    return graph
+
+
+def coarse_path(graph, start_block, end_block, R_max):
+    """
+    Block path to refine: the shortest coarse path whose estimated risk
+    fits in R_max, or the least risky one when none does.
+    Returns the list of block indices along the path, or None.
+    """
+
+    out_ptr, out_order = graph.out_csr()
+    in_ptr, in_order = graph.in_csr()
+    s, t = graph.node_index(start_block), graph.node_index(end_block)
+
+    frontier = pareto_frontier(
+        graph.num_nodes, graph.src.tolist(), graph.dst.tolist(),
+        graph.dist.tolist(), graph.risk.tolist(), s, t,
+        out_csr=(out_ptr.tolist(), out_order.tolist()),
+        in_csr=(in_ptr.tolist(), in_order.tolist())
+    )
+    if not frontier:
+        return None
+
+    fitting = [point for point in frontier if point[1] <= R_max + EPS]
+    _, _, arc_ids = fitting[0] if fitting else frontier[-1]
+    return [s] + [int(graph.dst[a]) for a in arc_ids]
+
+
+def corridor_mask(n, blocks, nb, block, radius):
+    """Cells of the blocks on the coarse path, dilated by `radius` blocks."""
+    coarse = np.zeros((nb, nb), dtype=bool)
+    for b in blocks:
+        i, j = divmod(b, nb)
+        coarse[max(0, i - radius):i + radius + 1, max(0, j - radius):j + radius + 1] = True
+    return np.kron(coarse, np.ones((block, block), dtype=bool))[:n, :n]
+
+
+def solve_hierarchical(n, start, end, R_max, dangerous_cells=None, forbidden_cells=None,
+                       diagonal=False, block=10, radius=1):
+    """
+    Multi-resolution shortest path with risk constraint:
+        1) coarsen the grid into block x block tiles and solve there
+        2) solve exactly on the cells of a corridor around the coarse path
+        3) widen the corridor (doubling the radius) while it is infeasible;
+           past the whole grid this is the exact solve
+    Cells can be given as sets of (i, j) or as boolean n x n arrays;
+    block and radius must be at least 1 (ValueError otherwise).
+
+    Returns ((status, best_distance, total_risk, path_arcs), info) where
+    info records the coarse size, the radius used and the corridor size.
+    """
+
+    if block < 1 or radius < 1:
+        raise ValueError(f"block and radius must be >= 1 (got block={block!r}, radius={radius!r})")
+
+    dangerous = cell_mask(n, dangerous_cells)
+    forbidden = cell_mask(n, forbidden_cells)
+    nb = -(-n // block)
+    info = {"coarse_n": nb, "radius": None, "corridor_cells": n * n}
+
+    coarse = coarsen(n, dangerous, forbidden, diagonal, block)
+    start_block = (start[0] // block, start[1] // block)
+    end_block = (end[0] // block, end[1] // block)
+    blocks = coarse_path(coarse, start_block, end_block, R_max)
+
+    while blocks is not None and radius < nb:
+        corridor = corridor_mask(n, blocks, nb, block, radius)
+        graph = build_grid_arrays(n, dangerous, forbidden | ~corridor, diagonal)
+        status, d, r, arc_ids = TieredSolver(graph).solve(start, end, R_max)
+
+        if status == "optimal":
+            info.update(radius=radius, corridor_cells=int(corridor.sum()))
+            return (status, d, r, graph.path_arcs(arc_ids)), info
+        radius *= 2
+
+    # Corridor as large as the grid (or no coarse path): exact solve
+    graph = build_grid_arrays(n, dangerous, forbidden, diagonal)
+    status, d, r, arc_ids = TieredSolver(graph).solve(start, end, R_max)
+    return (status, d, r, graph.path_arcs(arc_ids)), info
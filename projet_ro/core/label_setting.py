@@ -0,0 +1,178 @@
+import heapq
+
+INF = float("inf")
+EPS = 1e-9
+
+
+def group_arcs(num_nodes, keys):
+    """
+    Group arc ids by node (counting sort, CSR layout).
+    Returns (ptr, order) such that order[ptr[v]:ptr[v+1]] are the ids
+    of the arcs whose key (source or target) is v.
+    """
+
+    ptr = [0] * (num_nodes + 1)
+    for k in keys:
+        ptr[k + 1] += 1
+    for v in range(num_nodes):
+        ptr[v + 1] += ptr[v]
+
+    fill = ptr[:-1]
+    order = [0] * len(keys)
+    for a, k in enumerate(keys):
+        order[fill[k]] = a
+        fill[k] += 1
+
+    return ptr, order
+
+
+def reverse_dijkstra(num_nodes, src, weight, in_ptr, in_order, target):
+    """
+    Smallest total weight from every node to `target`
+    (INF when the target cannot be reached).
+    """
+
+    best = [INF] * num_nodes
+    best[target] = 0.0
+    heap = [(0.0, target)]
+
+    while heap:
+        d, v = heapq.heappop(heap)
+        if d > best[v]:
+            continue
+        for p in range(in_ptr[v], in_ptr[v + 1]):
+            a = in_order[p]
+            u = src[a]
+            nd = d + weight[a]
+            if nd < best[u]:
+                best[u] = nd
+                heapq.heappush(heap, (nd, u))
+
+    return best
+
+
+def _trace(k, parent, arc):
+    """Arc ids from the root label to label k."""
+    path = []
+    while parent[k] != -1:
+        path.append(arc[k])
+        k = parent[k]
+    path.reverse()
+    return path
+
+
+def target_labels(num_nodes, src, dst, dist, risk, s, t, R_max=INF,
+                  lb_dist=None, lb_risk=None, out_csr=None, in_csr=None):
+    """
+    Bi-objective label setting from `s` to `t` on an indexed graph.
+
+    Labels (distance, risk) are expanded in order of distance + lower bound
+    to `t` (reverse Dijkstra bounds, so the order is consistent); a label is
+    dropped when a settled label of its node has no more risk, or when its
+    risk plus the smallest risk still needed exceeds R_max or the risk of
+    the last label settled at `t`.
+
+    Yields (distance, risk, arc_ids) for every Pareto-optimal path with
+    risk <= R_max, by increasing distance (so decreasing risk).
+
+    The (ptr, order) arc groupings by source and by target are computed
+    with group_arcs unless given through out_csr / in_csr.
+    """
+
+    if s == t:
+        yield 0.0, 0.0, []
+        return
+
+    if lb_dist is None or lb_risk is None:
+        in_ptr, in_order = in_csr or group_arcs(num_nodes, dst)
+        if lb_dist is None:
+            lb_dist = reverse_dijkstra(num_nodes, src, dist, in_ptr, in_order, t)
+        if lb_risk is None:
+            lb_risk = reverse_dijkstra(num_nodes, src, risk, in_ptr, in_order, t)
+
+    if lb_risk[s] > R_max + EPS or lb_dist[s] == INF:
+        return
+
+    out_ptr, out_order = out_csr or group_arcs(num_nodes, src)
+
+    # Labels are stored column-wise: node, distance, risk, parent label, arc
+    l_node, l_dist, l_risk, l_parent, l_arc = [s], [0.0], [0.0], [-1], [-1]
+    best_risk = [INF] * num_nodes
+    budget = R_max + EPS
+    heap = [(lb_dist[s], 0.0, 0)]
+
+    while heap:
+        _, r, k = heapq.heappop(heap)
+        v = l_node[k]
+
+        # Dominated by a settled label with less or equal distance
+        if r >= best_risk[v]:
+            continue
+        best_risk[v] = r
+
+        if v == t:
+            yield l_dist[k], l_risk[k], _trace(k, l_parent, l_arc)
+            # Later paths are longer: they must take strictly less risk
+            budget = min(budget, r - EPS)
+            continue
+
+        d = l_dist[k]
+        for p in range(out_ptr[v], out_ptr[v + 1]):
+            a = out_order[p]
+            w = dst[a]
+            nr = r + risk[a]
+            if nr >= best_risk[w] or nr + lb_risk[w] > budget:
+                continue
+            nd = d + dist[a]
+            l_node.append(w)
+            l_dist.append(nd)
+            l_risk.append(nr)
+            l_parent.append(k)
+            l_arc.append(a)
+            heapq.heappush(heap, (nd + lb_dist[w], nr, len(l_node) - 1))
+
+
+def label_setting(num_nodes, src, dst, dist, risk, s, t, R_max, **kwargs):
+    """
+    Exact resource-constrained shortest path on an indexed graph: the first
+    label settled at `t` by target_labels is optimal.
+    Returns (status, best_distance, total_risk, arc_ids)
+    """
+
+    for total_dist, total_risk, arc_ids in target_labels(
+            num_nodes, src, dst, dist, risk, s, t, R_max, **kwargs):
+        return "optimal", total_dist, total_risk, arc_ids
+
+    return "infeasible", None, None, []
+
+
+def pareto_frontier(num_nodes, src, dst, dist, risk, s, t, R_max=INF, **kwargs):
+    """
+    Every Pareto-optimal (distance, risk) path from `s` to `t`.
+    Returns a list of (distance, risk, arc_ids) by increasing distance.
+    """
+
+    return list(target_labels(num_nodes, src, dst, dist, risk, s, t, R_max, **kwargs))
+
+
+def solve_shortest_path_labels(nodes, arcs, dist, risk, start, end, R_max):
+    """
+    Label-setting counterpart of solve_shortest_path_with_risk on the
+    graph returned by build_grid_graph (no Gurobi needed).
+    Returns (status, best_distance, total_risk, path_arcs)
+    """
+
+    index = {v: k for k, v in enumerate(nodes)}
+    if start not in index or end not in index:
+        return "infeasible", None, None, []
+
+    src = [index[a[0]] for a in arcs]
+    dst = [index[a[1]] for a in arcs]
+
+    status, total_dist, total_risk, arc_ids = label_setting(
+        len(nodes), src, dst,
+        [dist[a] for a in arcs], [risk[a] for a in arcs],
+        index[start], index[end], R_max
+    )
+
+    return status, total_dist, total_risk, [arcs[a] for a in arc_ids]
@@ -0,0 +1,106 @@
+from gurobipy import GRB
+
+from core.grid_builder import build_grid_graph, build_adjacency, arc_risk
+from core.solver import build_shortest_path_model
+
+
+class PathPlanningSession:
+    """
+    Keeps one Gurobi path-planning model alive for an n x n grid.
+    The model holds every arc of the grid; each solve only applies the
+    changes since the previous one:
+        forbidden cells   -> upper bound 0 on their arcs
+        dangerous cells   -> risk coefficients of their arcs
+        start / end       -> flow constraint RHS
+        R_max             -> risk constraint RHS
+    and warm-starts from the previous path.
+    """
+
+    def __init__(self, n, diagonal=False):
+        self.n = n
+        self.diagonal = diagonal
+
+        self.nodes, self.arcs, self.dist, self.risk = build_grid_graph(n, diagonal=diagonal)
+        self.out_arcs, self.in_arcs = build_adjacency(self.nodes, self.arcs)
+
+        self.model, self.x, self.flow = build_shortest_path_model(
+            self.nodes, self.arcs, self.dist, self.risk,
+            start=None, end=None, R_max=GRB.INFINITY
+        )
+        self.model.update()
+        self.risk_limit = self.model.getConstrByName("risk_limit")
+
+        self.start = None
+        self.end = None
+        self.R_max = GRB.INFINITY
+        self.forbidden = set()
+        self.dangerous = set()
+        self.path = []
+
+    def incident_arcs(self, cell):
+        return self.out_arcs[cell] + self.in_arcs[cell]
+
+    def _set_endpoints(self, start, end):
+        for cell in (self.start, self.end):
+            if cell is not None:
+                self.flow[cell].RHS = 0
+        if end is not None:
+            self.flow[end].RHS = -1
+        if start is not None:
+            self.flow[start].RHS = 1
+        self.start, self.end = start, end
+
+    def _set_forbidden(self, forbidden):
+        changed = forbidden ^ self.forbidden
+        self.forbidden = set(forbidden)
+
+        for cell in changed:
+            for k in self.incident_arcs(cell):
+                u, v = self.arcs[k]
+                blocked = u in self.forbidden or v in self.forbidden
+                self.x[self.arcs[k]].UB = 0 if blocked else 1
+
+    def _set_dangerous(self, dangerous):
+        changed = dangerous ^ self.dangerous
+        self.dangerous = set(dangerous)
+
+        for cell in changed:
+            for k in self.incident_arcs(cell):
+                a = self.arcs[k]
+                self.risk[a] = arc_risk(a[0] in self.dangerous, a[1] in self.dangerous)
+                self.model.chgCoeff(self.risk_limit, self.x[a], self.risk[a])
+
+    def solve(self, start, end, R_max, forbidden=(), dangerous=()):
+        """
+        Apply the changes and re-solve.
+        Returns (status, best_distance, total_risk, path_arcs)
+        """
+
+        self._set_endpoints(start, end)
+        self._set_forbidden(set(forbidden))
+        self._set_dangerous(set(dangerous))
+        if R_max != self.R_max:
+            self.risk_limit.RHS = R_max
+            self.R_max = R_max
+
+        # Warm start from the previous path (Gurobi drops it if infeasible)
+        if self.path:
+            on_path = set(self.path)
+            self.model.setAttr("Start", list(self.x.values()),
+                               [1.0 if a in on_path else 0.0 for a in self.x.keys()])
+
+        self.model.optimize()
+
+        if self.model.status != GRB.OPTIMAL:
+            self.path = []
+            return "infeasible", None, None, []
+
+        self.path = [a for a in self.arcs if self.x[a].X > 0.5]
+
+        total_dist = sum(self.dist[a] for a in self.path)
+        total_risk = sum(self.risk[a] for a in self.path)
+
+        return "optimal", total_dist, total_risk, list(self.path)
+
+    def dispose(self):
+        self.model.dispose()
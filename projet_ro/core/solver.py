@@ -1,42 +1,161 @@
-import gurobipy as gp
-from gurobipy import GRB
+try:
+    import gurobipy as gp
+    from gurobipy import GRB
+except ImportError:  # the label-setting backend does not need Gurobi
+    gp = None
 
-def solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, R_max):
+from core.grid_builder import build_adjacency
+from core.label_setting import label_setting, solve_shortest_path_labels
+
+BACKENDS = ("gurobi", "labels")
+
+
+def build_shortest_path_model(nodes, arcs, dist, risk, start, end, R_max):
     """
-    Solve shortest path with risk constraint using Gurobi.
-    Returns (status, best_distance, total_risk, path_arcs)
+    Build the shortest path with risk constraint model without solving it.
+    The node-arc incidence is indexed once, so construction is O(|V| + |A|).
+    Returns (model, x, flow) where x[a] is the arc variable and flow[i]
+    the conservation constraint of node i (out - in == rhs).
     """
 
     m = gp.Model("grid_shortest_path")
 
     # Variables x[a] ∈ {0,1}
     x = m.addVars(arcs, vtype=GRB.BINARY, name="x")
+    xs = [x[a] for a in arcs]
 
     # Objective: minimize total distance
     m.setObjective(
-        gp.quicksum(dist[a] * x[a] for a in arcs),
+        gp.LinExpr([dist[a] for a in arcs], xs),
         GRB.MINIMIZE
     )
 
     # Risk constraint
     m.addConstr(
-        gp.quicksum(risk[a] * x[a] for a in arcs) <= R_max,
+        gp.LinExpr([risk[a] for a in arcs], xs) <= R_max,
         "risk_limit"
     )
 
-    # Flow constraints
-    for i in nodes:
-        out_i = gp.quicksum(x[a] for a in arcs if a[0] == i)
-        in_i  = gp.quicksum(x[a] for a in arcs if a[1] == i)
+    # Flow constraints: out - in = 1 at start, -1 at end, 0 elsewhere
+    out_arcs, in_arcs = build_adjacency(nodes, arcs)
+
+    def flow_expr(i):
+        out_i, in_i = out_arcs[i], in_arcs[i]
+        return gp.LinExpr(
+            [1.0] * len(out_i) + [-1.0] * len(in_i),
+            [xs[k] for k in out_i] + [xs[k] for k in in_i]
+        )
 
+    def flow_rhs(i):
         if i == start:
-            m.addConstr(out_i - in_i == 1, name=f"flow_start_{i}")
-        elif i == end:
-            m.addConstr(in_i - out_i == 1, name=f"flow_end_{i}")
-        else:
-            m.addConstr(out_i - in_i == 0, name=f"flow_mid_{i}")
+            return 1
+        if i == end:
+            return -1
+        return 0
+
+    flow = m.addConstrs(
+        (flow_expr(i) == flow_rhs(i) for i in nodes),
+        name="flow"
+    )
+
+    return m, x, flow
+
+
+def find_subtours(path_arcs, start):
+    """
+    Node sets of the cycles in `path_arcs` that are not connected to the
+    path leaving `start` (empty list for a simple path).
+    """
+
+    succ = {}
+    for u, v in path_arcs:
+        succ.setdefault(u, []).append(v)
+        succ.setdefault(v, [])
+
+    # Everything reachable from start belongs to the path
+    seen = {start}
+    stack = [start]
+    while stack:
+        for v in succ.get(stack.pop(), []):
+            if v not in seen:
+                seen.add(v)
+                stack.append(v)
+
+    # Remaining arcs form cycles: group them by weak connectivity
+    neighbours = {}
+    for u, v in path_arcs:
+        if u not in seen:
+            neighbours.setdefault(u, set()).add(v)
+            neighbours.setdefault(v, set()).add(u)
+
+    subtours = []
+    for node in neighbours:
+        if node in seen:
+            continue
+        component = {node}
+        stack = [node]
+        while stack:
+            for v in neighbours[stack.pop()]:
+                if v not in component:
+                    component.add(v)
+                    stack.append(v)
+        seen |= component
+        subtours.append(component)
+
+    return subtours
+
+
+def add_cycle_elimination(m, x, nodes, arcs, start):
+    """
+    Lazy subtour elimination: every integer incumbent is checked with
+    find_subtours, and each cycle on node set S is cut off with
+        sum(x[a] for arcs a inside S) <= |S| - 1
+    Returns the callback to pass to m.optimize; m._cuts counts the cuts.
+    """
 
-    m.optimize()
+    m.Params.LazyConstraints = 1
+    out_arcs, _ = build_adjacency(nodes, arcs)
+    xs = [x[a] for a in arcs]
+    m._cuts = 0
+
+    def callback(model, where):
+        if where != GRB.Callback.MIPSOL:
+            return
+
+        values = model.cbGetSolution(xs)
+        chosen = [a for a, v in zip(arcs, values) if v > 0.5]
+
+        for subtour in find_subtours(chosen, start):
+            inside = [xs[k] for i in subtour for k in out_arcs[i] if arcs[k][1] in subtour]
+            model.cbLazy(gp.quicksum(inside) <= len(subtour) - 1)
+            model._cuts += 1
+
+    return callback
+
+
+def solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, R_max,
+                                  backend="gurobi", eliminate_cycles=False):
+    """
+    Solve shortest path with risk constraint.
+    backend: "gurobi" (MILP) or "labels" (exact label-setting, no Gurobi)
+    eliminate_cycles: with Gurobi, cut off cycles detached from the path
+    lazily so the returned arcs always form a simple path
+    Returns (status, best_distance, total_risk, path_arcs)
+    """
+
+    if backend == "labels":
+        return solve_shortest_path_labels(nodes, arcs, dist, risk, start, end, R_max)
+    if backend != "gurobi":
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+    if gp is None:
+        raise ImportError("gurobipy is required for the 'gurobi' backend")
+
+    m, x, _ = build_shortest_path_model(nodes, arcs, dist, risk, start, end, R_max)
+
+    if eliminate_cycles:
+        m.optimize(add_cycle_elimination(m, x, nodes, arcs, start))
+    else:
+        m.optimize()
 
     if m.status != GRB.OPTIMAL:
         return "infeasible", None, None, []
@@ -44,7 +163,37 @@ def solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, R_max):
     # Extract solution
     solution_arcs = [a for a in arcs if x[a].X > 0.5]
 
-    total_dist = sum(dist[a] * x[a].X for a in arcs)
-    total_risk = sum(risk[a] * x[a].X for a in arcs)
+    total_dist = sum(dist[a] for a in solution_arcs)
+    total_risk = sum(risk[a] for a in solution_arcs)
 
     return "optimal", total_dist, total_risk, solution_arcs
+
+
+def solve_grid_graph(graph, start, end, R_max, backend="labels"):
+    """
+    Solve shortest path with risk constraint on a GridGraph.
+    Returns (status, best_distance, total_risk, arc_ids); graph.path_arcs
+    turns the arc ids into ((i,j),(k,l)) tuples.
+    """
+
+    if backend == "gurobi":
+        nodes, arcs, dist, risk = graph.to_dicts()
+        status, total_dist, total_risk, path = solve_shortest_path_with_risk(
+            nodes, arcs, dist, risk, start, end, R_max, backend="gurobi"
+        )
+        index = {a: k for k, a in enumerate(arcs)}
+        return status, total_dist, total_risk, [index[a] for a in path]
+
+    if backend != "labels":
+        raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+
+    out_ptr, out_order = graph.out_csr()
+    in_ptr, in_order = graph.in_csr()
+
+    return label_setting(
+        graph.num_nodes, graph.src.tolist(), graph.dst.tolist(),
+        graph.dist.tolist(), graph.risk.tolist(),
+        graph.node_index(start), graph.node_index(end), R_max,
+        out_csr=(out_ptr.tolist(), out_order.tolist()),
+        in_csr=(in_ptr.tolist(), in_order.tolist())
+    )
@@ -0,0 +1,152 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+
+import pytest
+
+from core.grid_builder import build_grid_graph
+from core.grid_graph import build_grid_arrays
+from core.solver import solve_grid_graph, solve_shortest_path_with_risk
+
+
+def random_cells(n, seed):
+    rng = random.Random(seed)
+    danger = {(rng.randrange(n), rng.randrange(n)) for _ in range(3 * n)}
+    forbid = {(rng.randrange(n), rng.randrange(n)) for _ in range(n)} - {(0, 0), (n - 1, n - 1)}
+    return danger, forbid
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_arrays_match_dict_form(diagonal):
+    n = 12
+    danger, forbid = random_cells(n, 0)
+    nodes, arcs, dist, risk = build_grid_graph(n, danger, forbid, diagonal)
+    graph = build_grid_arrays(n, danger, forbid, diagonal)
+
+    nodes2, arcs2, dist2, risk2 = graph.to_dicts()
+    assert nodes2 == nodes
+    assert arcs2 == arcs
+    assert dist2 == dist
+    assert risk2 == risk
+
+    # CSR: arcs leaving each node are contiguous
+    for v in (0, n + 1, n * n - 1):
+        leaving = graph.path_arcs(range(graph.indptr[v], graph.indptr[v + 1]))
+        assert leaving == [a for a in arcs if a[0] == graph.cell(v)]
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(3))
+def test_solve_grid_graph_matches_dict_form(seed, diagonal):
+    n = 15
+    danger, forbid = random_cells(n, seed)
+    nodes, arcs, dist, risk = build_grid_graph(n, danger, forbid, diagonal)
+    graph = build_grid_arrays(n, danger, forbid, diagonal)
+
+    for R_max in (0.8, 1.6, 2.4, 5.0):
+        status, d, r, arc_ids = solve_grid_graph(graph, (0, 0), (n - 1, n - 1), R_max)
+        expected = solve_shortest_path_with_risk(
+            nodes, arcs, dist, risk, (0, 0), (n - 1, n - 1), R_max, backend="labels"
+        )
+        assert status == expected[0]
+        if status == "optimal":
+            assert (d, r) == expected[1:3]
+            assert graph.path_arcs(arc_ids) == expected[3]
+
+
+def test_risk_exactly_at_budget_is_feasible():
+    from core.fast_path import TieredSolver
+    from core.frontier import FrontierCache
+
+    # Only path: row 0, through 3 dangerous cells, risk 0.4 + 0.8 + 0.8 + 0.4 = 2.4
+    n = 5
+    forbid = {(1, j) for j in range(n)}
+    danger = {(0, 1), (0, 2), (0, 3)}
+    nodes, arcs, dist, risk = build_grid_graph(n, danger, forbid)
+    graph = build_grid_arrays(n, danger, forbid)
+    start, end = (0, 0), (0, 4)
+
+    expected = solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, 2.4, backend="labels")
+    assert expected[:3] == ("optimal", 4.0, 2.4)
+    results = [
+        solve_grid_graph(graph, start, end, 2.4),
+        TieredSolver(graph).solve(start, end, 2.4),
+        FrontierCache().query(n, False, forbid, danger, start, end, 2.4),
+    ]
+    for status, d, r, _ in results:
+        assert (status, d, r) == expected[:3]
+    assert solve_grid_graph(graph, start, end, 2.3)[0] == "infeasible"
+
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_solve_batch_matches_single_queries(processes):
+    from core.batch import solve_batch
+
+    n = 15
+    danger, forbid = random_cells(n, 7)
+    graph = build_grid_arrays(n, danger, forbid, diagonal=True)
+
+    rng = random.Random(7)
+    free = [(i, j) for i in range(n) for j in range(n) if (i, j) not in forbid]
+    queries = [(rng.choice(free), rng.choice(free), rng.choice([0.5, 1.0, 3.0])) for _ in range(20)]
+
+    results = dict(solve_batch(graph, queries, processes=processes, landmarks=4))
+
+    assert sorted(results) == list(range(len(queries)))
+    for index, query in enumerate(queries):
+        expected = solve_grid_graph(graph, *query)
+        assert results[index][:2] == expected[:2]
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_tiered_solver_matches_exact(diagonal):
+    from core.fast_path import TieredSolver
+
+    n = 15
+    danger, forbid = random_cells(n, 11)
+    graph = build_grid_arrays(n, danger, forbid, diagonal)
+    solver = TieredSolver(graph)
+
+    budgets = [0.4, 0.8, 1.2, 2.0, 2.4, 100.0]
+    for R_max in budgets:
+        status, d, r, arc_ids = solver.solve((0, 0), (n - 1, n - 1), R_max)
+        expected = solve_grid_graph(graph, (0, 0), (n - 1, n - 1), R_max)
+        assert status == expected[0]
+        if status == "optimal":
+            assert d == expected[1]
+            assert r <= R_max + 1e-9
+
+    assert sum(solver.counters.values()) == len(budgets)
+    assert solver.counters["astar"] >= 1
+
+
+def test_hierarchical_is_feasible_and_bounded_by_exact():
+    from core.hierarchical import solve_hierarchical
+
+    n = 40
+    danger, forbid = random_cells(n, 3)
+    graph = build_grid_arrays(n, danger, forbid, diagonal=True)
+
+    for R_max in (1.0, 5.0):
+        (status, d, r, path), info = solve_hierarchical(
+            n, (0, 0), (n - 1, n - 1), R_max, danger, forbid, diagonal=True, block=5
+        )
+        exact = solve_grid_graph(graph, (0, 0), (n - 1, n - 1), R_max)
+
+        assert status == exact[0]
+        if status == "optimal":
+            assert d >= exact[1]
+            assert r <= R_max + 1e-9
+            assert path[0][0] == (0, 0) and path[-1][1] == (n - 1, n - 1)
+            assert all(a[1] == b[0] for a, b in zip(path, path[1:]))
+            assert not any(a[1] in forbid for a in path)
+        assert info["coarse_n"] == 8
+
+
+@pytest.mark.parametrize("block, radius", [(5, 0), (5, -1), (0, 1), (-2, 1)])
+def test_hierarchical_rejects_bad_block_or_radius(block, radius):
+    from core.hierarchical import solve_hierarchical
+
+    with pytest.raises(ValueError):
+        solve_hierarchical(10, (0, 0), (9, 9), 1.0, block=block, radius=radius)
@@ -0,0 +1,118 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import pytest
+
+pytest.importorskip("PyQt5")
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QStyleOptionGraphicsItem
+
+from core.grid_graph import build_grid_arrays
+from core.solver import solve_grid_graph
+from ui.grid_view import (
+    CELL_SIZE, COLORS, DANGEROUS, END, FORBIDDEN, FREE, PATH, START, GridView
+)
+
+
+@pytest.fixture
+def view():
+    app = QApplication.instance() or QApplication([])
+    widget = GridView(6)
+    widget.resize(400, 400)
+    yield widget
+    widget.deleteLater()
+    app.processEvents()
+
+
+def image_color(item, cell):
+    """Colour of a cell in the backing image (one pixel per cell)"""
+    if item.dirty:
+        item.refresh_image()
+    i, j = cell
+    return QColor(item.image.pixel(j, i))
+
+
+def paint_exposed(item, rect):
+    """Paint the item into a magenta canvas with only `rect` exposed"""
+    canvas = QImage(item.n * CELL_SIZE, item.n * CELL_SIZE, QImage.Format_RGB32)
+    canvas.fill(QColor("magenta"))
+    option = QStyleOptionGraphicsItem()
+    option.exposedRect = rect
+    painter = QPainter(canvas)
+    item.paint(painter, option)
+    painter.end()
+    return canvas
+
+
+def test_set_cell_reaches_the_image(view):
+    item = view.item
+    for cell, state in (((0, 0), START), ((5, 5), END), ((2, 3), FORBIDDEN), ((4, 1), DANGEROUS)):
+        item.set_cell(cell, state)
+        assert item.dirty
+        assert image_color(item, cell) == COLORS[state]
+    assert image_color(item, (1, 1)) == COLORS[FREE]
+
+    item.set_cell((2, 3), FREE)
+    assert image_color(item, (2, 3)) == COLORS[FREE]
+
+
+def test_set_cell_updates_only_its_rect(view, monkeypatch):
+    item = view.item
+    updated = []
+    monkeypatch.setattr(item, "update", lambda *rect: updated.append(rect))
+    item.set_cell((3, 4), FORBIDDEN)
+    assert updated == [(item.cell_rect(3, 4),)]
+
+    # Painting that rect redraws the cell and leaves the rest of the canvas alone
+    canvas = paint_exposed(item, item.cell_rect(3, 4))
+    inside = 4 * CELL_SIZE + CELL_SIZE // 2, 3 * CELL_SIZE + CELL_SIZE // 2
+    assert QColor(canvas.pixel(*inside)) == COLORS[FORBIDDEN]
+    assert QColor(canvas.pixel(CELL_SIZE // 2, CELL_SIZE // 2)) == QColor("magenta")
+    assert QColor(canvas.pixel(6 * CELL_SIZE - 2, 6 * CELL_SIZE - 2)) == QColor("magenta")
+
+
+def test_color_path_with_tuple_arcs(view):
+    view.item.set_cell((0, 0), START)
+    view.item.set_cell((1, 2), END)
+    view.color_path([((0, 0), (0, 1)), ((0, 1), (1, 1)), ((1, 1), (1, 2))])
+
+    assert view.item.path.sum() == 4
+    assert image_color(view.item, (0, 1)) == COLORS[PATH]
+    assert image_color(view.item, (1, 1)) == COLORS[PATH]
+    # Start and end keep their colours under the path
+    assert image_color(view.item, (0, 0)) == COLORS[START]
+    assert image_color(view.item, (1, 2)) == COLORS[END]
+    assert image_color(view.item, (2, 2)) == COLORS[FREE]
+
+
+def test_color_path_with_graph_arc_ids(view):
+    n = view.n
+    forbid = {(2, j) for j in range(n - 1)}
+    graph = build_grid_arrays(n, set(), forbid)
+    start, end = (0, 0), (n - 1, 0)
+    view.item.set_cell(start, START)
+    view.item.set_cell(end, END)
+    status, _, _, arc_ids = solve_grid_graph(graph, start, end, 10.0)
+    assert status == "optimal"
+
+    view.color_path(arc_ids, graph)
+    cells = {c for arc in graph.path_arcs(arc_ids) for c in arc}
+    assert {tuple(c) for c in zip(*view.item.path.nonzero())} == cells
+    assert image_color(view.item, start) == COLORS[START]
+    assert image_color(view.item, end) == COLORS[END]
+    assert image_color(view.item, (2, n - 1)) == COLORS[PATH]
+
+    # A new path replaces the previous one
+    view.color_path([((0, 0), (0, 1))])
+    assert view.item.path.sum() == 2
+    assert image_color(view.item, (2, n - 1)) == COLORS[FREE]
+
+
+def test_view_paints_the_cells(view):
+    view.item.set_cell((0, 0), START)
+    view.fitInView(view.item.boundingRect(), Qt.KeepAspectRatio)
+    image = view.grab().toImage()
+    center = view.mapFromScene(QRectF(view.item.cell_rect(0, 0)).center())
+    assert QColor(image.pixel(center)) == COLORS[START]
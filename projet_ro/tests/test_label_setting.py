@@ -0,0 +1,110 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+
+import pytest
+
+from core.grid_builder import build_grid_graph
+from core.solver import solve_shortest_path_with_risk
+
+
+def random_grid(n, seed, diagonal=False):
+    rng = random.Random(seed)
+    cells = [(i, j) for i in range(n) for j in range(n) if (i, j) not in {(0, 0), (n - 1, n - 1)}]
+    forbid = set(rng.sample(cells, n))
+    danger = set(rng.sample([c for c in cells if c not in forbid], 2 * n))
+    return build_grid_graph(n, danger, forbid, diagonal=diagonal)
+
+
+def check_path(path, start, end, risk, total_risk):
+    # Consecutive arcs from start to end, no repeated node
+    assert path[0][0] == start and path[-1][1] == end
+    assert all(a[1] == b[0] for a, b in zip(path, path[1:]))
+    visited = [a[0] for a in path] + [end]
+    assert len(set(visited)) == len(visited)
+    assert sum(risk[a] for a in path) == pytest.approx(total_risk)
+
+
+def test_labels_console_example():
+    nodes, arcs, dist, risk = build_grid_graph(5, {(1, 1), (2, 3)}, {(0, 2), (3, 1)})
+
+    status, d, r, path = solve_shortest_path_with_risk(
+        nodes, arcs, dist, risk, (0, 0), (4, 4), 3.0, backend="labels"
+    )
+
+    assert status == "optimal"
+    assert d == 8.0
+    assert r <= 3.0
+    check_path(path, (0, 0), (4, 4), risk, r)
+
+
+def test_labels_infeasible_budget():
+    # Every route has to cross the dangerous column
+    n = 5
+    danger = {(i, 2) for i in range(n)}
+    nodes, arcs, dist, risk = build_grid_graph(n, danger)
+
+    status, d, r, path = solve_shortest_path_with_risk(
+        nodes, arcs, dist, risk, (0, 0), (0, 4), 0.5, backend="labels"
+    )
+    assert (status, d, r, path) == ("infeasible", None, None, [])
+
+    status, d, r, path = solve_shortest_path_with_risk(
+        nodes, arcs, dist, risk, (0, 0), (0, 4), 0.9, backend="labels"
+    )
+    assert status == "optimal" and d == 4.0
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+@pytest.mark.parametrize("seed", range(4))
+def test_labels_match_milp(seed, diagonal):
+    pytest.importorskip("gurobipy")
+    n = 7
+    nodes, arcs, dist, risk = random_grid(n, seed, diagonal)
+
+    for R_max in (0.5, 1.0, 2.0, 10.0):
+        args = (nodes, arcs, dist, risk, (0, 0), (n - 1, n - 1), R_max)
+        milp = solve_shortest_path_with_risk(*args, backend="gurobi")
+        labels = solve_shortest_path_with_risk(*args, backend="labels")
+
+        assert labels[0] == milp[0]
+        if milp[0] == "optimal":
+            assert labels[1] == pytest.approx(milp[1])
+            assert labels[2] <= R_max + 1e-9
+            check_path(labels[3], (0, 0), (n - 1, n - 1), risk, labels[2])
+
+
+def test_unknown_backend():
+    nodes, arcs, dist, risk = build_grid_graph(3)
+    with pytest.raises(ValueError):
+        solve_shortest_path_with_risk(nodes, arcs, dist, risk, (0, 0), (2, 2), 1.0, backend="foo")
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_frontier_lookup_matches_solves(diagonal):
+    from core.frontier import FrontierCache
+
+    n = 12
+    rng = random.Random(5)
+    danger = {(rng.randrange(n), rng.randrange(n)) for _ in range(4 * n)}
+    forbid = {(rng.randrange(n), rng.randrange(n)) for _ in range(n)} - {(0, 0), (n - 1, n - 1)}
+    nodes, arcs, dist, risk = build_grid_graph(n, danger, forbid, diagonal)
+
+    cache = FrontierCache()
+    frontier = cache.frontier(n, diagonal, forbid, danger, (0, 0), (n - 1, n - 1))
+
+    # Strictly increasing distance, strictly decreasing risk
+    assert all(a[0] < b[0] and a[1] > b[1] for a, b in zip(frontier, frontier[1:]))
+
+    for R_max in [0.0, 0.3, 0.8, 1.2, 2.0, 3.5, 5.0, 100.0]:
+        status, d, r, path = cache.query(n, diagonal, forbid, danger, (0, 0), (n - 1, n - 1), R_max)
+        expected = solve_shortest_path_with_risk(
+            nodes, arcs, dist, risk, (0, 0), (n - 1, n - 1), R_max, backend="labels"
+        )
+        assert status == expected[0]
+        if status == "optimal":
+            assert d == expected[1]
+            check_path(path, (0, 0), (n - 1, n - 1), risk, r)
+
+    assert cache.misses == 1
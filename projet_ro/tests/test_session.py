@@ -0,0 +1,39 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+
+from core.grid_builder import build_grid_graph
+from core.solver import solve_shortest_path_with_risk
+from core.session import PathPlanningSession
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_session_matches_cold_solves(diagonal):
+    n = 8
+    session = PathPlanningSession(n, diagonal)
+
+    # Successive GUI edits: add cells, move the end, change R_max, remove cells
+    steps = [
+        ((0, 0), (7, 7), 4.0, set(), set()),
+        ((0, 0), (7, 7), 4.0, {(1, 1), (2, 2)}, set()),
+        ((0, 0), (7, 7), 4.0, {(1, 1), (2, 2)}, {(3, 3), (3, 4), (4, 3)}),
+        ((0, 0), (5, 7), 1.0, {(1, 1), (2, 2)}, {(3, 3), (3, 4), (4, 3)}),
+        ((0, 0), (5, 7), 0.1, {(1, 1), (2, 2)}, {(i, 5) for i in range(n)}),
+        ((0, 0), (5, 7), 1.0, {(2, 2)}, {(3, 3)}),
+    ]
+
+    for start, end, R_max, forbidden, dangerous in steps:
+        nodes, arcs, dist, risk = build_grid_graph(n, dangerous, forbidden, diagonal)
+        cold = solve_shortest_path_with_risk(nodes, arcs, dist, risk, start, end, R_max)
+        warm = session.solve(start, end, R_max, forbidden, dangerous)
+
+        assert warm[0] == cold[0]
+        if cold[0] == "optimal":
+            assert warm[1] == pytest.approx(cold[1])
+            assert warm[2] <= R_max + 1e-6
+            assert all(a[0] not in forbidden and a[1] not in forbidden for a in warm[3])
+
+    session.dispose()
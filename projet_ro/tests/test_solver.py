@@ -0,0 +1,39 @@
+import sys, os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import pytest
+
+from core.grid_builder import build_grid_graph
+from core.solver import find_subtours, solve_shortest_path_with_risk
+
+
+def test_find_subtours():
+    path = [((0, 0), (0, 1)), ((0, 1), (1, 1))]
+    assert find_subtours(path, (0, 0)) == []
+
+    cycle = [((3, 3), (3, 4)), ((3, 4), (4, 4)), ((4, 4), (4, 3)), ((4, 3), (3, 3))]
+    two_cycle = [((6, 6), (6, 7)), ((6, 7), (6, 6))]
+    subtours = find_subtours(path + cycle + two_cycle, (0, 0))
+
+    assert sorted(map(sorted, subtours)) == [
+        [(3, 3), (3, 4), (4, 3), (4, 4)],
+        [(6, 6), (6, 7)],
+    ]
+
+
+@pytest.mark.parametrize("diagonal", [False, True])
+def test_cycle_elimination_keeps_optimum(diagonal):
+    pytest.importorskip("gurobipy")
+    n = 8
+    danger = {(i, 3) for i in range(n - 1)} | {(2, j) for j in range(n)}
+    nodes, arcs, dist, risk = build_grid_graph(n, danger, {(4, 4), (5, 5)}, diagonal)
+
+    for R_max in (0.5, 1.0, 2.0):
+        args = (nodes, arcs, dist, risk, (0, 0), (n - 1, n - 1), R_max)
+        plain = solve_shortest_path_with_risk(*args)
+        lazy = solve_shortest_path_with_risk(*args, eliminate_cycles=True)
+
+        assert lazy[0] == plain[0]
+        if plain[0] == "optimal":
+            assert lazy[1] == pytest.approx(plain[1])
+            assert find_subtours(lazy[3], (0, 0)) == []
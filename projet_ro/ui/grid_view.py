@@ -1,9 +1,109 @@
-from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsRectItem
-from PyQt5.QtGui import QBrush, QColor
-from PyQt5.QtCore import QRectF, Qt
+import numpy as np
+
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QColor, QImage, QPen, QPainter
+from PyQt5.QtCore import QRectF, QLineF, Qt
 
 CELL_SIZE = 40
 
+# Etats des cases (valeurs du tableau GridItem.state)
+FREE = 0
+FORBIDDEN = 1
+DANGEROUS = 2
+START = 3
+END = 4
+PATH = 5
+
+COLORS = {
+    FREE: QColor(Qt.white),
+    FORBIDDEN: QColor(Qt.black),
+    DANGEROUS: QColor("orange"),
+    START: QColor("green"),
+    END: QColor("blue"),
+    PATH: QColor(150, 255, 150),
+}
+
+# En dessous de cette taille à l'écran (pixels), le quadrillage n'est plus dessiné
+MIN_GRID_LINES_PX = 6
+
+
+class GridItem(QGraphicsItem):
+    """
+    Toute la grille dans un seul item : les états des cases sont dans un
+    tableau NumPy (n x n), convertis en image (une couleur par case) et
+    seule la partie exposée est peinte.
+    """
+
+    def __init__(self, n):
+        super().__init__()
+        self.n = n
+        self.state = np.full((n, n), FREE, dtype=np.uint8)
+        self.path = np.zeros((n, n), dtype=bool)
+
+        self.lut = np.array([COLORS[s].rgb() for s in sorted(COLORS)], dtype=np.uint32)
+        self.pixels = None
+        self.image = None
+        self.dirty = True
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.n * CELL_SIZE, self.n * CELL_SIZE)
+
+    def cell_rect(self, i, j):
+        return QRectF(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
+
+    def set_cell(self, cell, value):
+        i, j = cell
+        self.state[i, j] = value
+        self.dirty = True
+        self.update(self.cell_rect(i, j))
+
+    def set_path(self, rows, cols):
+        """Remplace le chemin affiché (indices des cases)"""
+        self.path[:] = False
+        self.path[rows, cols] = True
+        self.dirty = True
+        self.update()
+
+    def refresh_image(self):
+        """Une couleur par case; le chemin passe au-dessus sauf start/end"""
+        display = self.state.copy()
+        display[self.path & (display != START) & (display != END)] = PATH
+        self.pixels = np.ascontiguousarray(self.lut[display])
+        self.image = QImage(self.pixels.data, self.n, self.n, 4 * self.n, QImage.Format_RGB32)
+        self.dirty = False
+
+    def paint(self, painter, option, widget=None):
+        if self.dirty:
+            self.refresh_image()
+
+        # Cases exposées seulement
+        exposed = option.exposedRect.intersected(self.boundingRect())
+        r0 = max(0, int(exposed.top() // CELL_SIZE))
+        c0 = max(0, int(exposed.left() // CELL_SIZE))
+        r1 = min(self.n, int(exposed.bottom() // CELL_SIZE) + 1)
+        c1 = min(self.n, int(exposed.right() // CELL_SIZE) + 1)
+        if r0 >= r1 or c0 >= c1:
+            return
+
+        target = QRectF(c0 * CELL_SIZE, r0 * CELL_SIZE, (c1 - c0) * CELL_SIZE, (r1 - r0) * CELL_SIZE)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform, False)
+        painter.drawImage(target, self.image, QRectF(c0, r0, c1 - c0, r1 - r0))
+
+        # Niveau de détail : quadrillage seulement si les cases sont assez grandes
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if lod * CELL_SIZE < MIN_GRID_LINES_PX:
+            return
+
+        painter.setPen(QPen(Qt.black, 0))
+        lines = [QLineF(c0 * CELL_SIZE, r * CELL_SIZE, c1 * CELL_SIZE, r * CELL_SIZE)
+                 for r in range(r0, r1 + 1)]
+        lines += [QLineF(c * CELL_SIZE, r0 * CELL_SIZE, c * CELL_SIZE, r1 * CELL_SIZE)
+                  for c in range(c0, c1 + 1)]
+        painter.drawLines(lines)
+
+
 class GridView(QGraphicsView):
 
     MODE_NORMAL = 0
@@ -12,6 +112,8 @@ class GridView(QGraphicsView):
     MODE_FORBIDDEN = 3
     MODE_DANGEROUS = 4
 
+    ZOOM_STEP = 1.25
+
     def __init__(self, n=10,diagonal=False):
         super().__init__()
         self.n = n
@@ -26,29 +128,45 @@ class GridView(QGraphicsView):
         self.scene = QGraphicsScene()
         self.setScene(self.scene)
 
-        self.cells = {}
+        # Zoom autour du curseur, déplacement avec le bouton droit
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
+        self.pan_origin = None
+
+        self.item = None
         self.draw_grid()
 
     def draw_grid(self):
         self.scene.clear()
-        self.cells = {}
-
-        for i in range(self.n):
-            for j in range(self.n):
-                rect = QGraphicsRectItem(
-                    QRectF(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                )
-                rect.setPen(Qt.black)
-                rect.setBrush(QBrush(Qt.white))
-
-                rect.setData(0, (i, j))  # store coordinates
-                self.scene.addItem(rect)
-                self.cells[(i, j)] = rect
+        self.item = GridItem(self.n)
+        self.scene.addItem(self.item)
+        self.scene.setSceneRect(self.item.boundingRect())
 
     def set_mode(self, mode):
         self.mode = mode
 
+    def wheelEvent(self, event):
+        factor = self.ZOOM_STEP if event.angleDelta().y() > 0 else 1 / self.ZOOM_STEP
+        self.scale(factor, factor)
+
+    def mouseMoveEvent(self, event):
+        if self.pan_origin is not None:
+            delta = event.pos() - self.pan_origin
+            self.pan_origin = event.pos()
+            self.horizontalScrollBar().setValue(self.horizontalScrollBar().value() - delta.x())
+            self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if event.button() == Qt.RightButton:
+            self.pan_origin = None
+        super().mouseReleaseEvent(event)
+
     def mousePressEvent(self, event):
+        if event.button() == Qt.RightButton:
+            self.pan_origin = event.pos()
+            return
+
         pos = self.mapToScene(event.pos())
         x = int(pos.y() // CELL_SIZE)
         y = int(pos.x() // CELL_SIZE)
@@ -60,28 +178,35 @@ class GridView(QGraphicsView):
 
         if self.mode == GridView.MODE_START:
             if self.start:
-                self.cells[self.start].setBrush(QBrush(Qt.white))
+                self.item.set_cell(self.start, FREE)
             self.start = cell
-            self.cells[cell].setBrush(QBrush(QColor("green")))
+            self.item.set_cell(cell, START)
 
         elif self.mode == GridView.MODE_END:
             if self.end:
-                self.cells[self.end].setBrush(QBrush(Qt.white))
+                self.item.set_cell(self.end, FREE)
             self.end = cell
-            self.cells[cell].setBrush(QBrush(QColor("blue")))
+            self.item.set_cell(cell, END)
 
         elif self.mode == GridView.MODE_FORBIDDEN:
             self.forbidden.add(cell)
-            self.cells[cell].setBrush(QBrush(Qt.black))
+            self.item.set_cell(cell, FORBIDDEN)
 
         elif self.mode == GridView.MODE_DANGEROUS:
             self.dangerous.add(cell)
-            self.cells[cell].setBrush(QBrush(QColor("orange")))
+            self.item.set_cell(cell, DANGEROUS)
 
         super().mousePressEvent(event)
 
-    def color_path(self, path_arcs):
-        """Colorie les arcs du chemin optimal"""
-        for ((i,j),(ni,nj)) in path_arcs:
-            self.cells[(i,j)].setBrush(QBrush(QColor(150,255,150)))
-            self.cells[(ni,nj)].setBrush(QBrush(QColor(150,255,150)))
+    def color_path(self, path_arcs, graph=None):
+        """Colorie les arcs du chemin optimal
+        (ids d'arcs de `graph` si un GridGraph est fourni)"""
+        if graph is not None:
+            arc_ids = np.asarray(path_arcs, dtype=np.int64)
+            nodes = np.concatenate([graph.src[arc_ids], graph.dst[arc_ids]])
+            rows, cols = np.divmod(nodes, self.n)
+        else:
+            cells = [c for arc in path_arcs for c in arc]
+            rows = [i for i, _ in cells]
+            cols = [j for _, j in cells]
+        self.item.set_path(rows, cols)
@@ -1,12 +1,13 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-    QLabel, QSpinBox, QDoubleSpinBox
+    QLabel, QSpinBox, QDoubleSpinBox, QComboBox, QCheckBox
 )
 from PyQt5.QtCore import Qt
 
 from ui.grid_view import GridView
-from core.grid_builder import build_grid_graph
-from core.solver import solve_shortest_path_with_risk
+from core.grid_graph import build_grid_arrays
+from core.fast_path import TieredSolver
+from core.frontier import FrontierCache
 
 
 class MainWindow(QWidget):
@@ -22,6 +23,10 @@ class MainWindow(QWidget):
         self.setFixedSize(1100, 700)
 
         self.grid = None  # sera rempli après création de la grille
+        self.session = None  # modèle Gurobi conservé entre deux résolutions
+        self.tiered = None  # TieredSolver de la grille courante
+        self.tiered_key = None  # (n, forbidden, dangerous) de self.tiered
+        self.frontier_cache = FrontierCache()
 
         # --- Layout principal ---
         layout = QHBoxLayout()
@@ -74,6 +79,21 @@ class MainWindow(QWidget):
 
         control_panel.addSpacing(20)
 
+        # --- Méthode de résolution ---
+        control_panel.addWidget(QLabel("Méthode de résolution :"))
+
+        self.backend_box = QComboBox()
+        self.backend_box.addItem("Label-setting (exact, sans Gurobi)", "labels")
+        self.backend_box.addItem("Gurobi (PLNE)", "gurobi")
+        control_panel.addWidget(self.backend_box)
+
+        # Frontière distance / risque : calculée une fois par grille,
+        # chaque R_max devient une simple lecture
+        self.frontier_box = QCheckBox("Mode frontière de Pareto")
+        control_panel.addWidget(self.frontier_box)
+
+        control_panel.addSpacing(20)
+
         # --- Boutons de mode ---
         control_panel.addWidget(QLabel("<b>Mode d'annotation :</b>"))
 
@@ -122,6 +142,12 @@ class MainWindow(QWidget):
         self.layout().insertWidget(0, self.grid, stretch=3)
         self.result_label.setText("")
 
+        if self.session is not None:
+            self.session.dispose()
+            self.session = None
+        self.tiered = None
+        self.tiered_key = None
+
     # ===============================================================
     # 2) Bouton "Solve"
     # ===============================================================
@@ -131,25 +157,51 @@ class MainWindow(QWidget):
             self.result_label.setText("<font color='red'>Start ou End non défini.</font>")
             return
 
-        n = self.n_box.value()
+        n = self.grid.n  # taille de la grille affichée (le spin box peut avoir changé)
         R_max = self.rmax_box.value()
 
-        # Construire le graphe (dist et risk sont générés ici)
-        nodes, arcs, dist, risk = build_grid_graph(
-            n,
-            dangerous_cells=self.grid.dangerous,
-            forbidden_cells=self.grid.forbidden,
-            diagonal=self.diagonal
-        )
-
-
-        # Résoudre
-        status, total_dist, total_risk, path_arcs = solve_shortest_path_with_risk(
-            nodes, arcs, dist, risk,
-            start=self.grid.start,
-            end=self.grid.end,
-            R_max=R_max
-        )
+        if self.frontier_box.isChecked():
+            status, total_dist, total_risk, path_arcs = self.frontier_cache.query(
+                n, self.diagonal,
+                self.grid.forbidden, self.grid.dangerous,
+                self.grid.start, self.grid.end,
+                R_max
+            )
+        elif self.backend_box.currentData() == "gurobi":
+            # Gurobi : le modèle est conservé et seules les modifications
+            # de la grille sont appliquées avant de re-résoudre
+            if self.session is None or self.session.n != n:
+                from core.session import PathPlanningSession
+                self.session = PathPlanningSession(n, diagonal=self.diagonal)
+
+            status, total_dist, total_risk, path_arcs = self.session.solve(
+                start=self.grid.start,
+                end=self.grid.end,
+                R_max=R_max,
+                forbidden=self.grid.forbidden,
+                dangerous=self.grid.dangerous
+            )
+        else:
+            # Un seul solveur par grille : reconstruit seulement si la grille a changé
+            key = (n, frozenset(self.grid.forbidden), frozenset(self.grid.dangerous))
+            if self.tiered is None or self.tiered_key != key:
+                # Construire le graphe (dist et risk sont générés ici)
+                graph = build_grid_arrays(
+                    n,
+                    dangerous_cells=self.grid.dangerous,
+                    forbidden_cells=self.grid.forbidden,
+                    diagonal=self.diagonal
+                )
+                self.tiered = TieredSolver(graph)
+                self.tiered_key = key
+
+            # Résoudre : A* d'abord, label-setting exact si R_max est saturé
+            status, total_dist, total_risk, arc_ids = self.tiered.solve(
+                start=self.grid.start,
+                end=self.grid.end,
+                R_max=R_max
+            )
+            path_arcs = self.tiered.graph.path_arcs(arc_ids)
 
         print("Status =", status)
         print("Path arcs:", path_arcs)
@@ -165,12 +217,35 @@ class MainWindow(QWidget):
                 f"<b>Solution optimale trouvée :</b><br>"
                 f"Distance = {total_dist:.2f}<br>"
                 f"Risque = {total_risk:.2f}"
+                + self.frontier_text()
+                + self.tiers_text()
             )
             self.grid.color_path(path_arcs)
         else:
             self.result_label.setText(
                 "<font color='red'>Aucune solution trouvée (Infeasible).</font>"
+                + self.tiers_text()
             )
+
+    def frontier_text(self):
+        """Points (distance, risque) de la frontière de la grille courante"""
+        if not self.frontier_box.isChecked():
+            return ""
+        frontier = self.frontier_cache.frontier(
+            self.grid.n, self.diagonal,
+            self.grid.forbidden, self.grid.dangerous,
+            self.grid.start, self.grid.end
+        )
+        points = "<br>".join(f"{d:.0f} / {r:.2f}" for d, r, _ in frontier)
+        return f"<br><br><b>Frontière ({len(frontier)} points) :</b><br>{points}"
+
+    def tiers_text(self):
+        """Requêtes résolues par chaque niveau du solveur de la grille courante"""
+        if self.frontier_box.isChecked() or self.backend_box.currentData() == "gurobi" or self.tiered is None:
+            return ""
+        counters = self.tiered.counters
+        return f"<br><br>Niveaux : A* {counters['astar']}, exact {counters['exact']}"
+
     def return_to_menu(self):
         from ui.menu_window import MenuWindow
         self.menu = MenuWindow()